@@ -365,10 +365,138 @@ class CEBClass:
         return self._crack_opening_curve
 
 
+# Strain rates (1/s) of the CEB-FIP strain rate enhancement: the DIF
+# follows a power law of the rate up to the cutoff and grows with the cube
+# root of the rate above it
+DIF_STRAIN_RATE_CUTOFF = 30
+DIF_STRAIN_RATE_MAX = 300
+DIF_STRAIN_RATE_STATIC = {'compression': 30.0E-6, 'tension': 3.0E-6}
+
+
+def _dif_branches(strain_rate, f_c, mode):
+    """Low- and high-rate branches of the CEB-FIP DIF at the given strain rates."""
+    f_co = 10
+    f_cs = np.asarray(f_c, dtype=float)
+    if mode == 'compression':
+        alpha_s = 1.0/(5.0+9.0*(f_cs/f_co))
+        beta_s = pow(10, 6.0*alpha_s-2)
+        exponent = alpha_s
+    elif mode == 'tension':
+        delta_s = 1.0/(10.0+6.0*f_cs/f_co)
+        beta_s = pow(10, 7.11*delta_s-2.33)
+        exponent = 1.016*delta_s
+    else:
+        raise ValueError(f"Unknown DIF mode: {mode}")
+    strainRateStatic = DIF_STRAIN_RATE_STATIC[mode]
+    ratio = np.maximum(np.asarray(strain_rate, dtype=float), strainRateStatic)/strainRateStatic
+    return pow(ratio, exponent), beta_s*pow(ratio, 1.0/3.0)
+
+
+def DIF(strain_rate, f_c=40, mode='compression'):
+    """
+    CEB-FIP Dynamic Increase Factor at arbitrary strain rates.
+    
+    Parameters:
+    -----------
+    strain_rate : float or array-like
+        Strain rates (1/s); rates below the static rate give DIF = 1
+    f_c : float or array-like
+        Characteristic compressive strength of concrete (MPa), broadcast
+        against strain_rate
+    mode : str
+        'compression' or 'tension'
+        
+    Returns:
+    --------
+    float or numpy.ndarray
+        DIF values
+    """
+    low, high = _dif_branches(strain_rate, f_c, mode)
+    return np.where(np.asarray(strain_rate) <= DIF_STRAIN_RATE_CUTOFF, low, high)
+
+
+def _refine_dif(branch, start, stop, rtol, max_points):
+    """Knots between start and stop where linear interpolation of branch stays within rtol."""
+    knots = np.geomspace(start, stop, 3)
+    fractions = np.array([0.25, 0.5, 0.75])
+    while True:
+        left, right = knots[:-1], knots[1:]
+        test = left[:, None] + (right - left)[:, None]*fractions
+        values = branch(knots)
+        linear = values[:-1, None] + (values[1:] - values[:-1])[:, None]*fractions
+        exact = branch(test)
+        refine = np.max(np.abs(linear - exact)/np.abs(exact), axis=1) > rtol
+        if not refine.any():
+            return knots
+        if len(knots) + np.count_nonzero(refine) > max_points:
+            raise ValueError(f"DIF table needs more than {max_points} points for rtol={rtol}")
+        knots = np.sort(np.concatenate((knots, np.sqrt(left[refine]*right[refine]))))
+
+
+def DIF_table(f_c=40, mode='compression', strain_rate_min=None, strain_rate_max=DIF_STRAIN_RATE_MAX,
+              num_points=40, rtol=None, max_points=1000):
+    """
+    Compact DIF table for load curves and interpolation.
+    
+    Without rtol the strain rates are log-spaced, which resolves the low
+    rates that matter in practice as well as the high ones. With rtol the
+    knots are placed adaptively so that linear interpolation between them
+    (as in *DEFINE_CURVE) stays within the relative tolerance. The cutoff
+    strain rate is always a knot; where the branches do not meet there
+    (tension), the high-rate branch starts 0.01% above it.
+    
+    Parameters:
+    -----------
+    f_c : float
+        Characteristic compressive strength of concrete (MPa)
+    mode : str
+        'compression' or 'tension'
+    strain_rate_min : float, optional
+        First strain rate (1/s); defaults to the static strain rate
+    strain_rate_max : float
+        Last strain rate (1/s)
+    num_points : int
+        Number of log-spaced points when rtol is not given
+    rtol : float, optional
+        Relative interpolation tolerance of adaptive sampling
+    max_points : int
+        Maximum number of points of adaptive sampling
+        
+    Returns:
+    --------
+    numpy.ndarray
+        2D array with strain rates and corresponding DIF values
+    """
+    if strain_rate_min is None:
+        strain_rate_min = DIF_STRAIN_RATE_STATIC[mode]
+    cutoff = DIF_STRAIN_RATE_CUTOFF
+    low, high = _dif_branches(cutoff, f_c, mode)
+    jump = not np.isclose(low, high, rtol=1e-9)
+    if rtol is None:
+        strainRate = np.geomspace(strain_rate_min, strain_rate_max, num_points)
+    else:
+        segments = []
+        if strain_rate_min < cutoff:
+            segments.append(_refine_dif(lambda rate: _dif_branches(rate, f_c, mode)[0], strain_rate_min,
+                                        min(cutoff, strain_rate_max), rtol, max_points))
+        if strain_rate_max > cutoff:
+            start = max(cutoff, strain_rate_min)
+            segments.append(_refine_dif(lambda rate: _dif_branches(rate, f_c, mode)[1], start,
+                                        strain_rate_max, rtol, max_points))
+        strainRate = np.concatenate(segments)
+    if strain_rate_min < cutoff < strain_rate_max:
+        strainRate = np.concatenate((strainRate, [cutoff], [cutoff*(1 + 1E-4)] if jump else []))
+    strainRate = np.unique(strainRate)
+    return np.vstack((strainRate, DIF(strainRate, f_c, mode)))
+
+
 def DIF_c(f_c):
     """
     Dynamic Increase Factor for compression.
     
+    The curve is sampled on the legacy linear grids; use ``DIF`` for
+    arbitrary strain rates and ``DIF_table`` for compact tables.
+    
     Parameters:
     -----------
     f_c : float
@@ -379,34 +507,16 @@ def DIF_c(f_c):
     numpy.ndarray
         2D array with strain rates and corresponding DIF values
     """
-    f_co = 10
-    f_cs = f_c
-    strainRateStatic = 30.0E-6
-    strainRateMax = 300
-    strainRateCutoff = 30
-    #
-    alpha_s = 1.0/(5.0+9.0*(f_cs/f_co))
-    beta_s = pow(10, 6.0*alpha_s-2)
-    #
-    strainRateLow = np.linspace(strainRateStatic, strainRateCutoff, strainRateCutoff)
-    DIFLow = pow(strainRateLow/strainRateStatic, alpha_s)
-    #
-    strainRateHigh = np.linspace(strainRateCutoff, strainRateMax, strainRateMax-strainRateCutoff)
-    DIFHigh = beta_s*pow(strainRateHigh/strainRateStatic, 1.0/3.0)
-    #
-    strainRate = np.concatenate((strainRateLow, strainRateHigh))
-    DIF = np.concatenate((DIFLow, DIFHigh))
-    #
-    DIFCurve = np.vstack((strainRate, DIF))
-    #DIFCurve = np.vstack((strainRateLow, DIFLow))
-    #
-    return DIFCurve
+    return _dif_curve(f_c, 'compression')
 
 
 def DIF_t(f_c):
     """
     Dynamic Increase Factor for tension.
     
+    The curve is sampled on the legacy linear grids; use ``DIF`` for
+    arbitrary strain rates and ``DIF_table`` for compact tables.
+    
     Parameters:
     -----------
     f_c : float
@@ -417,26 +527,24 @@ def DIF_t(f_c):
     numpy.ndarray
         2D array with strain rates and corresponding DIF values
     """
-    f_co = 10
-    f_cs = f_c
-    strainRateStatic = 3.0E-6
-    strainRateMax = 300
-    strainRateCutoff = 30
-    #
-    delta_s = 1.0/(10.0+6.0*f_cs/f_co)
-    beta_s = pow(10, 7.11*delta_s-2.33)
+    return _dif_curve(f_c, 'tension')
+
+
+def _dif_curve(f_c, mode):
+    strainRateStatic = DIF_STRAIN_RATE_STATIC[mode]
+    strainRateMax = DIF_STRAIN_RATE_MAX
+    strainRateCutoff = DIF_STRAIN_RATE_CUTOFF
     #
     strainRateLow = np.linspace(strainRateStatic, strainRateCutoff, strainRateCutoff)
-    DIFLow = pow(strainRateLow/strainRateStatic, 1.016*delta_s)
+    DIFLow = _dif_branches(strainRateLow, f_c, mode)[0]
     #
-    strainRateHigh = np.linspace(strainRateCutoff, strainRateMax, (strainRateMax-strainRateCutoff))
-    DIFHigh = beta_s*pow(strainRateHigh/strainRateStatic, 1.0/3.0)
+    strainRateHigh = np.linspace(strainRateCutoff, strainRateMax, strainRateMax-strainRateCutoff)
+    DIFHigh = _dif_branches(strainRateHigh, f_c, mode)[1]
     #
     strainRate = np.concatenate((strainRateLow, strainRateHigh))
     DIF = np.concatenate((DIFLow, DIFHigh))
     #
-    DIFCurve = np.vstack((strainRate, DIF))   
-    return DIFCurve  
+    return np.vstack((strainRate, DIF))
 
 
 def sigma_elastic(f_c, strain):
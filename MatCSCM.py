@@ -1,9 +1,23 @@
+import functools
+import inspect
+
 import numpy as np
-import matplotlib.pyplot as plt
 from enum import Enum
 from CEB import CEBClass
+from dependency_graph import DependencyGraph
+
+
+# Plotting helpers live in cscm_plots and are resolved on first access,
+# so that importing this module does not load matplotlib.
+_LAZY_PLOTS = ('plot_cscm_compression', 'plot_elastic_compression_curve')
 
 
+def __getattr__(name):
+    if name in _LAZY_PLOTS:
+        import cscm_plots
+        return getattr(cscm_plots, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 class Revision(Enum):
     """Enumeration for CSCM model revisions."""
@@ -11,11 +25,76 @@ class Revision(Enum):
     REV_2 = 2
     REV_3 = 3
 
+
+# MatCSCM attributes that are inputs of its dependency graph
+GRAPH_INPUTS = ('f_c', 'dmax', 'mid', 'rho', 'nplot', 'incre', 'irate', 'erode', 'recov',
+                'itretrc', 'pred', 'repow', 'nh', 'ch', 'pwrc', 'pwrt', 'pmod', 'esize')
+
+
+def _freeze(value):
+    """Make cached arrays read-only so that callers cannot alter the cache."""
+    if isinstance(value, np.ndarray):
+        value.setflags(write=False)
+    elif isinstance(value, tuple):
+        for item in value:
+            _freeze(item)
+    return value
+
+
+def _thaw(value):
+    """Writeable copy of cached arrays handed out to callers."""
+    if isinstance(value, np.ndarray):
+        return value.copy()
+    if isinstance(value, tuple):
+        return tuple(_thaw(item) for item in value)
+    return value
+
+
+def cached(*depends, bypass=None):
+    """
+    Cache a method result in the dependency graph of its material.
+    
+    The result is stored per argument set as a graph node that depends on
+    the given inputs or nodes, so it is recomputed only after one of them
+    changed. Cached arrays are kept read-only and callers get writeable
+    copies. Objects without a graph (e.g. the stand-in parent of
+    ``batch_params``) and unhashable arguments call the method directly.
+    
+    Parameters:
+    -----------
+    *depends : str
+        Names of the graph inputs (``GRAPH_INPUTS``) or nodes the result depends on
+    bypass : str, optional
+        Argument that disables caching when it is not None (e.g. a probe)
+    """
+    def decorator(method):
+        bypass_index = list(inspect.signature(method).parameters).index(bypass) if bypass else None
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            material = getattr(self, 'parent', self)
+            graph = material.__dict__.get('_graph')
+            if bypass is not None and (kwargs.get(bypass) is not None or len(args) >= bypass_index):
+                graph = None
+            if graph is None:
+                return method(self, *args, **kwargs)
+            name = (method.__qualname__, args, tuple(sorted(kwargs.items())))
+            try:
+                if name not in graph:
+                    graph.node(name, lambda *values: _freeze(method(self, *args, **kwargs)), depends)
+            except TypeError:
+                return method(self, *args, **kwargs)
+            return _thaw(graph[name])
+        wrapper.depends = depends
+        return wrapper
+    return decorator
+
 class MatCSCM:
     def __init__(self, f_c=35, dmax=19, mid=159, rho=2.4E-9, nplot=1, 
              incre=0, irate='on', erode='off', recov='full', 
              itretrc=0, pred='off', repow=1, nh=0, ch=0, 
              pwrc=5, pwrt=1, pmod=0):
+        self._init_graph()
         self.f_c = f_c
         self.dmax = dmax
         self.mid = mid
@@ -37,12 +116,48 @@ class MatCSCM:
         # Element size for damage calculations
         self.esize = 200
         
-        # Get CEB material properties
-        self.ceb_data = CEBClass(f_c=f_c, d_max=dmax)
-        
         # Initialize nested classes
         self.initialize = self.Initialize(self)
         self.evaluate = self.Evaluate(self)
+    
+    def _init_graph(self):
+        """Create the dependency graph of inputs, CEB data and cached results."""
+        graph = DependencyGraph()
+        for name in GRAPH_INPUTS:
+            graph.input(name)
+        graph.node('ceb_data', lambda f_c, dmax: CEBClass(f_c=f_c, d_max=dmax), ('f_c', 'dmax'))
+        object.__setattr__(self, '_graph', graph)
+    
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        if name in GRAPH_INPUTS:
+            # Drop only the cached results that depend on the changed input
+            self._graph.set(**{name: value})
+    
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_graph']
+        return state
+    
+    def __setstate__(self, state):
+        self._init_graph()
+        for name, value in state.items():
+            setattr(self, name, value)
+    
+    @property
+    def ceb_data(self):
+        """CEB-FIP material properties of f_c and dmax (computed on first access)."""
+        return self._graph['ceb_data']
+    
+    @ceb_data.setter
+    def ceb_data(self, value):
+        # Replaces the CEB data until f_c or dmax change; dependent results are recomputed
+        self._graph.assign('ceb_data', value)
+    
+    @property
+    def graph(self):
+        """Dependency graph of the material inputs and cached results."""
+        return self._graph
     class Initialize:
         def __init__(self, parent):
             self.parent = parent
@@ -52,6 +167,7 @@ class MatCSCM:
             f_c = self.parent.f_c
             return A_p * pow(f_c, 2) + B_p * f_c + C_p
             
+        @cached('f_c')
         def alpha(self, rev=Revision.REV_3):
             """Alpha parameter for compression meridian."""
             f_c = self.parent.f_c
@@ -65,6 +181,7 @@ class MatCSCM:
                 case _:
                     raise ValueError(f"Invalid revision number: {rev}")
             
+        @cached('f_c')
         def lamda(self, rev=Revision.REV_3):
             """Lambda parameter for compression meridian."""
             f_c = self.parent.f_c
@@ -78,6 +195,7 @@ class MatCSCM:
                 case _:
                     raise ValueError(f"Invalid revision number: {rev}")
             
+        @cached('f_c')
         def beta(self, rev=Revision.REV_3):
             """Beta parameter for compression meridian."""
             f_c = self.parent.f_c
@@ -91,6 +209,7 @@ class MatCSCM:
                 case _:
                     raise ValueError(f"Invalid revision number: {rev}")
             
+        @cached('f_c')
         def theta(self, rev=Revision.REV_3):
             """Theta parameter for compression meridian."""
             f_c = self.parent.f_c
@@ -104,6 +223,7 @@ class MatCSCM:
                 case _:
                     raise ValueError(f"Invalid revision number: {rev}")
             
+        @cached('f_c')
         def alpha_1(self, rev=Revision.REV_3):
             """Alpha_1 parameter for shear meridian."""
             f_c = self.parent.f_c
@@ -117,6 +237,7 @@ class MatCSCM:
                 case _:
                     raise ValueError(f"Invalid revision number: {rev}")
             
+        @cached('f_c')
         def lamda_1(self, rev=Revision.REV_3):
             """Lambda_1 parameter for shear meridian."""
             f_c = self.parent.f_c
@@ -131,6 +252,7 @@ class MatCSCM:
                 case _:
                     raise ValueError(f"Invalid revision number: {rev}")
             
+        @cached('f_c')
         def beta_1(self, rev=Revision.REV_3):
             """Beta_1 parameter for shear meridian."""
             f_c = self.parent.f_c
@@ -144,6 +266,7 @@ class MatCSCM:
                 case _:
                     raise ValueError(f"Invalid revision number: {rev}")
             
+        @cached('f_c')
         def theta_1(self, rev=Revision.REV_3):
             """Theta_1 parameter for shear meridian."""
             f_c = self.parent.f_c
@@ -157,6 +280,7 @@ class MatCSCM:
                 case _:
                     raise ValueError(f"Invalid revision number: {rev}")     
         
+        @cached('f_c')
         def alpha_2(self, rev=Revision.REV_3):
             """Alpha_2 parameter for tensile meridian."""
             f_c = self.parent.f_c
@@ -166,10 +290,11 @@ class MatCSCM:
                 case Revision.REV_2:
                     return 0.76
                 case Revision.REV_3:
-                    return round(0.5 + self.lamda_2(rev), 4)
+                    return np.round(0.5 + self.lamda_2(rev), 4)
                 case _:
                     raise ValueError(f"Invalid revision number: {rev}")
             
+        @cached('f_c')
         def lamda_2(self, rev=Revision.REV_3):
             """Lambda_2 parameter for tensile meridian."""
             f_c = self.parent.f_c
@@ -183,6 +308,7 @@ class MatCSCM:
                 case _:
                     raise ValueError(f"Invalid revision number: {rev}")
             
+        @cached('f_c')
         def beta_2(self, rev=Revision.REV_3):
             """Beta_2 parameter for tensile meridian."""
             f_c = self.parent.f_c
@@ -196,6 +322,7 @@ class MatCSCM:
                 case _:
                     raise ValueError(f"Invalid revision number: {rev}")
             
+        @cached('f_c')
         def theta_2(self, rev=Revision.REV_3):
             """Theta_2 parameter for tensile meridian."""
             f_c = self.parent.f_c
@@ -209,6 +336,7 @@ class MatCSCM:
                 case _:
                     raise ValueError(f"Invalid revision number: {rev}")
 
+        @cached('f_c')
         def kappa_0(self, rev=Revision.REV_3):
             """Initial location of the cap when kappa = kappa_0."""
             f_c = self.parent.f_c
@@ -222,6 +350,7 @@ class MatCSCM:
                 case _:
                     raise ValueError(f"Invalid revision number: {rev}")
             
+        @cached('f_c')
         def R(self, rev=Revision.REV_3):
             """Ellipticity ratio - ratio of major to minor ellipse axes."""
             f_c = self.parent.f_c
@@ -272,6 +401,7 @@ class MatCSCM:
                     raise ValueError(f"Invalid revision number: {rev}")
 
             
+        @cached('f_c', 'ceb_data', 'esize')
         def B(self, rev=Revision.REV_1):
             """Ductile shape softening parameter."""
             f_c = self.parent.f_c
@@ -292,6 +422,7 @@ class MatCSCM:
                 case _:
                     raise ValueError(f"Invalid revision number: {rev}")
             
+        @cached('ceb_data', 'esize')
         def D(self, rev=Revision.REV_1):
             """Brittle shape softening parameter."""
             f_t = self.parent.ceb_data.f_t
@@ -338,6 +469,7 @@ class MatCSCM:
                 case _:
                     raise ValueError(f"Invalid revision number: {rev}")
             
+        @cached('f_c')
         def eta_0_t(self, rev=Revision.REV_1):
             """eta_0_t parameter for tensile strain rate."""
             f_c = self.parent.f_c
@@ -364,6 +496,7 @@ class MatCSCM:
                 case _:
                     raise ValueError(f"Invalid revision number: {rev}")
             
+        @cached('f_c')
         def eta_0_c(self, rev=Revision.REV_1):
             """eta_0_c parameter for compressive strain rate."""
             f_c = self.parent.f_c
@@ -388,6 +521,7 @@ class MatCSCM:
             """Ratio of effective shear stress to tensile stress fluidity parameters."""
             return 1.0
             
+        @cached('f_c')
         def overt(self, rev=Revision.REV_1):
             """Over-stress limit for tension."""
             f_c = self.parent.f_c
@@ -500,7 +634,7 @@ class MatCSCM:
             
             # Calculate cap failure surface F_c(I_1, J_2, kappa)
             # Access cap surface through parent object
-            F_c_value = self.parent.cap_surface.F_c(I_1, J_2, kappa, rev)
+            F_c_value = self.F_c(I_1, J_2, kappa, rev)
             
             # General yield function: f = F_f * F_c - kappa
             yield_function = F_f_value * F_c_value - kappa
@@ -561,14 +695,22 @@ class MatCSCM:
             """
             Plastic volume strain - basis for motion (expansion and contraction) of the cap.
             """
-            return (self.W(rev) * 
-                (1 - np.exp(-self.D_1(rev) * (X - self.kappa_0(rev)) - 
-                            self.D_2(rev) * pow(X - self.kappa_0(rev), 2))))
+            W = self.parent.initialize.W(rev)
+            return W * (1 - np.exp(-self.hydrostatic_compression_parameters(X, rev)))
         
         def hydrostatic_compression_parameters(self, X, rev=Revision.REV_3):
-            """Hydrostatic compression parameters."""
-            return (self.D_1(rev) * (X - self.kappa_0(rev)) + 
-                self.D_2(rev) * pow(X - self.kappa_0(rev), 2))
+            """
+            Hardening exponent D_1 (X - X_0) + D_2 (X - X_0)^2 of the cap.
+            
+            The cap does not move below its initial location
+            X_0 = kappa_0 + R F_f(kappa_0), so the exponent is zero for X <= X_0.
+            """
+            D1 = self.parent.initialize.D_1(rev)
+            D2 = self.parent.initialize.D_2(rev)
+            kappa_0 = self.parent.initialize.kappa_0(rev)
+            X0 = kappa_0 + self.parent.initialize.R(rev) * self.F_f(kappa_0, rev)
+            hardening = np.maximum(np.asarray(X, dtype=float) - X0, 0)
+            return D1 * hardening + D2 * pow(hardening, 2)
         
         def kappa(self, delta_epsilon_p, epsilon_v_p_old, rev=Revision.REV_3):
             """
@@ -605,7 +747,8 @@ class MatCSCM:
             
             return kappa_new, epsilon_v_p_new
         
-        def uniaxial_compression_response(self, max_strain=0.01, num_points=1000, dt=1e-5):
+        @cached('f_c', 'ceb_data', 'esize', 'nh', 'ch', bypass='probe')
+        def uniaxial_compression_response(self, max_strain=0.01, num_points=1000, dt=1e-5, probe=None):
             """
             Calculate stress-strain response for uniaxial compression using CSCM model.
             
@@ -617,6 +760,8 @@ class MatCSCM:
                 Number of calculation points
             dt : float
                 Time step for strain rate calculation
+            probe : instrumentation.DriverProbe, optional
+                Collector of step counters, phase timers and internal variable trace
                 
             Returns:
             --------
@@ -670,6 +815,10 @@ class MatCSCM:
             damage_threshold_initial_c = (f_c**2) / (2 * E)  # For compression
             
             for i, total_strain in enumerate(strains):
+                if probe is not None:
+                    probe.count('steps')
+                    t_phase = probe.clock()
+                
                 # Step 1: Strain increment
                 if i == 0:
                     d_strain = 0
@@ -685,6 +834,9 @@ class MatCSCM:
                 I_1 = sigma_trial  # First invariant
                 J_2 = sigma_trial**2 / 3  # Second deviatoric invariant
                 
+                if probe is not None:
+                    t_phase = probe.lap('trial', t_phase)
+                
                 # Step 4: Calculate yield surfaces
                 # Shear surface F_f
                 F_f = self.F_f(I_1, Revision.REV_2)
@@ -695,13 +847,20 @@ class MatCSCM:
                 # General yield function
                 f_yield = self.f(I_1, J_2, kappa, Revision.REV_2)
                 
+                if probe is not None:
+                    t_phase = probe.lap('yield', t_phase)
+                
                 # Step 5: Check elastic/plastic behavior
                 if f_yield <= 0:
                     # Elastic behavior
                     sigma = sigma_trial
+                    if probe is not None:
+                        probe.count('elastic')
                     
                 else:
                     # Plastic behavior
+                    if probe is not None:
+                        probe.count('plastic')
                     
                     # Kinematic hardening
                     if abs(sigma_trial) > NH * f_c:
@@ -725,6 +884,8 @@ class MatCSCM:
                                 delta_epsilon_p, epsilon_v_p, Revision.REV_2
                             )
                         except:
+                            if probe is not None:
+                                probe.count('cap_fallback')
                             # Simplified κ update if method fails
                             delta_epsilon_v_p = delta_epsilon_p * (1 - 2 * nu)
                             epsilon_v_p += delta_epsilon_v_p
@@ -732,9 +893,13 @@ class MatCSCM:
                             exp_term = np.exp(-D1 * epsilon_v_p_norm - D2 * epsilon_v_p_norm**2)
                             X_new = kappa_0 + epsilon_v_p_norm * (1 - exp_term)
                             kappa = max((X_new + R**2 * kappa_0) / (1 + R**2), kappa_0)
+                        if probe is not None:
+                            probe.count('cap_updates')
                     else:
                         sigma = sigma_trial
                 
+                if probe is not None:
+                    t_phase = probe.lap('plastic', t_phase)
                 
                 # Step 7: Compression damage calculation (Ductile Damage)
                 strain_energy = abs(sigma * total_strain)
@@ -756,13 +921,22 @@ class MatCSCM:
                             damage_increment = self.parent.initialize.ductile_damage(tau_d, B, a, d_max, r_0d)
                             damage = min(0.99, max(damage, damage_increment))
                         except:
+                            if probe is not None:
+                                probe.count('damage_fallback')
                             # Simplified damage formula
                             damage_increment = 1 - np.exp(-a * tau_diff / (B + tau_diff))
                             damage = min(0.99, max(damage, damage_increment))
+                        if probe is not None:
+                            probe.count('damage_updates')
                 
                 # Step 8: Final stress with damage
                 sigma_final = sigma * (1 - damage)
                 stresses[i] = abs(sigma_final)  # Positive for plotting
+                
+                if probe is not None:
+                    probe.lap('damage', t_phase)
+                    probe.record(i, total_strain, stresses[i], kappa, epsilon_v_p,
+                                 plastic_strain, damage)
             
             return strains, stresses
 
@@ -782,31 +956,62 @@ class MatCSCM:
             matplotlib.pyplot
                 pyplot object for further customization
             """
-            strains, stresses = self.uniaxial_compression_response(max_strain, num_points)
-            
-            plt.figure(figsize=(10, 6))
-            plt.plot(strains * 100, stresses, 'b-', linewidth=2, 
-                     label=f'CSCM Model (f\'c = {self.parent.f_c} MPa)')
-            
-            plt.xlabel('Compression Strain, %')
-            plt.ylabel('Compression Stress, MPa')
-            plt.title(f'CSCM Model under Uniaxial Compression\n(f\'c = {self.parent.f_c} MPa, d_max = {self.parent.dmax} mm)')
-            plt.grid(True, alpha=0.3)
-            plt.legend()
-            
-            # Add key points
-            peak_stress = np.max(stresses)
-            peak_strain = strains[np.argmax(stresses)] * 100
-            plt.plot(peak_strain, peak_stress, 'ro', markersize=8, 
-                     label=f'Peak: {peak_stress:.1f} MPa at {peak_strain:.3f}%')
-            
-            plt.xlim(0, max_strain * 100)
-            plt.ylim(0, peak_stress * 1.1)
-            plt.legend()
-            plt.tight_layout()
-            
-            return plt
+            from cscm_plots import plot_cscm_compression
+            return plot_cscm_compression(self.parent, max_strain, num_points)
 
+    @cached(*GRAPH_INPUTS, 'ceb_data')
+    def keyword_values(self):
+        """
+        Material parameters of the LS-DYNA *MAT_CSCM keyword as a flat array.
+        
+        Returns:
+        --------
+        numpy.ndarray
+            Field values ordered as cscm_keyword.CSCM_LAYOUT
+        """
+        ceb = self.ceb_data
+        init = self.initialize
+        mid = self.mid if isinstance(self.mid, (int, float, np.number)) else np.nan
+        
+        return np.array([
+            # Card 1
+            mid, self.rho, self.nplot, self.incre, self.irate, self.erode, self.recov, self.itretrc,
+            # Card 2
+            self.pred,
+            # Card 3
+            ceb.G, ceb.K, init.alpha(Revision.REV_2), init.theta(Revision.REV_2),
+            init.lamda(Revision.REV_2), init.beta(Revision.REV_2), self.nh, self.ch,
+            # Card 4
+            init.alpha_1(Revision.REV_2), init.theta_1(Revision.REV_2),
+            init.lamda_1(Revision.REV_2), init.beta_1(Revision.REV_2),
+            init.alpha_2(Revision.REV_2), init.theta_2(Revision.REV_2),
+            init.lamda_2(Revision.REV_2), init.beta_2(Revision.REV_2),
+            # Card 5
+            init.R(Revision.REV_2), init.kappa_0(Revision.REV_2), init.W(Revision.REV_2),
+            init.D_1(Revision.REV_2), init.D_2(Revision.REV_2),
+            # Card 6
+            init.B(Revision.REV_1), ceb.G_fc, init.D(Revision.REV_1), ceb.G_ft, ceb.G_fs,
+            self.pwrc, self.pwrt, self.pmod,
+            # Card 7
+            init.eta_0_c(Revision.REV_1), init.n_c(Revision.REV_1),
+            init.eta_0_t(Revision.REV_1), init.n_t(Revision.REV_1),
+            init.overc(Revision.REV_1), init.overt(Revision.REV_1),
+            init.Srate(Revision.REV_1), self.repow,
+        ], dtype=float)
+    
+    def keyword_record(self):
+        """
+        Generate LS-DYNA material keyword for CSCM as a compact record.
+        
+        Returns:
+        --------
+        cscm_keyword.KeywordRecord
+            Flat value array with a read-only dict-of-dicts view
+        """
+        from cscm_keyword import KeywordRecord
+        mid = None if isinstance(self.mid, (int, float, np.number)) else self.mid
+        return KeywordRecord(self.keyword_values(), mid)
+    
     def generate_keyword(self):
         """
         Generate LS-DYNA material keyword for CSCM.
@@ -816,74 +1021,7 @@ class MatCSCM:
         dict
             Dictionary containing all material parameters for LS-DYNA keyword generation
         """
-        # Convert CEB class to dictionary for compatibility
-        from CEB import CEB
-        data = CEB(f_c=self.f_c, d_max=self.dmax, rho=self.rho)
-        
-        CSCM = {}
-        CSCM['NAME'] = '*MAT_CSCM'
-        
-        # Card 1
-        CSCM['MID'] = {'card': 1, 'position': 1, 'type': 'A8', 'value': self.mid}
-        CSCM['RHO'] = {'card': 1, 'position': 2, 'type': 'F', 'value': self.rho}
-        CSCM['NPLOT'] = {'card': 1, 'position': 3, 'type': 'I', 'value': self.nplot}
-        CSCM['INCRE'] = {'card': 1, 'position': 4, 'type': 'F', 'value': self.incre}
-        CSCM['IRATE'] = {'card': 1, 'position': 5, 'type': 'I', 'value': self.irate}
-        CSCM['ERODE'] = {'card': 1, 'position': 6, 'type': 'F', 'value': self.erode}
-        CSCM['RECOV'] = {'card': 1, 'position': 7, 'type': 'F', 'value': self.recov}
-        CSCM['ITRETRC'] = {'card': 1, 'position': 8, 'type': 'I', 'value': self.itretrc}
-        
-        # Card 2
-        CSCM['PRED'] = {'card': 2, 'position': 1, 'type': 'F', 'value': self.pred}
-        
-        # Card 3
-        CSCM['G'] = {'card': 3, 'position': 1, 'type': 'F', 'value': data['G']}
-        CSCM['K'] = {'card': 3, 'position': 2, 'type': 'F', 'value': data['K']}
-        CSCM['ALPHA'] = {'card': 3, 'position': 3, 'type': 'F', 'value': self.initialize.alpha(Revision.REV_2)}
-        CSCM['THETA'] = {'card': 3, 'position': 4, 'type': 'F', 'value': self.initialize.theta(Revision.REV_2)}
-        CSCM['LAMBDA'] = {'card': 3, 'position': 5, 'type': 'F', 'value': self.initialize.lamda(Revision.REV_2)}
-        CSCM['BETA'] = {'card': 3, 'position': 6, 'type': 'F', 'value': self.initialize.beta(Revision.REV_2)}
-        CSCM['NH'] = {'card': 3, 'position': 7, 'type': 'F', 'value': self.nh}
-        CSCM['CH'] = {'card': 3, 'position': 8, 'type': 'F', 'value': self.ch}
-        
-        # Card 4
-        CSCM['ALPHA1'] = {'card': 4, 'position': 1, 'type': 'F', 'value': self.initialize.alpha_1(Revision.REV_2)}
-        CSCM['THETA1'] = {'card': 4, 'position': 2, 'type': 'F', 'value': self.initialize.theta_1(Revision.REV_2)}
-        CSCM['LAMBDA1'] = {'card': 4, 'position': 3, 'type': 'F', 'value': self.initialize.lamda_1(Revision.REV_2)}
-        CSCM['BETA1'] = {'card': 4, 'position': 4, 'type': 'F', 'value': self.initialize.beta_1(Revision.REV_2)}
-        CSCM['ALPHA2'] = {'card': 4, 'position': 5, 'type': 'F', 'value': self.initialize.alpha_2(Revision.REV_2)}
-        CSCM['THETA2'] = {'card': 4, 'position': 6, 'type': 'F', 'value': self.initialize.theta_2(Revision.REV_2)}
-        CSCM['LAMBDA2'] = {'card': 4, 'position': 7, 'type': 'F', 'value': self.initialize.lamda_2(Revision.REV_2)}
-        CSCM['BETA2'] = {'card': 4, 'position': 8, 'type': 'F', 'value': self.initialize.beta_2(Revision.REV_2)}
-        
-        # Card 5
-        CSCM['R'] = {'card': 5, 'position': 1, 'type': 'F', 'value': self.initialize.R(Revision.REV_2)}
-        CSCM['X0'] = {'card': 5, 'position': 2, 'type': 'F', 'value': self.initialize.kappa_0(Revision.REV_2)}
-        CSCM['W'] = {'card': 5, 'position': 3, 'type': 'F', 'value': self.initialize.W(Revision.REV_2)}
-        CSCM['D1'] = {'card': 5, 'position': 4, 'type': 'F', 'value': self.initialize.D_1(Revision.REV_2)}
-        CSCM['D2'] = {'card': 5, 'position': 5, 'type': 'F', 'value': self.initialize.D_2(Revision.REV_2)}
-        
-        # Card 6
-        CSCM['B'] = {'card': 6, 'position': 1, 'type': 'F', 'value': self.initialize.B(Revision.REV_1)}
-        CSCM['GFC'] = {'card': 6, 'position': 2, 'type': 'F', 'value': data['G_fc']}
-        CSCM['D'] = {'card': 6, 'position': 3, 'type': 'F', 'value': self.initialize.D(Revision.REV_1)}
-        CSCM['GFT'] = {'card': 6, 'position': 4, 'type': 'F', 'value': data['G_ft']}
-        CSCM['GFS'] = {'card': 6, 'position': 5, 'type': 'F', 'value': data['G_fs']}
-        CSCM['PWRC'] = {'card': 6, 'position': 6, 'type': 'F', 'value': self.pwrc}
-        CSCM['PWRT'] = {'card': 6, 'position': 7, 'type': 'F', 'value': self.pwrt}
-        CSCM['PMOD'] = {'card': 6, 'position': 8, 'type': 'F', 'value': self.pmod}
-        
-        # Card 7
-        CSCM['ETA_0_C'] = {'card': 7, 'position': 1, 'type': 'F', 'value': self.initialize.eta_0_c(Revision.REV_1)}
-        CSCM['N_C'] = {'card': 7, 'position': 2, 'type': 'F', 'value': self.initialize.n_c(Revision.REV_1)}
-        CSCM['ETA_0_T'] = {'card': 7, 'position': 3, 'type': 'F', 'value': self.initialize.eta_0_t(Revision.REV_1)}
-        CSCM['N_T'] = {'card': 7, 'position': 4, 'type': 'F', 'value': self.initialize.n_t(Revision.REV_1)}
-        CSCM['OVERC'] = {'card': 7, 'position': 5, 'type': 'F', 'value': self.initialize.overc(Revision.REV_1)}
-        CSCM['OVERT'] = {'card': 7, 'position': 6, 'type': 'F', 'value': self.initialize.overt(Revision.REV_1)}
-        CSCM['SRATE'] = {'card': 7, 'position': 7, 'type': 'F', 'value': self.initialize.Srate(Revision.REV_1)}
-        CSCM['REPOW'] = {'card': 7, 'position': 8, 'type': 'F', 'value': self.repow}
-        
-        return CSCM
+        return self.keyword_record().to_dict()
     
     def get_ceb_output(self):
         """
@@ -894,18 +1032,40 @@ class MatCSCM:
         str
             Formatted text with CEB-FIP estimations
         """
-        # Convert CEB class to dictionary for compatibility
-        from CEB import CEB
-        items = CEB(f_c=self.f_c, d_max=self.dmax, rho=self.rho)
-        text = '$#\n'
-        text += '$# CEBFIP Estimations:\n'
-        for key in items:
-            if not isinstance(items[key], np.ndarray):
-                text += '$# {0} = {1:G}\n'.format(key, items[key])
-        text += '$#\n'
-        return text
+        return ceb_output_text(self.f_c, self.dmax, self.rho)
     
 
+def ceb_output_text(f_c, d_max=16.0, rho=2.4E-9):
+    """
+    Format the CEB-FIP estimations of a concrete as keyword comment lines.
+    
+    Parameters:
+    -----------
+    f_c : float
+        Characteristic compressive strength of concrete (MPa)
+    d_max : float
+        Maximum aggregate size (mm)
+    rho : float
+        Density (kg/mm^3)
+    
+    Returns:
+    --------
+    str
+        Formatted text with CEB-FIP estimations
+    """
+    # Convert CEB class to dictionary for compatibility
+    from CEB import CEB
+    items = CEB(f_c=f_c, d_max=d_max, rho=rho)
+    text = '$#\n'
+    text += '$# CEBFIP Estimations:\n'
+    for key in items:
+        if not isinstance(items[key], np.ndarray):
+            text += '$# {0} = {1:G}\n'.format(key, items[key])
+    text += '$#\n'
+    return text
+
+
+
 def keyword_to_text(data, word_length=10, word_number=8):
     """
     Convert material keyword dictionary to formatted text.
@@ -0,0 +1,184 @@
+"""
+Vectorized uniaxial compression driver for many materials at once.
+
+Performs the steps of ``MatCSCM.Evaluate.uniaxial_compression_response``
+(elastic trial, shear/cap yield check, kinematic hardening, cap update and
+ductile damage) for a whole batch of materials: the loop runs over strain
+steps, every operation inside a step works on arrays over the materials.
+Materials are given as keyword field values (``cscm_keyword.CSCM_LAYOUT``)
+plus their compressive strength, so the driver responds to any parameter
+set, not only to those derived from f_c.
+
+Besides the optional stress curves, summary quantities are accumulated on
+the fly (peak stress, strain at peak, softening slope, plastic volume
+strain and damage), so large batches do not need to keep the curves.
+"""
+
+import numpy as np
+
+from cscm_keyword import FIELD_INDEX
+
+# Defaults of the kinematic hardening parameters when NH / CH are zero
+DEFAULT_NH = 0.7
+DEFAULT_CH = 0.01
+
+# Maximum ductile damage
+DAMAGE_MAX = 0.99
+
+# Keyword fields read by ``driver_parameters``
+DRIVER_FIELDS = ('G', 'K', 'ALPHA', 'THETA', 'LAMBDA', 'BETA', 'R', 'X0', 'W', 'D1', 'D2',
+                 'B', 'GFC', 'NH', 'CH')
+
+OUTPUTS = ('peak_stress', 'peak_strain', 'softening_slope', 'final_stress',
+           'plastic_volume_strain', 'damage')
+
+
+def driver_parameters(values):
+    """
+    Driver inputs from keyword field values.
+
+    Parameters:
+    -----------
+    values : numpy.ndarray
+        Field values of shape (n_materials, N_FIELDS)
+
+    Returns:
+    --------
+    dict
+        Arrays of shape (n_materials,): 'E', 'nu', 'alpha', 'theta', 'lamda',
+        'beta', 'R', 'kappa_0', 'W', 'D1', 'D2', 'B', 'G_fc', 'NH', 'CH'
+    """
+    values = np.atleast_2d(np.asarray(values, dtype=float))
+    column = {name: values[:, index] for name, index in FIELD_INDEX.items()}
+    G, K = column['G'], column['K']
+    return {
+        # Isotropic elasticity from shear and bulk modulus
+        'E': 9 * K * G / (3 * K + G),
+        'nu': (3 * K - 2 * G) / (2 * (3 * K + G)),
+        'alpha': column['ALPHA'], 'theta': column['THETA'],
+        'lamda': column['LAMBDA'], 'beta': column['BETA'],
+        'R': column['R'], 'kappa_0': column['X0'], 'W': column['W'],
+        'D1': column['D1'], 'D2': column['D2'],
+        'B': column['B'], 'G_fc': column['GFC'],
+        'NH': np.where(column['NH'] > 0, column['NH'], DEFAULT_NH),
+        'CH': np.where(column['CH'] > 0, column['CH'], DEFAULT_CH),
+    }
+
+
+def uniaxial_compression(f_c, values, max_strain=0.01, num_points=1000, curves=False):
+    """
+    Uniaxial compression response of many materials.
+
+    Parameters:
+    -----------
+    f_c : array_like
+        Compressive strength (MPa) of every material
+    values : numpy.ndarray
+        Keyword field values of shape (n_materials, N_FIELDS)
+    max_strain : float
+        Maximum compression strain (positive value)
+    num_points : int
+        Number of calculation points
+    curves : bool
+        Return the stress curves of all materials
+
+    Returns:
+    --------
+    dict
+        'strains' of shape (num_points,), 'stresses' of shape
+        (n_materials, num_points) if ``curves``, and arrays of shape
+        (n_materials,) of ``OUTPUTS``: peak stress and its strain, secant
+        slope from the peak to the last point, final stress, plastic volume
+        strain and damage at the last point
+    """
+    p = driver_parameters(values)
+    n = len(p['E'])
+    f_c = np.broadcast_to(np.asarray(f_c, dtype=float), (n,))
+    E, nu, R, kappa_0 = p['E'], p['nu'], p['R'], p['kappa_0']
+    NH, CH, B = p['NH'], p['CH'], p['B']
+
+    strains = np.linspace(0, max_strain, num_points)
+    stresses = np.empty((n, num_points)) if curves else None
+
+    kappa = kappa_0.copy()
+    epsilon_v_p = np.zeros(n)
+    elastic_strain = np.zeros(n)
+    plastic_strain = np.zeros(n)
+    damage = np.zeros(n)
+    damage_threshold = np.zeros(n)
+    r_0d = f_c**2 / (2 * E)
+    peak_stress = np.zeros(n)
+    peak_strain = np.zeros(n)
+    stress = np.zeros(n)
+
+    with np.errstate(over='ignore', invalid='ignore', divide='ignore'):
+        for i, total_strain in enumerate(strains):
+            d_strain = strains[i] - strains[i - 1] if i > 0 else 0.0
+            elastic_strain += d_strain
+
+            # Trial elastic stress and invariants (compression negative)
+            sigma_trial = -E * elastic_strain
+            I_1 = sigma_trial
+            J_2 = sigma_trial**2 / 3
+
+            # Shear surface, elliptic cap and general yield function
+            F_f = p['alpha'] - p['lamda'] * np.exp(-p['beta'] * I_1) + p['theta'] * I_1
+            L = np.maximum(kappa, kappa_0)
+            F_c = np.maximum(1 - ((I_1 - L)**2 + R**2 * J_2) / kappa**2, 0)
+            plastic = F_f * F_c - kappa > 0
+
+            sigma = sigma_trial
+            if plastic.any():
+                # Kinematic hardening of the effective yield stress
+                magnitude = np.abs(sigma_trial)
+                hardening = 1 - np.exp(-CH * plastic_strain * 100)
+                effective_yield = np.where(magnitude > NH * f_c,
+                                           f_c * (NH + (1 - NH) * hardening), f_c * NH)
+                limited = plastic & (magnitude > effective_yield)
+                sigma = np.where(limited, -effective_yield, sigma_trial)
+
+                # Plastic correction and cap update
+                delta_epsilon_p = np.where(limited, (magnitude - effective_yield) / E, 0.0)
+                plastic_strain += delta_epsilon_p
+                elastic_strain -= delta_epsilon_p
+                epsilon_v_p_new = epsilon_v_p + delta_epsilon_p * (1 - 2 * nu)
+                norm = np.abs(epsilon_v_p_new) / p['W']
+                X_new = kappa_0 + norm * (1 - np.exp(-p['D1'] * norm - p['D2'] * norm**2))
+                kappa_new = np.maximum((X_new + R**2 * kappa_0) / (1 + R**2), kappa_0)
+                kappa = np.where(limited, kappa_new, kappa)
+                epsilon_v_p = np.where(limited, epsilon_v_p_new, epsilon_v_p)
+
+            # Ductile damage driven by the strain energy
+            tau_d = np.abs(sigma * total_strain)
+            grow = tau_d > damage_threshold
+            damage_threshold = np.where(grow, tau_d, damage_threshold)
+            active = grow & (tau_d > r_0d)
+            if active.any():
+                tau_diff = tau_d - r_0d
+                a = np.where(B + tau_diff > 0, p['G_fc'] / (B + tau_diff), 0.01)
+                d = ((1 + B) / (1 + B * np.exp(-a * tau_diff)) - 1) * DAMAGE_MAX / B
+                damage = np.where(active, np.minimum(DAMAGE_MAX, np.maximum(damage, d)), damage)
+
+            stress = np.abs(sigma * (1 - damage))
+            if curves:
+                stresses[:, i] = stress
+            higher = stress > peak_stress
+            peak_stress = np.where(higher, stress, peak_stress)
+            peak_strain = np.where(higher, total_strain, peak_strain)
+
+    span = strains[-1] - peak_strain
+    with np.errstate(invalid='ignore', divide='ignore'):
+        softening_slope = np.where(span > 0, (stress - peak_stress) / span, 0.0)
+
+    result = {
+        'strains': strains,
+        'peak_stress': peak_stress,
+        'peak_strain': peak_strain,
+        'softening_slope': softening_slope,
+        'final_stress': stress,
+        'plastic_volume_strain': epsilon_v_p,
+        'damage': damage,
+    }
+    if curves:
+        result['stresses'] = stresses
+    return result
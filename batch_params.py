@@ -0,0 +1,161 @@
+"""
+Vectorized evaluation of *MAT_CSCM parameters for many materials.
+
+The fit formulas of ``MatCSCM.Initialize`` only use arithmetic and numpy
+functions of f_c, the element size and CEB-FIP properties, so they are
+evaluated here on whole arrays by giving ``Initialize`` a parent that holds
+arrays instead of scalars. The CEB-FIP properties used by the keyword are
+evaluated with the formulas of ``CEB.CEBClass`` in array form.
+
+``keyword_values`` returns the same rows as ``MatCSCM.keyword_values`` for
+every combination of inputs without creating MatCSCM objects.
+"""
+
+from types import SimpleNamespace
+
+import numpy as np
+
+from MatCSCM import MatCSCM, Revision
+from cscm_keyword import N_FIELDS
+from theory import Theory
+
+
+def ceb_properties(f_c, d_max=16.0, delta_f=8.):
+    """
+    CEB-FIP properties of ``CEB.CEBClass`` for arrays of inputs.
+
+    Parameters:
+    -----------
+    f_c : array_like
+        Characteristic compressive strength of concrete (MPa)
+    d_max : array_like
+        Maximum aggregate size (mm)
+    delta_f : array_like
+        Difference between mean and characteristic strength (MPa)
+
+    Returns:
+    --------
+    dict
+        'f_c', 'f_cm', 'f_t', 'E', 'nu', 'G', 'K', 'G_fc', 'G_ft', 'G_fs'
+        broadcast to the shape of the inputs
+    """
+    f_c, d_max, delta_f = np.broadcast_arrays(np.asarray(f_c, dtype=float),
+                                              np.asarray(d_max, dtype=float),
+                                              np.asarray(delta_f, dtype=float))
+    f_cm = f_c + delta_f
+    f_cm0 = 10.0
+
+    # 5.1.5.1 Tensile strength
+    f_t = np.where(f_c <= 50, 0.3 * np.power(f_c, 2. / 3.), 2.12 * np.log(1 + 0.1 * f_cm))
+
+    # 5.1.5.2 Fracture energy
+    G_f = (0.021 + 5.357E-4 * d_max) * np.power(f_cm / f_cm0, 0.7)
+
+    # 5.1.7.2 Modulus of elasticity at 28 day
+    E = 21.5E+3 * np.power(f_cm / f_cm0, 1. / 3.)
+    nu = Theory.nu(f_c)
+
+    return {
+        'f_c': f_c, 'f_cm': f_cm, 'f_t': f_t, 'E': E, 'nu': nu,
+        'G': E / (2 * (1 + nu)), 'K': E / (3 * (1 - 2 * nu)),
+        'G_fc': 100 * G_f, 'G_ft': G_f, 'G_fs': G_f,
+    }
+
+
+class _BatchMaterial:
+    """Stand-in parent of ``MatCSCM.Initialize`` holding arrays of inputs."""
+
+    def __init__(self, f_c, ceb_data, esize):
+        self.f_c = f_c
+        self.esize = esize
+        self.ceb_data = ceb_data
+        self.initialize = MatCSCM.Initialize(self)
+
+
+def batch_initialize(f_c, dmax=19, esize=200, delta_f=8.):
+    """
+    ``MatCSCM.Initialize`` evaluating its parameters on arrays.
+
+    Parameters:
+    -----------
+    f_c, dmax, esize : array_like
+        Compressive strength (MPa), maximum aggregate size (mm) and element size (mm)
+    delta_f : array_like
+        Difference between mean and characteristic strength (MPa) of the CEB-FIP properties
+
+    Returns:
+    --------
+    MatCSCM.Initialize
+        Initializer whose methods return arrays of the broadcast input shape
+        (constants of a revision are returned as scalars)
+    """
+    f_c, dmax, esize, delta_f = np.broadcast_arrays(np.asarray(f_c, dtype=float),
+                                                    np.asarray(dmax, dtype=float),
+                                                    np.asarray(esize, dtype=float),
+                                                    np.asarray(delta_f, dtype=float))
+    ceb_data = SimpleNamespace(**ceb_properties(f_c, dmax, delta_f))
+    return _BatchMaterial(f_c, ceb_data, esize).initialize
+
+
+def keyword_values(f_c, dmax=19, esize=200, rev=Revision.REV_2, softening_rev=Revision.REV_1,
+                   delta_f=8., **options):
+    """
+    Keyword field values of many materials at once.
+
+    Parameters:
+    -----------
+    f_c, dmax, esize : array_like
+        Compressive strength (MPa), maximum aggregate size (mm) and element
+        size (mm); broadcast against each other
+    rev : Revision
+        Revision of the yield surface and cap parameters (cards 3 to 5)
+    softening_rev : Revision
+        Revision of the softening parameters B and D; REV_2 regularizes them
+        with the element size
+    delta_f : array_like
+        Difference between mean and characteristic strength (MPa) of the
+        CEB-FIP properties; broadcast against f_c
+    **options
+        Further ``MatCSCM`` constructor arguments (mid, rho, irate, ...)
+        shared by all materials
+
+    Returns:
+    --------
+    numpy.ndarray
+        Values of shape (n_materials, N_FIELDS) ordered as
+        ``cscm_keyword.CSCM_LAYOUT``; with the default revisions every row
+        equals ``MatCSCM.keyword_values`` of the same inputs
+    """
+    init = batch_initialize(f_c, dmax, esize, delta_f)
+    ceb = init.parent.ceb_data
+    n = init.parent.f_c.size
+    # Scalar card options are converted by the MatCSCM constructor
+    mat = MatCSCM(**options)
+    mid = mat.mid if isinstance(mat.mid, (int, float, np.number)) else np.nan
+
+    columns = [
+        # Card 1
+        mid, mat.rho, mat.nplot, mat.incre, mat.irate, mat.erode, mat.recov, mat.itretrc,
+        # Card 2
+        mat.pred,
+        # Card 3
+        ceb.G, ceb.K, init.alpha(rev), init.theta(rev), init.lamda(rev), init.beta(rev),
+        mat.nh, mat.ch,
+        # Card 4
+        init.alpha_1(rev), init.theta_1(rev), init.lamda_1(rev), init.beta_1(rev),
+        init.alpha_2(rev), init.theta_2(rev), init.lamda_2(rev), init.beta_2(rev),
+        # Card 5
+        init.R(rev), init.kappa_0(rev), init.W(rev), init.D_1(rev), init.D_2(rev),
+        # Card 6
+        init.B(softening_rev), ceb.G_fc, init.D(softening_rev), ceb.G_ft, ceb.G_fs,
+        mat.pwrc, mat.pwrt, mat.pmod,
+        # Card 7
+        init.eta_0_c(Revision.REV_1), init.n_c(Revision.REV_1),
+        init.eta_0_t(Revision.REV_1), init.n_t(Revision.REV_1),
+        init.overc(Revision.REV_1), init.overt(Revision.REV_1),
+        init.Srate(Revision.REV_1), mat.repow,
+    ]
+    values = np.empty((n, N_FIELDS))
+    for i, column in enumerate(columns):
+        values[:, i] = np.ravel(column) if np.ndim(column) else column
+    return values
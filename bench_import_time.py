@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Import-time benchmark for the computational modules.
+
+Every module is imported in a fresh interpreter several times; the median
+wall-clock import time is reported together with a flag telling whether the
+import pulled in matplotlib. Worker processes that only generate keywords
+should never pay for matplotlib.
+
+Usage:
+    python bench_import_time.py [repeats]
+"""
+
+import os
+import subprocess
+import sys
+
+import numpy as np
+
+MODULES = ['CEB', 'theory', 'MatCSCM', 'yield_functions', 'instrumentation']
+
+PROBE = (
+    "import sys, time\n"
+    "t = time.perf_counter()\n"
+    "import {module}\n"
+    "print(time.perf_counter() - t, 'matplotlib' in sys.modules)\n"
+)
+
+
+def import_time(module, repeats=5):
+    """
+    Measure import time of a module in fresh interpreters.
+
+    Parameters:
+    -----------
+    module : str
+        Module name
+    repeats : int
+        Number of interpreter launches
+
+    Returns:
+    --------
+    tuple
+        (median import time in seconds, True if matplotlib was imported)
+    """
+    cwd = os.path.dirname(os.path.abspath(__file__))
+    times = []
+    loads_matplotlib = False
+    for _ in range(repeats):
+        output = subprocess.run([sys.executable, '-c', PROBE.format(module=module)],
+                                cwd=cwd, capture_output=True, text=True, check=True).stdout
+        elapsed, matplotlib_loaded = output.split()
+        times.append(float(elapsed))
+        loads_matplotlib |= matplotlib_loaded == 'True'
+    return float(np.median(times)), loads_matplotlib
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    print('{0:<18s} {1:>12s} {2:>12s}'.format('module', 'import, ms', 'matplotlib'))
+    for module in MODULES:
+        elapsed, loads_matplotlib = import_time(module, repeats)
+        print('{0:<18s} {1:>12.1f} {2:>12s}'.format(module, elapsed * 1000, str(loads_matplotlib)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,432 @@
+"""
+Batch calibration report for families of concrete grades.
+
+For every grade (f_c, dmax) the report shows the CEB-FIP stress-strain
+curves, the DIF curves, the compression/shear/tensile meridians with the
+initial cap, the uniaxial CSCM response and the *MAT_CSCM cards:
+
+1. the intermediates of all grades that are not cached yet are computed
+   together with the batch evaluators (``batch_params``, ``batch_driver``)
+   and stored per grade in a ``result_cache.ResultCache``
+2. the figures of those grades are rendered off-screen in worker processes
+   (``render.render_batch``) and cached as PNG bytes
+3. everything is assembled into one self-contained HTML file, or into a PDF
+   with one page per grade
+
+Cache keys contain the model version, a hash of the report and plotting
+code (``REPORT_SOURCES``) and the grade inputs, so rebuilding after adding
+a grade or changing a setting only recomputes the affected grades; a
+change of the model, report or plotting code recomputes everything.
+"""
+
+import base64
+import html
+import os
+import tempfile
+
+import numpy as np
+
+from CEB import CEBClass, DIF_table
+from MatCSCM import Revision
+from batch_driver import uniaxial_compression
+from batch_params import keyword_values
+from cscm_keyword import FIELD_INDEX, format_cards
+from render import draw_cscm_compression, render_batch
+from result_cache import ceb_curves, default_cache, model_version, source_version
+
+# Figures of every grade, in report order
+REPORT_FIGURES = ('ceb', 'dif', 'meridians', 'compression')
+
+# Sources of the report data and figures besides the model (``MODEL_SOURCES``)
+REPORT_SOURCES = ('calibration_report.py', 'render.py')
+
+# Keyword fields listed in the summary table
+SUMMARY_FIELDS = ('G', 'K', 'ALPHA', 'R', 'X0', 'GFC', 'GFT')
+
+MERIDIAN_POINTS = 200
+
+
+def meridians(values, num_points=MERIDIAN_POINTS):
+    """
+    Meridians and initial cap of many materials.
+
+    The shear surface F_f(I_1) is the compression (TXC) meridian; the shear
+    (TOR) and tensile (TXE) meridians scale it by Q_1 and Q_2. The initial
+    cap is the ellipse from L = X0 (kappa_0) to X = L + R * F_f(L).
+
+    Parameters:
+    -----------
+    values : numpy.ndarray
+        Keyword field values of shape (n_materials, N_FIELDS)
+    num_points : int
+        Points per meridian
+
+    Returns:
+    --------
+    dict
+        Arrays of shape (n_materials, num_points): 'I_1' (0 to X), 'TXC',
+        'TOR', 'TXE', 'cap_I_1' and 'cap_J' (sqrt(J_2) on the TXC cap)
+    """
+    column = {name: values[:, [index]] for name, index in FIELD_INDEX.items()}
+
+    def shear(I_1):
+        return column['ALPHA'] - column['LAMBDA'] * np.exp(-column['BETA'] * I_1) + column['THETA'] * I_1
+
+    L = column['X0']
+    X = L + column['R'] * shear(L)
+    unit = np.linspace(0, 1, num_points)
+    I_1 = X * unit
+    F_f = shear(I_1)
+    Q_1 = column['ALPHA1'] - column['LAMBDA1'] * np.exp(-column['BETA1'] * I_1) + column['THETA1'] * I_1
+    Q_2 = column['ALPHA2'] - column['LAMBDA2'] * np.exp(-column['BETA2'] * I_1) + column['THETA2'] * I_1
+    cap_I_1 = L + (X - L) * unit
+    cap_J = shear(cap_I_1) * np.sqrt(np.maximum(1 - unit**2, 0))
+    return {'I_1': I_1, 'TXC': F_f, 'TOR': Q_1 * F_f, 'TXE': Q_2 * F_f,
+            'cap_I_1': cap_I_1, 'cap_J': cap_J}
+
+
+def draw_ceb(ax, compression_curve, tension_curve):
+    """Draw the CEB-FIP compression and tension stress-strain curves."""
+    ax.plot(np.abs(compression_curve[0]) * 100, np.abs(compression_curve[1]), 'b-', linewidth=2,
+            label='Compression')
+    ax.plot(np.abs(tension_curve[0]) * 100, np.abs(tension_curve[1]), 'r-', linewidth=2, label='Tension')
+    ax.set_xlabel('Strain, %')
+    ax.set_ylabel('Stress, MPa')
+    ax.set_title('CEB-FIP Stress-Strain Curves')
+    ax.grid(True, alpha=0.3)
+    ax.legend()
+
+
+def draw_dif(ax, dif_c, dif_t):
+    """Draw the compressive and tensile dynamic increase factors."""
+    ax.semilogx(dif_c[0], dif_c[1], 'b-', linewidth=2, label='Compression')
+    ax.semilogx(dif_t[0], dif_t[1], 'r-', linewidth=2, label='Tension')
+    ax.set_xlabel('Strain Rate, 1/s')
+    ax.set_ylabel('DIF')
+    ax.set_title('Dynamic Increase Factors')
+    ax.grid(True, which='both', alpha=0.3)
+    ax.legend()
+
+
+def draw_meridians(ax, I_1, txc, tor, txe, cap_I_1, cap_J):
+    """Draw the TXC, TOR and TXE meridians and the initial cap."""
+    ax.plot(I_1, txc, 'b-', linewidth=2, label='TXC')
+    ax.plot(I_1, tor, 'g-', linewidth=2, label='TOR')
+    ax.plot(I_1, txe, 'r-', linewidth=2, label='TXE')
+    ax.plot(cap_I_1, cap_J, 'k--', linewidth=1.5, label='Initial cap')
+    ax.set_xlabel('I₁, MPa')
+    ax.set_ylabel('√J₂, MPa')
+    ax.set_title('Meridians and Cap')
+    ax.set_xlim(left=0)
+    ax.set_ylim(bottom=0)
+    ax.grid(True, alpha=0.3)
+    ax.legend()
+
+
+def _figure_jobs(grade, data):
+    """Render jobs (kind, args) of the report figures of one grade."""
+    return {
+        'ceb': (draw_ceb, (data['ceb_compression'], data['ceb_tension'])),
+        'dif': (draw_dif, (data['dif_c'], data['dif_t'])),
+        'meridians': (draw_meridians, tuple(data[name] for name in
+                                            ('I_1', 'TXC', 'TOR', 'TXE', 'cap_I_1', 'cap_J'))),
+        'compression': ('cscm_compression', (data['strains'], data['stresses'], '{0:g}'.format(grade[0]),
+                                             '{0:g}'.format(grade[1]), data['strains'][-1])),
+    }
+
+
+def _compute(grades, rev, max_strain, num_points, cache):
+    """Intermediates of grades (f_c, dmax) computed as one batch."""
+    f_c = np.array([grade[0] for grade in grades], dtype=float)
+    dmax = np.array([grade[1] for grade in grades], dtype=float)
+    values = keyword_values(f_c, dmax, rev=rev)
+    response = uniaxial_compression(f_c, values, max_strain, num_points, curves=True)
+    lines = meridians(values)
+    results = []
+    for i, (strength, size) in enumerate(grades):
+        if cache is not None:
+            curves = ceb_curves(strength, size, cache=cache)
+        else:
+            ceb = CEBClass(f_c=strength, d_max=size)
+            curves = {'compression_curve': ceb.compression_curve, 'tension_curve': ceb.tension_curve}
+        data = {'values': values[i], 'strains': response['strains'], 'stresses': response['stresses'][i],
+                'ceb_compression': np.asarray(curves['compression_curve']),
+                'ceb_tension': np.asarray(curves['tension_curve']),
+                'dif_c': DIF_table(strength, 'compression', rtol=1e-3),
+                'dif_t': DIF_table(strength, 'tension', rtol=1e-3)}
+        data.update({name: array[i] for name, array in lines.items()})
+        results.append(data)
+    return results
+
+
+class CalibrationReport:
+    """
+    Data and figures of a family of concrete grades.
+
+    Parameters:
+    -----------
+    f_c : array_like
+        Compressive strengths (MPa) of the grades
+    dmax : array_like
+        Maximum aggregate sizes (mm); broadcast against f_c
+    rev : Revision
+        Revision of the yield surface and cap parameters
+    first_mid : int
+        Material ID of the first grade
+    max_strain : float
+        Maximum strain of the uniaxial compression response
+    num_points : int
+        Points of the uniaxial compression response
+    cache : ResultCache or bool, optional
+        Cache of intermediates and figures; None uses
+        ``result_cache.default_cache()``, False disables caching
+    workers : int, optional
+        Worker processes for rendering; None uses the CPU count
+    dpi : int
+        Resolution of the figures
+
+    Attributes:
+    -----------
+    computed : int
+        Grades computed by the last ``compute`` (the others were cached)
+    rendered : int
+        Figures rendered by the last ``figures``
+    """
+
+    def __init__(self, f_c, dmax=19, rev=Revision.REV_2, first_mid=1, max_strain=0.01, num_points=500,
+                 cache=None, workers=None, dpi=100):
+        f_c, dmax = np.broadcast_arrays(np.atleast_1d(np.asarray(f_c, dtype=float)),
+                                        np.asarray(dmax, dtype=float))
+        self.grades = [(float(strength), float(size)) for strength, size in zip(f_c, dmax)]
+        self.rev = rev
+        self.first_mid = first_mid
+        self.max_strain = max_strain
+        self.num_points = num_points
+        if cache is None:
+            cache = default_cache()
+        self.cache = cache if cache is not False else None
+        self.workers = workers
+        self.dpi = dpi
+        self.computed = 0
+        self.rendered = 0
+        self._data = None
+        self._figures = None
+
+    def _key(self, grade, *parts):
+        return self.cache.key('calibration_report', model_version(), source_version(*REPORT_SOURCES), grade,
+                              self.rev, self.max_strain, self.num_points, *parts)
+
+    def compute(self):
+        """
+        Intermediates of all grades, computing only those not cached.
+
+        Returns:
+        --------
+        list of dict
+            Arrays per grade: keyword 'values', uniaxial 'strains'/'stresses',
+            CEB-FIP curves, DIF curves and meridians
+        """
+        if self._data is not None:
+            return self._data
+        data = [None] * len(self.grades)
+        if self.cache is not None:
+            data = [self.cache.get(self._key(grade)) for grade in self.grades]
+        missing = [i for i, item in enumerate(data) if item is None]
+        if missing:
+            computed = _compute([self.grades[i] for i in missing], self.rev,
+                                self.max_strain, self.num_points, self.cache)
+            for i, item in zip(missing, computed):
+                data[i] = self.cache.put(self._key(self.grades[i]), item) if self.cache is not None else item
+        self.computed = len(missing)
+        self._data = data
+        return data
+
+    def values(self):
+        """
+        Keyword field values of the grades with consecutive MIDs.
+
+        Returns:
+        --------
+        numpy.ndarray
+            Values of shape (n_grades, N_FIELDS)
+        """
+        values = np.array([item['values'] for item in self.compute()]).reshape(-1, len(FIELD_INDEX))
+        values[:, FIELD_INDEX['MID']] = self.first_mid + np.arange(len(values))
+        return values
+
+    def figures(self):
+        """
+        PNG images of the report figures, rendering only those not cached.
+
+        Returns:
+        --------
+        list of dict
+            Figure name (``REPORT_FIGURES``) -> PNG bytes, per grade
+        """
+        if self._figures is not None:
+            return self._figures
+        data = self.compute()
+        figures = [{} for _ in self.grades]
+        jobs, targets = [], []
+        for i, (grade, item) in enumerate(zip(self.grades, data)):
+            for name, (kind, args) in _figure_jobs(grade, item).items():
+                key = self._key(grade, 'figure', name, self.dpi) if self.cache is not None else None
+                cached = self.cache.get(key) if key is not None else None
+                if cached is not None:
+                    figures[i][name] = np.asarray(cached['png']).tobytes()
+                else:
+                    jobs.append((kind, args, 'grade{0}_{1}'.format(i, name)))
+                    targets.append((i, name, key))
+        if jobs:
+            with tempfile.TemporaryDirectory() as folder:
+                files = render_batch(jobs, folder, ('png',), self.workers, self.dpi)
+                for (i, name, key), path in zip(targets, files):
+                    with open(path, 'rb') as image:
+                        figures[i][name] = image.read()
+                    if key is not None:
+                        self.cache.put(key, {'png': np.frombuffer(figures[i][name], dtype=np.uint8)})
+        self.rendered = len(jobs)
+        self._figures = figures
+        return figures
+
+    def summary(self):
+        """
+        Main properties of the grades.
+
+        Returns:
+        --------
+        list of dict
+            'MID', 'f_c', 'dmax', ``SUMMARY_FIELDS`` and 'peak_stress' per grade
+        """
+        rows = []
+        for grade, row, item in zip(self.grades, self.values(), self.compute()):
+            summary = {'MID': int(row[FIELD_INDEX['MID']]), 'f_c': grade[0], 'dmax': grade[1]}
+            summary.update({name: row[FIELD_INDEX[name]] for name in SUMMARY_FIELDS})
+            summary['peak_stress'] = float(np.max(item['stresses']))
+            rows.append(summary)
+        return rows
+
+    def to_html(self, title='CSCM Calibration Report'):
+        """
+        Self-contained HTML report with embedded figures and keyword cards.
+
+        Returns:
+        --------
+        str
+            HTML document
+        """
+        figures = self.figures()
+        values = self.values()
+        rows = self.summary()
+        columns = list(rows[0]) if rows else []
+        parts = [
+            '<!DOCTYPE html>\n<html>\n<head>\n<meta charset="utf-8">\n',
+            '<title>{0}</title>\n'.format(html.escape(title)),
+            '<style>body{font-family:sans-serif;margin:2em}table{border-collapse:collapse}'
+            'td,th{border:1px solid #ccc;padding:2px 8px;text-align:right}'
+            'img{width:48%;margin:0.5%}pre{background:#f6f6f6;padding:1em;overflow-x:auto}</style>\n',
+            '</head>\n<body>\n<h1>{0}</h1>\n'.format(html.escape(title)),
+            '<p>Model version {0}, {1}, {2} grades</p>\n'.format(model_version(), self.rev.name, len(rows)),
+            '<table>\n<tr>' + ''.join('<th>{0}</th>'.format(name) for name in columns) + '</tr>\n',
+        ]
+        for i, row in enumerate(rows):
+            cells = ''.join('<td>{0:.4G}</td>'.format(row[name]) for name in columns)
+            parts.append('<tr onclick="location.hash=\'grade{0}\'">{1}</tr>\n'.format(i, cells))
+        parts.append('</table>\n')
+        for i, (grade, images) in enumerate(zip(self.grades, figures)):
+            parts.append('<section id="grade{0}">\n<h2>f\'c = {1:g} MPa, d_max = {2:g} mm</h2>\n'.format(
+                i, *grade))
+            for name in REPORT_FIGURES:
+                parts.append('<img alt="{0}" src="data:image/png;base64,{1}">\n'.format(
+                    name, base64.b64encode(images[name]).decode('ascii')))
+            parts.append('<pre>{0}</pre>\n</section>\n'.format(html.escape(format_cards(values[i:i + 1]))))
+        parts.append('</body>\n</html>\n')
+        return ''.join(parts)
+
+    def write_pdf(self, path, title='CSCM Calibration Report'):
+        """
+        Write a PDF with one page per grade (figures and keyword cards).
+
+        Pages are drawn in process from the cached intermediates.
+
+        Parameters:
+        -----------
+        path : str
+            Output file
+        """
+        from matplotlib.backends.backend_pdf import PdfPages
+        from matplotlib.figure import Figure
+
+        data = self.compute()
+        values = self.values()
+        with PdfPages(path) as pdf:
+            for i, (grade, item) in enumerate(zip(self.grades, data)):
+                figure = Figure(figsize=(16.54, 11.69))
+                grid = figure.add_gridspec(2, 3, width_ratios=(1, 1, 0.9))
+                axes = [figure.add_subplot(grid[row, col]) for row in range(2) for col in range(2)]
+                for ax, (name, (kind, args)) in zip(axes, _figure_jobs(grade, item).items()):
+                    draw = draw_cscm_compression if kind == 'cscm_compression' else kind
+                    draw(ax, *args)
+                text = figure.add_subplot(grid[:, 2])
+                text.axis('off')
+                text.text(0, 1, format_cards(values[i:i + 1]), family='monospace', fontsize=6.5, va='top')
+                figure.suptitle('{0}: f\'c = {1:g} MPa, d_max = {2:g} mm'.format(title, *grade), fontsize=14)
+                figure.tight_layout()
+                pdf.savefig(figure)
+            metadata = pdf.infodict()
+            metadata['Title'] = title
+
+    def write(self, path, title='CSCM Calibration Report'):
+        """
+        Write the report as HTML or PDF depending on the file extension.
+
+        Parameters:
+        -----------
+        path : str
+            Output file ending in .html/.htm or .pdf
+        title : str
+            Report title
+
+        Returns:
+        --------
+        str
+            The written path
+        """
+        extension = os.path.splitext(str(path))[1].lower()
+        if extension == '.pdf':
+            self.write_pdf(path, title)
+        elif extension in ('.html', '.htm'):
+            with open(path, 'w', encoding='utf-8') as out:
+                out.write(self.to_html(title))
+        else:
+            raise ValueError(f"Unsupported report format: {extension}")
+        return path
+
+
+def build_report(f_c, path, dmax=19, rev=Revision.REV_2, title='CSCM Calibration Report', **options):
+    """
+    Compute, render and write the calibration report of a family of grades.
+
+    Parameters:
+    -----------
+    f_c : array_like
+        Compressive strengths (MPa)
+    path : str
+        Output file (.html or .pdf)
+    dmax : array_like
+        Maximum aggregate sizes (mm)
+    rev : Revision
+        Revision of the yield surface and cap parameters
+    title : str
+        Report title
+    **options
+        Further ``CalibrationReport`` arguments (cache, workers, first_mid, ...)
+
+    Returns:
+    --------
+    CalibrationReport
+        The report, with ``computed`` / ``rendered`` counts of this build
+    """
+    report = CalibrationReport(f_c, dmax, rev, **options)
+    report.write(path, title)
+    return report
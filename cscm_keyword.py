@@ -0,0 +1,409 @@
+"""
+Compact representation of the LS-DYNA *MAT_CSCM keyword.
+
+The card layout (field name, card, position, format type) is static and shared
+by all materials. A material is stored as a flat float array ordered as
+``CSCM_LAYOUT``; ``KeywordRecord`` wraps such an array and provides the
+dict-of-dicts view returned by ``MatCSCM.generate_keyword``.
+
+Blank fields (``'AUTO'`` in the dict view) are stored as NaN.
+"""
+
+import io
+from collections import namedtuple
+from collections.abc import Mapping
+from functools import lru_cache
+
+import numpy as np
+
+KEYWORD_NAME = '*MAT_CSCM'
+
+KeywordField = namedtuple('KeywordField', ['name', 'card', 'position', 'type'])
+
+CSCM_LAYOUT = (
+    # Card 1
+    KeywordField('MID', 1, 1, 'A8'),
+    KeywordField('RHO', 1, 2, 'F'),
+    KeywordField('NPLOT', 1, 3, 'I'),
+    KeywordField('INCRE', 1, 4, 'F'),
+    KeywordField('IRATE', 1, 5, 'I'),
+    KeywordField('ERODE', 1, 6, 'F'),
+    KeywordField('RECOV', 1, 7, 'F'),
+    KeywordField('ITRETRC', 1, 8, 'I'),
+    # Card 2
+    KeywordField('PRED', 2, 1, 'F'),
+    # Card 3
+    KeywordField('G', 3, 1, 'F'),
+    KeywordField('K', 3, 2, 'F'),
+    KeywordField('ALPHA', 3, 3, 'F'),
+    KeywordField('THETA', 3, 4, 'F'),
+    KeywordField('LAMBDA', 3, 5, 'F'),
+    KeywordField('BETA', 3, 6, 'F'),
+    KeywordField('NH', 3, 7, 'F'),
+    KeywordField('CH', 3, 8, 'F'),
+    # Card 4
+    KeywordField('ALPHA1', 4, 1, 'F'),
+    KeywordField('THETA1', 4, 2, 'F'),
+    KeywordField('LAMBDA1', 4, 3, 'F'),
+    KeywordField('BETA1', 4, 4, 'F'),
+    KeywordField('ALPHA2', 4, 5, 'F'),
+    KeywordField('THETA2', 4, 6, 'F'),
+    KeywordField('LAMBDA2', 4, 7, 'F'),
+    KeywordField('BETA2', 4, 8, 'F'),
+    # Card 5
+    KeywordField('R', 5, 1, 'F'),
+    KeywordField('X0', 5, 2, 'F'),
+    KeywordField('W', 5, 3, 'F'),
+    KeywordField('D1', 5, 4, 'F'),
+    KeywordField('D2', 5, 5, 'F'),
+    # Card 6
+    KeywordField('B', 6, 1, 'F'),
+    KeywordField('GFC', 6, 2, 'F'),
+    KeywordField('D', 6, 3, 'F'),
+    KeywordField('GFT', 6, 4, 'F'),
+    KeywordField('GFS', 6, 5, 'F'),
+    KeywordField('PWRC', 6, 6, 'F'),
+    KeywordField('PWRT', 6, 7, 'F'),
+    KeywordField('PMOD', 6, 8, 'F'),
+    # Card 7
+    KeywordField('ETA_0_C', 7, 1, 'F'),
+    KeywordField('N_C', 7, 2, 'F'),
+    KeywordField('ETA_0_T', 7, 3, 'F'),
+    KeywordField('N_T', 7, 4, 'F'),
+    KeywordField('OVERC', 7, 5, 'F'),
+    KeywordField('OVERT', 7, 6, 'F'),
+    KeywordField('SRATE', 7, 7, 'F'),
+    KeywordField('REPOW', 7, 8, 'F'),
+)
+
+CSCM_FIELDS = tuple(field.name for field in CSCM_LAYOUT)
+FIELD_INDEX = {name: i for i, name in enumerate(CSCM_FIELDS)}
+N_FIELDS = len(CSCM_LAYOUT)
+
+
+def _field_value(field, value):
+    """Convert a stored float back to the type used in the dict view."""
+    if np.isnan(value):
+        return 'AUTO'
+    if field.type in ('A8', 'I') and float(value).is_integer():
+        return int(value)
+    return float(value)
+
+
+class KeywordRecord(Mapping):
+    """
+    One *MAT_CSCM material stored as a flat value array.
+
+    Behaves as a read-only mapping with the same keys and inner dicts as
+    ``MatCSCM.generate_keyword`` used to build; inner dicts are created on access.
+
+    Parameters:
+    -----------
+    values : array-like
+        Field values ordered as ``CSCM_LAYOUT``
+    mid : int or str, optional
+        Material ID if it is not numeric (A8 field); defaults to the MID value
+    """
+
+    __slots__ = ('values', 'mid')
+
+    def __init__(self, values, mid=None):
+        self.values = np.asarray(values, dtype=float)
+        if self.values.shape != (N_FIELDS,):
+            raise ValueError(f"Expected {N_FIELDS} values, got shape {self.values.shape}")
+        self.mid = mid
+
+    def __getitem__(self, key):
+        if key == 'NAME':
+            return KEYWORD_NAME
+        i = FIELD_INDEX[key]
+        field = CSCM_LAYOUT[i]
+        if field.name == 'MID' and self.mid is not None:
+            value = self.mid
+        else:
+            value = _field_value(field, self.values[i])
+        return {'card': field.card, 'position': field.position, 'type': field.type, 'value': value}
+
+    def __iter__(self):
+        yield 'NAME'
+        yield from CSCM_FIELDS
+
+    def __len__(self):
+        return N_FIELDS + 1
+
+    def __repr__(self):
+        return f"KeywordRecord(MID={self['MID']['value']!r})"
+
+    def to_dict(self):
+        """
+        Materialize the nested dict-of-dicts keyword representation.
+
+        Returns:
+        --------
+        dict
+            Dictionary as produced by ``MatCSCM.generate_keyword``
+        """
+        return {key: self[key] for key in self}
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Build a record from a nested keyword dictionary.
+
+        Parameters:
+        -----------
+        data : dict
+            Keyword dictionary with the fields of ``CSCM_LAYOUT``
+
+        Returns:
+        --------
+        KeywordRecord
+            Record with the same field values
+        """
+        values = np.empty(N_FIELDS)
+        mid = None
+        for i, name in enumerate(CSCM_FIELDS):
+            value = data[name]['value']
+            if value == 'AUTO':
+                values[i] = np.nan
+            elif name == 'MID' and not isinstance(value, (int, float, np.number)):
+                mid = value
+                values[i] = np.nan
+            else:
+                values[i] = value
+        return cls(values, mid)
+
+    def to_text(self, word_length=10, word_number=8):
+        """
+        Format the record as keyword text, identical to ``keyword_to_text``.
+
+        Parameters:
+        -----------
+        word_length : int
+            Word length for formatting
+        word_number : int
+            Number of words per line
+
+        Returns:
+        --------
+        str
+            Formatted keyword text
+        """
+        return records_to_text([self], word_length, word_number)
+
+
+def records_to_text(records, word_length=10, word_number=8):
+    """
+    Format many materials without building per-field dictionaries.
+
+    Parameters:
+    -----------
+    records : iterable of KeywordRecord or numpy.ndarray
+        Records or an array of shape (n_materials, N_FIELDS)
+    word_length : int
+        Word length for formatting
+    word_number : int
+        Number of words per line
+
+    Returns:
+    --------
+    str
+        Concatenated keyword text of all materials
+    """
+    if isinstance(records, np.ndarray):
+        values, mids = records, None
+    else:
+        records = list(records)
+        if not records:
+            return ''
+        values = np.vstack([record.values for record in records])
+        mids = [record.mid for record in records]
+        if all(mid is None for mid in mids):
+            mids = None
+    buffer = io.StringIO()
+    write_cards(values, buffer, word_length, word_number, mids)
+    return buffer.getvalue()
+
+
+def format_cards(values, word_length=10, word_number=8, mids=None):
+    """
+    Format a value array of many materials as keyword text.
+
+    Parameters:
+    -----------
+    values : numpy.ndarray
+        Field values of shape (n_materials, N_FIELDS)
+    word_length : int
+        Word length for formatting
+    word_number : int
+        Number of words per line
+    mids : sequence, optional
+        Material IDs overriding the MID column (e.g. non-numeric IDs)
+
+    Returns:
+    --------
+    str
+        Concatenated keyword text of all materials
+    """
+    buffer = io.StringIO()
+    write_cards(values, buffer, word_length, word_number, mids)
+    return buffer.getvalue()
+
+
+def write_cards(values, out, word_length=10, word_number=8, mids=None, chunk_size=1024,
+                trailers=None):
+    """
+    Write *MAT_CSCM cards of many materials to a file handle.
+
+    One preformatted template covers the whole keyword, so every material is
+    formatted with a single ``str.format`` call. Type conversion is done per
+    column and the text is written in chunks of ``chunk_size`` materials.
+    Materials with blank (NaN) fields fall back to per-field formatting.
+
+    Parameters:
+    -----------
+    values : numpy.ndarray
+        Field values of shape (n_materials, N_FIELDS)
+    out : file-like
+        Text stream with a ``write`` method
+    word_length : int
+        Word length for formatting
+    word_number : int
+        Number of words per line
+    mids : sequence, optional
+        Material IDs overriding the MID column (e.g. non-numeric IDs)
+    chunk_size : int
+        Number of materials formatted per write
+    trailers : sequence of str, optional
+        Text written after each material (e.g. CEB-FIP comment block)
+
+    Returns:
+    --------
+    int
+        Number of materials written
+    """
+    values = np.atleast_2d(np.asarray(values, dtype=float))
+    if values.shape[1] != N_FIELDS:
+        raise ValueError(f"Expected {N_FIELDS} columns, got {values.shape[1]}")
+    template = card_template(word_length, word_number)
+
+    n = values.shape[0]
+    blank = np.isnan(values)
+    if mids is not None:
+        if len(mids) != n:
+            raise ValueError(f"Expected {n} MIDs, got {len(mids)}")
+        blank[:, FIELD_INDEX['MID']] = False
+    blank = blank.any(axis=1)
+    if trailers is not None and len(trailers) != n:
+        raise ValueError(f"Expected {n} trailers, got {len(trailers)}")
+    filled = np.where(np.isnan(values), 0.0, values)
+
+    columns = []
+    for i, field in enumerate(CSCM_LAYOUT):
+        if field.type == 'A8':
+            # Formatted from the unfilled values: a blank MID stays blank
+            column = ['' if np.isnan(v) else str(_field_value(field, v)) for v in values[:, i]]
+            if mids is not None:
+                column = [text if mid is None else str(mid) for text, mid in zip(column, mids)]
+        elif field.type == 'I':
+            column = filled[:, i].astype(np.int64).tolist()
+        else:
+            column = filled[:, i].tolist()
+        columns.append(column)
+
+    for start in range(0, n, chunk_size):
+        stop = min(start + chunk_size, n)
+        rows = zip(*[column[start:stop] for column in columns])
+        if blank[start:stop].any():
+            text = [_format_blank_row(values[j], columns[0][j], word_length, word_number)
+                    if blank[j] else template.format(*row)
+                    for j, row in zip(range(start, stop), rows)]
+        else:
+            text = [template.format(*row) for row in rows]
+        if trailers is not None:
+            text = [card + trailer for card, trailer in zip(text, trailers[start:stop])]
+        out.write(''.join(text))
+    return n
+
+
+@lru_cache(maxsize=None)
+def card_template(word_length=10, word_number=8):
+    """
+    Format string of the whole keyword with one replacement field per value.
+
+    Parameters:
+    -----------
+    word_length : int
+        Word length for formatting
+    word_number : int
+        Number of words per line
+
+    Returns:
+    --------
+    str
+        Template for ``str.format`` with positional fields ordered as ``CSCM_LAYOUT``
+    """
+    header = _card_headers(word_length, word_number)
+    lines = [KEYWORD_NAME]
+    card_line = ''
+    card = 1
+    for i, field in enumerate(CSCM_LAYOUT):
+        if field.card != card:
+            lines.append(header[card])
+            lines.append(card_line)
+            card_line = ''
+            card = field.card
+        if field.type == 'A8':
+            card_line += ' {%d:>%ds}' % (i, word_length - 1)
+        elif field.type == 'I':
+            card_line += ' {%d:>%dd}' % (i, word_length - 1)
+        else:
+            card_line += ' {%d:%d.%dG}' % (i, word_length - 1, word_length - 6)
+    lines.append(header[card])
+    lines.append(card_line)
+    return '\n'.join(lines) + '\n'
+
+
+def _format_blank_row(values, mid, word_length, word_number):
+    """Format one material that has blank fields."""
+    header = _card_headers(word_length, word_number)
+    lines = [KEYWORD_NAME]
+    card_line = ''
+    card = 1
+    for field, value in zip(CSCM_LAYOUT, values):
+        if field.card != card:
+            lines.append(header[card])
+            lines.append(card_line)
+            card_line = ''
+            card = field.card
+        if field.type == 'A8':
+            card_line += ' {0:>{1}s}'.format(mid, word_length - 1)
+        else:
+            card_line += _format_value(field, value, word_length)
+    lines.append(header[card])
+    lines.append(card_line)
+    return '\n'.join(lines) + '\n'
+
+
+def _card_headers(word_length, word_number=8):
+    """Comment header line of every card keyed by card number."""
+    header = {}
+    for field in CSCM_LAYOUT:
+        if field.position > word_number:
+            raise ValueError(f"Field {field.name} does not fit in {word_number} words per line")
+        if field.position == 1:
+            header[field.card] = '$#{0: >{1}s}'.format(field.name, word_length - 2)
+        else:
+            header[field.card] += ' {0: >{1}s}'.format(field.name, word_length - 1)
+    return header
+
+
+def _format_value(field, value, word_length):
+    """Format one field value as a fixed width word."""
+    if np.isnan(value):
+        return ' ' * word_length
+    if field.type == 'A8':
+        return ' {0:>{1}s}'.format(str(_field_value(field, value)), word_length - 1)
+    if field.type == 'I':
+        return ' {0:>{1}d}'.format(int(value), word_length - 1)
+    return ' {0:{1}.{2}G}'.format(float(value), word_length - 1, word_length - 6)
@@ -0,0 +1,75 @@
+"""
+Plotting helpers for the CSCM model.
+
+Kept apart from the computational modules so that importing ``MatCSCM`` or
+``CEB`` does not load matplotlib. ``MatCSCM`` exposes these functions lazily,
+so ``from MatCSCM import plot_cscm_compression`` keeps working.
+"""
+
+import numpy as np
+import matplotlib.pyplot as plt
+
+from CEB import CEBClass, sigma_elastic
+from render import draw_cscm_compression
+
+
+def plot_cscm_compression(mat, max_strain=0.01, num_points=1000):
+    """
+    Plot stress-strain diagram for CSCM model under uniaxial compression.
+
+    Parameters:
+    -----------
+    mat : MatCSCM
+        Material object
+    max_strain : float
+        Maximum strain
+    num_points : int
+        Number of calculation points
+
+    Returns:
+    --------
+    matplotlib.pyplot
+        pyplot object for further customization
+    """
+    strains, stresses = mat.evaluate.uniaxial_compression_response(max_strain, num_points)
+
+    fig = plt.figure(figsize=(10, 6))
+    draw_cscm_compression(fig.add_subplot(), strains, stresses, mat.f_c, mat.dmax, max_strain)
+    plt.tight_layout()
+
+    return plt
+
+
+def plot_elastic_compression_curve(f_c, num_points=100):
+    """
+    Plot the linear elastic compression branch up to the compressive strength.
+
+    Parameters:
+    -----------
+    f_c : float
+        Characteristic compressive strength of concrete (MPa)
+    num_points : int
+        Number of calculation points
+
+    Returns:
+    --------
+    matplotlib.pyplot
+        pyplot object for further customization
+    """
+    E = CEBClass(f_c=f_c).E
+    strains = np.linspace(0, f_c / E, num_points)
+    stresses = sigma_elastic(f_c, strains)
+
+    plt.figure(figsize=(10, 6))
+    plt.plot(strains * 100, stresses, 'b-', linewidth=2,
+             label=f'Elastic (E = {E:.0f} MPa)')
+
+    plt.xlabel('Compression Strain, %')
+    plt.ylabel('Compression Stress, MPa')
+    plt.title(f'Elastic Compression Curve (f\'c = {f_c} MPa)')
+    plt.grid(True, alpha=0.3)
+    plt.legend()
+    plt.tight_layout()
+    plt.show()
+
+    return plt
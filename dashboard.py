@@ -0,0 +1,316 @@
+"""
+Debounced, incremental controller for the cscm.ipynb widget dashboard.
+
+Widget events are collected and applied after the user stops typing for a
+short delay, so a value entered in a ``FloatText`` triggers one update
+instead of one per keystroke. The dashboard quantities form a
+``dependency_graph.DependencyGraph``: an update only recomputes the nodes
+that depend on changed widgets (e.g. NPLOT only rebuilds the keyword text,
+f_c leaves the CEB text of an unchanged rho/dmax alone) and only their views
+are redrawn. Figures are created once and updated in place by replacing
+the line data.
+"""
+
+import asyncio
+import threading
+
+import ipywidgets as widgets
+import numpy as np
+from IPython.display import display
+from matplotlib.figure import Figure
+
+from MatCSCM import MatCSCM, ceb_output_text, keyword_to_text
+from batch_driver import uniaxial_compression
+from batch_params import ceb_properties, keyword_values
+from dependency_graph import DependencyGraph
+
+DEFAULT_DELAY = 0.3
+
+
+class Debouncer:
+    """
+    Call a function once after events stopped arriving for ``delay`` seconds.
+
+    Parameters:
+    -----------
+    delay : float
+        Quiet period in seconds; 0 calls the function on every event
+    function : callable
+        Function without arguments
+    """
+
+    def __init__(self, delay, function):
+        self.delay = delay
+        self.function = function
+        self._handle = None
+
+    def __call__(self):
+        self.cancel()
+        if self.delay <= 0:
+            self.function()
+            return
+        try:
+            # Jupyter kernels handle widget events inside a running event loop
+            self._handle = asyncio.get_running_loop().call_later(self.delay, self._fire)
+        except RuntimeError:
+            self._handle = threading.Timer(self.delay, self._fire)
+            self._handle.daemon = True
+            self._handle.start()
+
+    @property
+    def pending(self):
+        """True while a call is scheduled."""
+        return self._handle is not None
+
+    def _fire(self):
+        self._handle = None
+        self.function()
+
+    def cancel(self):
+        """Drop a scheduled call."""
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+    def flush(self):
+        """Run a scheduled call now."""
+        if self._handle is not None:
+            self.cancel()
+            self.function()
+
+
+class TextView:
+    """Print a text node into an ``Output`` widget."""
+
+    def __init__(self, output):
+        self.output = output
+
+    def __call__(self, text):
+        with self.output:
+            self.output.clear_output(wait=True)
+            print(text)
+
+
+class LineView:
+    """
+    Line plot in an ``Output`` widget that is updated in place.
+
+    The view expects node values ``{'title': str, 'lines': [(x, y, label), ...]}``.
+    The figure and its lines are created on the first update; later updates
+    replace the line data and rescale the axes.
+
+    Parameters:
+    -----------
+    output : ipywidgets.Output
+        Widget showing the figure
+    xlabel, ylabel : str
+        Axis labels
+    figsize : tuple
+        Figure size in inches
+    """
+
+    def __init__(self, output, xlabel, ylabel, figsize=(10, 6)):
+        self.output = output
+        self.xlabel = xlabel
+        self.ylabel = ylabel
+        self.figsize = figsize
+        self.figure = None
+        self.lines = []
+
+    def _create(self):
+        self.figure = Figure(figsize=self.figsize)
+        self.axes = self.figure.add_subplot()
+        self.axes.set_xlabel(self.xlabel)
+        self.axes.set_ylabel(self.ylabel)
+        self.axes.grid(True, alpha=0.3)
+
+    def __call__(self, value):
+        if self.figure is None:
+            self._create()
+        curves = value['lines']
+        if len(curves) != len(self.lines):
+            for line in self.lines:
+                line.remove()
+            self.lines = [self.axes.plot([], [], linewidth=2)[0] for _ in curves]
+        for line, (x, y, label) in zip(self.lines, curves):
+            line.set_data(x, y)
+            line.set_label(label)
+        self.axes.set_title(value['title'])
+        self.axes.legend()
+        self.axes.relim()
+        self.axes.autoscale_view()
+        self.figure.canvas.draw_idle()
+        with self.output:
+            self.output.clear_output(wait=True)
+            display(self.figure)
+
+
+class DashboardController:
+    """
+    Connect widgets to graph inputs and graph nodes to views.
+
+    Parameters:
+    -----------
+    graph : DependencyGraph
+        Dashboard quantities
+    delay : float
+        Debounce delay of widget events in seconds
+
+    Attributes:
+    -----------
+    renders : dict
+        Node name -> number of times its view has been redrawn
+    """
+
+    def __init__(self, graph, delay=DEFAULT_DELAY):
+        self.graph = graph
+        self.views = {}
+        self.renders = {}
+        self._pending = {}
+        self._stale = set()
+        self.debouncer = Debouncer(delay, self.update)
+
+    def bind(self, widget, name):
+        """Feed the value of ``widget`` into graph input ``name``."""
+        widget.observe(lambda change: self.changed(name, change['new']), names='value')
+
+    def view(self, name, view):
+        """Redraw ``view`` with the value of node ``name`` when it changes."""
+        self.views[name] = view
+        self.renders[name] = 0
+        self._stale.add(name)
+
+    def changed(self, name, value):
+        """Record a new input value and schedule an update."""
+        self._pending[name] = value
+        self.debouncer()
+
+    def update(self):
+        """Apply pending input changes and redraw the affected views."""
+        pending, self._pending = self._pending, {}
+        self._stale |= self.graph.set(**pending)
+        for name, view in self.views.items():
+            if name in self._stale:
+                view(self.graph[name])
+                self.renders[name] += 1
+                self._stale.discard(name)
+
+    def flush(self):
+        """Apply pending changes immediately."""
+        if self.debouncer.pending:
+            self.debouncer.flush()
+        elif self._pending or self._stale & set(self.views):
+            self.update()
+
+
+def dashboard_graph(f_c=33.0, dmax=18.0, rho=2.4E-09, nplot=1, iretrc=0,
+                    max_strain=0.01, num_points=200):
+    """
+    Dependency graph of the cscm.ipynb dashboard.
+
+    Nodes:
+    - 'material': ``MatCSCM`` of all inputs
+    - 'keyword_text', 'ceb_text', 'result_text': keyword card and CEB-FIP text
+    - 'elastic_curve': linear elastic branch up to f_c (depends on f_c only)
+    - 'driver_values', 'compression_curve': uniaxial compression response of
+      the vectorized driver (depends on f_c and dmax only)
+
+    Returns:
+    --------
+    DependencyGraph
+        Graph with inputs 'f_c', 'dmax', 'rho', 'nplot', 'iretrc'
+    """
+    graph = DependencyGraph()
+    for name, value in (('f_c', f_c), ('dmax', dmax), ('rho', rho), ('nplot', nplot), ('iretrc', iretrc)):
+        graph.input(name, value)
+
+    def material(f_c, dmax, rho, nplot, iretrc):
+        return MatCSCM(f_c=f_c, dmax=dmax, rho=rho, nplot=nplot, itretrc=iretrc,
+                       irate='on', erode='off', pred='off', recov='full')
+
+    def elastic_curve(f_c):
+        E = float(ceb_properties(f_c)['E'])
+        strains = np.linspace(0, f_c / E, 100)
+        return {'title': f"Elastic Compression Curve (f'c = {f_c} MPa)",
+                'lines': [(strains * 100, strains * E, f'Elastic (E = {E:.0f} MPa)')]}
+
+    def compression_curve(f_c, values):
+        response = uniaxial_compression(f_c, values, max_strain, num_points, curves=True)
+        return {'title': f"CSCM Uniaxial Compression (f'c = {f_c} MPa)",
+                'lines': [(response['strains'] * 100, response['stresses'][0], 'CSCM')]}
+
+    graph.node('material', material, ('f_c', 'dmax', 'rho', 'nplot', 'iretrc'))
+    graph.node('keyword_text', lambda mat: keyword_to_text(mat.generate_keyword()), ('material',))
+    graph.node('ceb_text', ceb_output_text, ('f_c', 'dmax', 'rho'))
+    graph.node('result_text', lambda keyword, ceb: keyword + ceb, ('keyword_text', 'ceb_text'))
+    graph.node('elastic_curve', elastic_curve, ('f_c',))
+    graph.node('driver_values', lambda f_c, dmax: keyword_values(f_c, dmax), ('f_c', 'dmax'))
+    graph.node('compression_curve', compression_curve, ('f_c', 'driver_values'))
+    return graph
+
+
+def cscm_dashboard(f_c=33.0, dmax=18.0, rho=2.4E-09, delay=DEFAULT_DELAY, driver=True,
+                   max_strain=0.01, num_points=200):
+    """
+    Widgets and controller of the CSCM keyword generator dashboard.
+
+    Parameters:
+    -----------
+    f_c, dmax, rho : float
+        Initial compressive strength (MPa), aggregate size (mm) and density
+    delay : float
+        Debounce delay of widget events in seconds
+    driver : bool
+        Show the uniaxial compression response of the driver
+    max_strain : float
+        Maximum compression strain of the driver
+    num_points : int
+        Points of the driver curve
+
+    Returns:
+    --------
+    tuple
+        (DashboardController, ipywidgets.VBox to display)
+    """
+    style = {'description_width': 'initial'}
+    inputs = {
+        'f_c': widgets.FloatText(value=f_c, description='f_c (MPa):', style=style),
+        'dmax': widgets.FloatText(value=dmax, description='d_max (mm):', style=style),
+        'rho': widgets.FloatText(value=rho, description='rho:', style=style),
+        'nplot': widgets.Dropdown(
+            options=[
+                ('1: Maximum of brittle and ductile damage (default)', 1),
+                ('2: Maximum of brittle and ductile damage, with recovery of brittle damage', 2),
+                ('3: Brittle damage', 3),
+                ('4: Ductile damage', 4),
+                ('5: κ (intersection of cap with shear surface)', 5),
+                ('6: X₀ (intersection of cap with pressure axis)', 6),
+                ('7: εᵥᵖ (plastic volume strain)', 7)
+            ],
+            value=1, description='NPLOT:', style=style),
+        'iretrc': widgets.Dropdown(
+            options=[
+                ('0: Cap does not retract (default)', 0),
+                ('1: Cap retracts', 1)
+            ],
+            value=0, description='IRETRC:', style=style),
+    }
+    graph = dashboard_graph(f_c, dmax, rho, max_strain=max_strain, num_points=num_points)
+    controller = DashboardController(graph, delay)
+    for name, widget in inputs.items():
+        controller.bind(widget, name)
+
+    outputs = {name: widgets.Output() for name in ('elastic', 'compression', 'result')}
+    controller.view('elastic_curve', LineView(outputs['elastic'], 'Compression Strain, %',
+                                              'Compression Stress, MPa'))
+    children = [widgets.HTML('<h3>Material Parameters</h3>'), *inputs.values(),
+                widgets.HTML('<h3>Elastic Compression Curve</h3>'), outputs['elastic']]
+    if driver:
+        controller.view('compression_curve', LineView(outputs['compression'], 'Compression Strain, %',
+                                                      'Compression Stress, MPa'))
+        children += [widgets.HTML('<h3>Uniaxial Compression Response</h3>'), outputs['compression']]
+    controller.view('result_text', TextView(outputs['result']))
+    children += [widgets.HTML('<h3>Result</h3>'), outputs['result']]
+
+    controller.update()
+    return controller, widgets.VBox(children)
@@ -0,0 +1,355 @@
+"""
+Registry of the experimental datasets in ``data/``.
+
+Every ``*.txt`` file is a whitespace separated table with one header line of
+comma separated column names and units, e.g. ``Strain-Rate(1/ms), DIF``.
+Files are named ``<source> <load>.txt`` with the source ending in the year in
+brackets (``Malvar & Ross [1998] tension.txt``); the material type is the
+subfolder (files directly in ``data/`` are concrete).
+
+Parsed tables are kept in one binary index in the cache directory of
+``result_cache``. A scan only stats the files: a file is parsed again when
+its size or modification time changed and its content hash differs from
+the indexed one, so loading hundreds of datasets reads one file.
+"""
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+
+import numpy as np
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+DEFAULT_MATERIAL = 'concrete'
+
+# Bump when the parsed form or the index layout changes
+INDEX_FORMAT = 1
+
+_NAME = re.compile(r'^(?P<source>.*\[\d{4}\w?\])\s*(?P<load>.*)$')
+_COLUMN = re.compile(r'^\s*(?P<name>[^()]*?)\s*(?:\((?P<unit>[^()]*)\))?\s*$')
+
+
+class Dataset:
+    """
+    One experimental table with a prebuilt interpolant.
+
+    Parameters:
+    -----------
+    name : str
+        Path relative to the data folder without extension
+    source : str
+        Publication, e.g. 'Malvar & Ross [1998]'
+    load : str
+        Load type, e.g. 'compression'
+    material : str
+        Material type
+    columns : tuple of str
+        Column names
+    units : tuple of str
+        Column units ('' if none)
+    table : numpy.ndarray
+        Values of shape (n_points, n_columns)
+    """
+
+    def __init__(self, name, source, load, material, columns, units, table):
+        self.name = name
+        self.source = source
+        self.load = load
+        self.material = material
+        self.columns = tuple(columns)
+        self.units = tuple(units)
+        self.table = table
+        self.table.flags.writeable = False
+        # Interpolant: abscissas sorted once, and their logarithm where positive
+        order = np.argsort(table[:, 0], kind='stable')
+        self._x = table[order, 0]
+        self._y = table[order, 1] if table.shape[1] > 1 else table[order, 0]
+        positive = self._x > 0
+        self._log_x = np.log10(self._x[positive])
+        self._log_y = self._y[positive]
+
+    @property
+    def x(self):
+        """First column"""
+        return self.table[:, 0]
+
+    @property
+    def y(self):
+        """Second column"""
+        return self.table[:, 1]
+
+    def __call__(self, x, log=False):
+        """
+        Interpolate the second column.
+
+        Parameters:
+        -----------
+        x : float or array_like
+            Abscissas in the unit of the first column
+        log : bool
+            Interpolate linearly in log10(x) (positive abscissas only),
+            as for strain rate data spanning decades
+
+        Returns:
+        --------
+        float or numpy.ndarray
+            Interpolated values, constant beyond the data
+        """
+        if log:
+            return np.interp(np.log10(x), self._log_x, self._log_y)
+        return np.interp(x, self._x, self._y)
+
+    def __repr__(self):
+        return 'Dataset({0!r}, {1} x {2})'.format(self.name, len(self.table), ', '.join(self.columns))
+
+
+def parse_header(line):
+    """
+    Column names and units of a header line.
+
+    Parameters:
+    -----------
+    line : str
+        e.g. 'Strain-Rate(1/ms), DIF'
+
+    Returns:
+    --------
+    tuple
+        (names, units)
+    """
+    names, units = [], []
+    for column in line.strip().split(','):
+        match = _COLUMN.match(column)
+        names.append(match.group('name'))
+        units.append(match.group('unit') or '')
+    return tuple(names), tuple(units)
+
+
+def parse_name(name):
+    """
+    Source, load type and material of a dataset from its relative path.
+
+    Returns:
+    --------
+    dict
+        'source', 'load', 'material'
+    """
+    folder, stem = os.path.split(name)
+    match = _NAME.match(stem)
+    source, load = (match.group('source'), match.group('load')) if match else (stem, '')
+    return {'source': source, 'load': load or 'unknown',
+            'material': folder.replace(os.sep, '/') or DEFAULT_MATERIAL}
+
+
+def read_dataset(path):
+    """
+    Parse a dataset file.
+
+    Returns:
+    --------
+    tuple
+        (names, units, table of shape (n_points, n_columns))
+    """
+    with open(path) as source:
+        names, units = parse_header(source.readline())
+        table = np.loadtxt(source, ndmin=2)
+    return names, units, table
+
+
+def _digest(path):
+    with open(path, 'rb') as source:
+        return hashlib.sha256(source.read()).hexdigest()
+
+
+class DatasetRegistry:
+    """
+    Index of the datasets in a folder.
+
+    Parameters:
+    -----------
+    directory : str
+        Data folder, searched recursively for ``*.txt``
+    cache : ResultCache or bool, optional
+        Cache whose directory holds the binary index; None uses
+        ``result_cache.default_cache()``, False keeps the index in memory
+
+    Attributes:
+    -----------
+    parsed : int
+        Files parsed by the last ``scan`` (the others came from the index)
+    """
+
+    def __init__(self, directory=DATA_DIR, cache=None):
+        self.directory = os.path.abspath(str(directory))
+        if cache is None:
+            from result_cache import default_cache
+            cache = default_cache()
+        self.index_path = None
+        if cache is not False:
+            digest = hashlib.sha256(self.directory.encode()).hexdigest()[:16]
+            self.index_path = os.path.join(cache.directory, 'datasets-{0}.npz'.format(digest))
+        self.parsed = 0
+        self._datasets = {}
+        self._files = {}
+        self.scan()
+
+    def _files_on_disk(self):
+        files = {}
+        for folder, _, names in os.walk(self.directory):
+            for name in names:
+                if name.endswith('.txt') and not name.startswith('.'):
+                    path = os.path.join(folder, name)
+                    files[os.path.relpath(path, self.directory)[:-len('.txt')]] = path
+        return files
+
+    def _load_index(self):
+        if self.index_path is None or not os.path.exists(self.index_path):
+            return {}
+        try:
+            with np.load(self.index_path) as index:
+                meta = json.loads(index['meta'].tobytes().decode())
+                values = index['values']
+        except (OSError, ValueError, KeyError):
+            return {}
+        if meta.get('format') != INDEX_FORMAT:
+            return {}
+        entries = {}
+        for name, entry in meta['entries'].items():
+            start, rows, columns = entry['offset'], entry['rows'], entry['columns']
+            entry['table'] = values[start:start + rows * columns].reshape(rows, columns)
+            entries[name] = entry
+        return entries
+
+    def _save_index(self):
+        if self.index_path is None:
+            return
+        entries, values, offset = {}, [], 0
+        for name, entry in self._files.items():
+            table = self._datasets[name].table
+            entries[name] = {key: entry[key] for key in ('size', 'mtime', 'sha256', 'names', 'units')}
+            entries[name].update(offset=offset, rows=table.shape[0], columns=table.shape[1])
+            values.append(table.ravel())
+            offset += table.size
+        meta = json.dumps({'format': INDEX_FORMAT, 'entries': entries}).encode()
+        handle, temporary = tempfile.mkstemp(dir=os.path.dirname(self.index_path), suffix='.npz')
+        with os.fdopen(handle, 'wb') as out:
+            np.savez(out, values=np.concatenate(values) if values else np.zeros(0),
+                     meta=np.frombuffer(meta, dtype=np.uint8))
+        os.replace(temporary, self.index_path)
+
+    def scan(self):
+        """
+        Update the registry from the data folder, parsing changed files only.
+
+        Returns:
+        --------
+        int
+            Number of datasets
+        """
+        index = self._load_index() if not self._files else dict(self._files)
+        files, datasets = {}, {}
+        self.parsed = 0
+        changed = False
+        for name, path in sorted(self._files_on_disk().items()):
+            stat = os.stat(path)
+            entry = index.get(name)
+            if entry is not None and (entry['size'], entry['mtime']) != (stat.st_size, stat.st_mtime_ns):
+                digest = _digest(path)
+                if digest != entry['sha256']:
+                    entry = None
+                else:
+                    entry = dict(entry, size=stat.st_size, mtime=stat.st_mtime_ns)
+                    changed = True
+            if entry is None:
+                names, units, table = read_dataset(path)
+                entry = {'size': stat.st_size, 'mtime': stat.st_mtime_ns, 'sha256': _digest(path),
+                         'names': list(names), 'units': list(units), 'table': table}
+                self.parsed += 1
+                changed = True
+            files[name] = entry
+            previous = self._datasets.get(name)
+            if previous is not None and previous.table is entry['table']:
+                datasets[name] = previous
+            else:
+                datasets[name] = Dataset(name, columns=entry['names'], units=entry['units'],
+                                         table=np.array(entry['table'], dtype=float), **parse_name(name))
+                entry['table'] = datasets[name].table
+        changed = changed or set(files) != set(index)
+        self._files, self._datasets = files, datasets
+        if changed:
+            self._save_index()
+        return len(datasets)
+
+    def find(self, material=None, load=None, source=None):
+        """
+        Datasets matching all given attributes.
+
+        Parameters:
+        -----------
+        material, load : str, optional
+            Material and load type (case insensitive)
+        source : str, optional
+            Substring of the source (case insensitive), e.g. 'Malvar' or '1998'
+
+        Returns:
+        --------
+        list of Dataset
+        """
+        found = []
+        for dataset in self._datasets.values():
+            if material is not None and dataset.material.lower() != material.lower():
+                continue
+            if load is not None and dataset.load.lower() != load.lower():
+                continue
+            if source is not None and source.lower() not in dataset.source.lower():
+                continue
+            found.append(dataset)
+        return found
+
+    def get(self, material=None, load=None, source=None):
+        """The single dataset matching the attributes; ValueError otherwise."""
+        found = self.find(material, load, source)
+        if len(found) != 1:
+            raise ValueError(f"{len(found)} datasets match material={material}, load={load}, source={source}")
+        return found[0]
+
+    @property
+    def materials(self):
+        """Material types"""
+        return sorted({dataset.material for dataset in self._datasets.values()})
+
+    @property
+    def loads(self):
+        """Load types"""
+        return sorted({dataset.load for dataset in self._datasets.values()})
+
+    @property
+    def sources(self):
+        """Sources"""
+        return sorted({dataset.source for dataset in self._datasets.values()})
+
+    def __getitem__(self, name):
+        return self._datasets[name]
+
+    def __contains__(self, name):
+        return name in self._datasets
+
+    def __iter__(self):
+        return iter(self._datasets.values())
+
+    def __len__(self):
+        return len(self._datasets)
+
+
+_default_registry = None
+
+
+def default_registry():
+    """Shared registry of the repository's ``data/`` folder."""
+    global _default_registry
+    if _default_registry is None:
+        _default_registry = DatasetRegistry()
+    return _default_registry
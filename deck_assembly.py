@@ -0,0 +1,206 @@
+"""
+Deck assembly with deduplication of identical *MAT_CSCM materials.
+
+Parts that share a concrete grade produce identical material cards. The
+``MaterialIndex`` hashes the canonical parameter vector of every material
+(all fields except MID, quantized to a relative tolerance) and keeps each
+unique material once, so a deck needs one *MAT_CSCM card per distinct
+material and a part-to-MID mapping table.
+"""
+
+from itertools import islice
+
+import numpy as np
+
+from cscm_keyword import FIELD_INDEX, KeywordRecord
+from deck_writer import _material_chunk, write_deck
+
+MID_COLUMN = FIELD_INDEX['MID']
+
+# Quantized value used for blank (NaN) fields
+_BLANK = np.iinfo(np.int64).min
+
+
+class MaterialIndex:
+    """
+    Hash index of unique materials.
+
+    Parameters:
+    -----------
+    rtol : float
+        Relative tolerance of the canonical parameter vector; 0 compares exact values
+    first_mid : int, optional
+        Renumber unique materials starting from this MID; by default the MID of
+        the first occurrence is kept, and a distinct material reusing an emitted
+        numeric MID gets the next free MID (ValueError for a reused string MID)
+    """
+
+    def __init__(self, rtol=1e-6, first_mid=None):
+        self.rtol = rtol
+        self.first_mid = first_mid
+        self._index = {}
+        self._values = []
+        self._mids = []
+        self._used = set()
+
+    def __len__(self):
+        return len(self._values)
+
+    def keys(self, values):
+        """
+        Canonical hash keys of materials.
+
+        Parameters:
+        -----------
+        values : numpy.ndarray
+            Field values of shape (n_materials, N_FIELDS)
+
+        Returns:
+        --------
+        list of bytes
+            One key per material; materials within ``rtol`` share a key
+        """
+        content = np.delete(np.atleast_2d(np.asarray(values, dtype=float)), MID_COLUMN, axis=1)
+        if self.rtol == 0:
+            content = np.where(content == 0, 0.0, content)  # -0.0 and 0.0 are the same
+            return [row.tobytes() for row in np.ascontiguousarray(content)]
+        blank = np.isnan(content)
+        mantissa, exponent = np.frexp(np.where(blank, 0.0, content))
+        quantized = np.round(mantissa / self.rtol).astype(np.int64)
+        quantized[blank] = _BLANK
+        # Rounding may carry the mantissa to the next power of two
+        carry = np.abs(quantized) == np.int64(round(1 / self.rtol))
+        quantized[carry] //= 2
+        exponent = exponent.astype(np.int64) + carry
+        exponent[quantized == 0] = 0
+        keys = np.ascontiguousarray(np.hstack((quantized, exponent)))
+        return [row.tobytes() for row in keys]
+
+    def add(self, values, mids=None):
+        """
+        Register materials and return the MID each of them is emitted under.
+
+        Parameters:
+        -----------
+        values : numpy.ndarray
+            Field values of shape (n_materials, N_FIELDS)
+        mids : sequence, optional
+            Non-numeric material IDs overriding the MID column
+
+        Returns:
+        --------
+        list
+            MID of the unique material for every input material
+        """
+        values = np.atleast_2d(np.asarray(values, dtype=float))
+        assigned = []
+        for i, key in enumerate(self.keys(values)):
+            position = self._index.get(key)
+            if position is None:
+                position = len(self._values)
+                self._index[key] = position
+                self._values.append(values[i])
+                if self.first_mid is not None:
+                    mid = self.first_mid + position
+                elif mids is not None and mids[i] is not None:
+                    mid = mids[i]
+                else:
+                    mid = KeywordRecord(values[i])['MID']['value']
+                mid = self._free_mid(mid)
+                self._used.add(mid)
+                self._mids.append(mid)
+            assigned.append(self._mids[position])
+        return assigned
+
+    def _free_mid(self, mid):
+        """``mid`` or, if another material already uses it, the next free MID."""
+        if mid not in self._used:
+            return mid
+        if not isinstance(mid, (int, float, np.number)):
+            raise ValueError(f"Material ID {mid!r} is used by different materials")
+        mid = int(mid)
+        while mid in self._used:
+            mid += 1
+        return mid
+
+    def records(self):
+        """
+        Unique materials with their assigned MIDs.
+
+        Returns:
+        --------
+        list of KeywordRecord
+            Records in order of first occurrence
+        """
+        records = []
+        for values, mid in zip(self._values, self._mids):
+            values = values.copy()
+            if isinstance(mid, (int, float, np.number)):
+                values[MID_COLUMN] = mid
+                records.append(KeywordRecord(values))
+            else:
+                values[MID_COLUMN] = np.nan
+                records.append(KeywordRecord(values, mid))
+        return records
+
+
+def assemble_materials(parts, rtol=1e-6, first_mid=None, chunk_size=4096):
+    """
+    Deduplicate the materials of many parts in a single pass.
+
+    Parameters:
+    -----------
+    parts : iterable
+        (part_id, material) pairs; materials are MatCSCM objects,
+        KeywordRecord objects or value arrays
+    rtol : float
+        Relative tolerance of the canonical parameter vector
+    first_mid : int, optional
+        Renumber unique materials starting from this MID
+    chunk_size : int
+        Number of parts hashed at once
+
+    Returns:
+    --------
+    tuple
+        (list of unique KeywordRecord, dict part_id -> MID)
+    """
+    index = MaterialIndex(rtol, first_mid)
+    part_mids = {}
+    parts = iter(parts)
+    while True:
+        chunk = list(islice(parts, chunk_size))
+        if not chunk:
+            break
+        part_ids = [part_id for part_id, material in chunk]
+        values, mids, trailers = _material_chunk([material for part_id, material in chunk], False)
+        part_mids.update(zip(part_ids, index.add(values, mids)))
+    return index.records(), part_mids
+
+
+def write_assembled_deck(parts, path=None, rtol=1e-6, first_mid=None, **deck_options):
+    """
+    Write a deck with every unique material of ``parts`` emitted once.
+
+    Parameters:
+    -----------
+    parts : iterable
+        (part_id, material) pairs
+    path : str, file-like or None
+        Output passed to ``deck_writer.write_deck``
+    rtol : float
+        Relative tolerance of the canonical parameter vector
+    first_mid : int, optional
+        Renumber unique materials starting from this MID
+    **deck_options
+        Further options of ``deck_writer.write_deck``
+
+    Returns:
+    --------
+    dict
+        Result of ``write_deck`` with the added 'part_mids' mapping
+    """
+    records, part_mids = assemble_materials(parts, rtol, first_mid)
+    result = write_deck(records, path, **deck_options)
+    result['part_mids'] = part_mids
+    return result
@@ -0,0 +1,251 @@
+"""
+Comparison of *MAT_CSCM material sets.
+
+Either side of a comparison is a keyword deck, a value array or an iterable
+of ``MatCSCM`` configurations. Materials are aligned by MID, by content
+(parameters rounded to the printed precision) or by order, and per-field
+relative differences are computed for all aligned pairs at once.
+"""
+
+import numpy as np
+
+from cscm_keyword import CSCM_FIELDS, FIELD_INDEX, KeywordRecord
+from deck_assembly import MaterialIndex
+from deck_reader import read_materials
+from deck_writer import _material_chunk
+
+MID_COLUMN = FIELD_INDEX['MID']
+
+# Relative difference below the 4 significant digits printed in the cards
+PRINT_RTOL = 1e-3
+
+
+def load_materials(source):
+    """
+    Field values and MIDs of a material set.
+
+    Parameters:
+    -----------
+    source : str, numpy.ndarray or iterable
+        Keyword deck path, value array of shape (n_materials, N_FIELDS), or
+        MatCSCM / KeywordRecord objects
+
+    Returns:
+    --------
+    tuple
+        (values array, list of MIDs)
+    """
+    if isinstance(source, str) or hasattr(source, '__fspath__'):
+        values, mids = read_materials(source)
+    elif isinstance(source, np.ndarray):
+        values, mids = np.atleast_2d(source.astype(float)), None
+    else:
+        materials = list(source)
+        if not materials:
+            return np.empty((0, len(CSCM_FIELDS))), []
+        values, mids, trailers = _material_chunk(materials, False)
+    if mids is None:
+        mids = [None] * len(values)
+    mids = [KeywordRecord(row)['MID']['value'] if mid is None else mid
+            for row, mid in zip(values, mids)]
+    return values, mids
+
+
+def round_significant(values, digits=4):
+    """
+    Round values to a number of significant digits.
+
+    Parameters:
+    -----------
+    values : numpy.ndarray
+        Values to round; NaN is kept
+    digits : int
+        Number of significant digits
+
+    Returns:
+    --------
+    numpy.ndarray
+        Rounded values
+    """
+    values = np.asarray(values, dtype=float)
+    magnitude = np.abs(values)
+    finite = np.isfinite(magnitude) & (magnitude > 0)
+    exponent = np.zeros_like(values)
+    exponent[finite] = np.floor(np.log10(magnitude[finite]))
+    scale = np.power(10.0, digits - 1 - exponent)
+    return np.round(values * scale) / scale
+
+
+def relative_difference(reference, other):
+    """
+    Element-wise relative difference of two value arrays.
+
+    Parameters:
+    -----------
+    reference, other : numpy.ndarray
+        Arrays of equal shape
+
+    Returns:
+    --------
+    numpy.ndarray
+        |other - reference| / max(|reference|, |other|); 0 where both values
+        are equal (including both blank), inf where only one is blank
+    """
+    reference = np.asarray(reference, dtype=float)
+    other = np.asarray(other, dtype=float)
+    scale = np.maximum(np.abs(reference), np.abs(other))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        relative = np.abs(other - reference) / scale
+    relative[reference == other] = 0.0
+    blank_ref = np.isnan(reference)
+    blank_other = np.isnan(other)
+    relative[blank_ref & blank_other] = 0.0
+    relative[blank_ref ^ blank_other] = np.inf
+    return relative
+
+
+class DeckDiff:
+    """
+    Result of a material set comparison.
+
+    Attributes:
+    -----------
+    reference_index, other_index : numpy.ndarray
+        Row indices of aligned material pairs
+    mids : list
+        Reference MID of every aligned pair
+    relative : numpy.ndarray
+        Relative differences of shape (n_pairs, N_FIELDS); MID column is zero
+    only_in_reference, only_in_other : list
+        MIDs of materials without a counterpart
+    """
+
+    def __init__(self, reference_index, other_index, mids, relative,
+                 only_in_reference, only_in_other):
+        self.reference_index = reference_index
+        self.other_index = other_index
+        self.mids = mids
+        self.relative = relative
+        self.only_in_reference = only_in_reference
+        self.only_in_other = only_in_other
+
+    def changed(self, rtol=PRINT_RTOL):
+        """
+        Boolean mask (n_pairs, N_FIELDS) of fields differing by more than ``rtol``.
+        """
+        return self.relative > rtol
+
+    def changed_materials(self, rtol=PRINT_RTOL):
+        """
+        MIDs of aligned materials with at least one changed field.
+        """
+        rows = np.flatnonzero(self.changed(rtol).any(axis=1))
+        return [self.mids[i] for i in rows]
+
+    def summary(self, rtol=PRINT_RTOL):
+        """
+        Per-field statistics of the relative differences.
+
+        Returns:
+        --------
+        dict
+            field -> {'changed': count, 'max': maximum, 'mean': mean} for
+            fields changed in at least one material
+        """
+        changed = self.changed(rtol)
+        counts = changed.sum(axis=0)
+        stats = {}
+        for i in np.flatnonzero(counts):
+            column = self.relative[:, i]
+            finite = column[np.isfinite(column)]
+            stats[CSCM_FIELDS[i]] = {
+                'changed': int(counts[i]),
+                'max': float(column.max()),
+                'mean': float(finite.mean()) if finite.size else np.inf,
+            }
+        return stats
+
+    def report(self, rtol=PRINT_RTOL):
+        """
+        Human readable comparison summary.
+
+        Returns:
+        --------
+        str
+            Formatted text report
+        """
+        text = 'Aligned materials: {0}\n'.format(len(self.mids))
+        text += 'Changed materials: {0}\n'.format(len(self.changed_materials(rtol)))
+        text += 'Only in reference: {0}\n'.format(len(self.only_in_reference))
+        text += 'Only in other:     {0}\n'.format(len(self.only_in_other))
+        stats = self.summary(rtol)
+        if stats:
+            text += '{0:<10s} {1:>8s} {2:>12s} {3:>12s}\n'.format('field', 'changed', 'max rel', 'mean rel')
+            for field, item in stats.items():
+                text += '{0:<10s} {1:>8d} {2:>12.4G} {3:>12.4G}\n'.format(
+                    field, item['changed'], item['max'], item['mean'])
+        return text
+
+
+def _align_by_key(reference_keys, other_keys):
+    """Pair rows with equal keys, first occurrence wins."""
+    positions = {}
+    for i, key in enumerate(reference_keys):
+        positions.setdefault(key, i)
+    reference_index = []
+    other_index = []
+    for j, key in enumerate(other_keys):
+        i = positions.pop(key, None)
+        if i is not None:
+            reference_index.append(i)
+            other_index.append(j)
+    return np.array(reference_index, dtype=int), np.array(other_index, dtype=int)
+
+
+def compare(reference, other, align='mid', digits=4):
+    """
+    Compare two material sets.
+
+    Parameters:
+    -----------
+    reference, other : str, numpy.ndarray or iterable
+        Material sets accepted by ``load_materials``
+    align : str
+        'mid' - pair materials with equal MIDs,
+        'content' - pair materials with equal parameters when rounded to
+        ``digits`` significant digits (MIDs ignored), 'order' - pair materials
+        by position
+    digits : int
+        Significant digits compared by ``align='content'``; the default
+        matches the precision of cards printed with word_length=10
+
+    Returns:
+    --------
+    DeckDiff
+        Aligned pairs with their relative differences
+    """
+    reference_values, reference_mids = load_materials(reference)
+    other_values, other_mids = load_materials(other)
+
+    if align == 'mid':
+        reference_index, other_index = _align_by_key(reference_mids, other_mids)
+    elif align == 'content':
+        index = MaterialIndex(rtol=0)
+        reference_index, other_index = _align_by_key(
+            index.keys(round_significant(reference_values, digits)),
+            index.keys(round_significant(other_values, digits)))
+    elif align == 'order':
+        n = min(len(reference_values), len(other_values))
+        reference_index = other_index = np.arange(n)
+    else:
+        raise ValueError(f"Invalid alignment: {align}")
+
+    relative = relative_difference(reference_values[reference_index], other_values[other_index])
+    relative[:, MID_COLUMN] = 0.0
+
+    reference_only = np.setdiff1d(np.arange(len(reference_values)), reference_index)
+    other_only = np.setdiff1d(np.arange(len(other_values)), other_index)
+    return DeckDiff(reference_index, other_index,
+                    [reference_mids[i] for i in reference_index], relative,
+                    [reference_mids[i] for i in reference_only],
+                    [other_mids[j] for j in other_only])
@@ -0,0 +1,229 @@
+"""
+Reader of *MAT_CSCM keywords from existing LS-DYNA decks.
+
+Cards are parsed as fixed-width fields (or comma separated free format) in
+the layout of ``cscm_keyword.CSCM_LAYOUT``; comment lines (``$`` and ``$#``
+headers) are skipped. Plain files are memory mapped and scanned for the
+keyword directly, so large decks dominated by nodes and elements are read
+without tokenizing every line. Gzip compressed decks are streamed line by line.
+
+Blank fields are returned as NaN, non-numeric MIDs separately.
+"""
+
+import gzip
+import mmap
+import re
+
+import numpy as np
+
+from cscm_keyword import CSCM_LAYOUT, FIELD_INDEX, N_FIELDS, KeywordRecord
+
+KEYWORDS = ('*MAT_CSCM', '*MAT_159')
+
+# Number of fields on every card
+CARD_SIZES = tuple(sum(1 for field in CSCM_LAYOUT if field.card == card)
+                   for card in sorted({field.card for field in CSCM_LAYOUT}))
+
+MID_COLUMN = FIELD_INDEX['MID']
+
+# Keyword lines of the memory mapped scan, matched case-insensitively at line starts
+_KEYWORD_PATTERN = re.compile(b'^(?:' + b'|'.join(re.escape(keyword.encode()) for keyword in KEYWORDS) + b')',
+                              re.IGNORECASE | re.MULTILINE)
+
+
+def _keyword_name(line):
+    """Return the keyword name if ``line`` opens a *MAT_CSCM keyword, else None."""
+    name = line.split()[0].upper() if line.strip() else ''
+    for keyword in KEYWORDS:
+        if name == keyword or name == keyword + '_TITLE':
+            return name
+    return None
+
+
+def _parse_card(line, n_fields, word_length):
+    """Split a data line into ``n_fields`` strings."""
+    line = line.rstrip('\r\n')
+    if ',' in line:
+        words = [word.strip() for word in line.split(',')]
+    else:
+        words = [line[i * word_length:(i + 1) * word_length].strip() for i in range(n_fields)]
+        if any(' ' in word for word in words):
+            # A value wider than the field shifts the columns; fall back to
+            # whitespace separated values if they give a complete card
+            tokens = line.split()
+            if len(tokens) == n_fields:
+                words = tokens
+    words += [''] * (n_fields - len(words))
+    return words[:n_fields]
+
+
+def _parse_material(lines, title, word_length):
+    """
+    Parse the data lines following a keyword line.
+
+    Parameters:
+    -----------
+    lines : iterator of str
+        Lines after the keyword line
+    title : bool
+        The keyword has a title line before the cards (``_TITLE`` option)
+    word_length : int
+        Width of a field
+
+    Returns:
+    --------
+    tuple
+        (field values, MID if it is not numeric, title or None, keyword line
+        that ended a short material or None); the keyword line is consumed
+        from ``lines`` and must be handed back to the caller's scan
+    """
+    values = np.full(N_FIELDS, np.nan)
+    mid = None
+    heading = None
+    column = 0
+    card = 0
+    for line in lines:
+        if line.startswith('$'):
+            continue
+        if line.startswith('*'):
+            return values, mid, heading, line
+        if title and heading is None:
+            heading = line.strip()
+            continue
+        for word in _parse_card(line, CARD_SIZES[card], word_length):
+            if word:
+                try:
+                    values[column] = float(word)
+                except ValueError:
+                    if column != MID_COLUMN:
+                        raise ValueError(f"Invalid value {word!r} in field {CSCM_LAYOUT[column].name}")
+                    mid = word
+            column += 1
+        card += 1
+        if card == len(CARD_SIZES):
+            break
+    return values, mid, heading, None
+
+
+def _mmap_lines(buffer, start):
+    """Decoded lines of a memory mapped buffer from byte offset ``start``."""
+    position = start
+    size = len(buffer)
+    while position < size:
+        end = buffer.find(b'\n', position)
+        if end < 0:
+            end = size
+        yield buffer[position:end].decode('latin-1')
+        position = end + 1
+
+
+def _scan_mmap(buffer, word_length):
+    """Find keyword occurrences in a memory mapped deck and parse them."""
+    for match in _KEYWORD_PATTERN.finditer(buffer):
+        lines = _mmap_lines(buffer, match.start())
+        name = _keyword_name(next(lines))
+        if name is not None:
+            yield _parse_material(lines, name.endswith('_TITLE'), word_length)[:3]
+
+
+def _scan_lines(lines, word_length):
+    """Parse keywords from an iterator of lines."""
+    lines = iter(lines)
+    line = next(lines, None)
+    while line is not None:
+        name = _keyword_name(line) if line.startswith('*') else None
+        if name is None:
+            line = next(lines, None)
+            continue
+        values, mid, heading, terminator = _parse_material(lines, name.endswith('_TITLE'), word_length)
+        yield values, mid, heading
+        # A keyword line that ended a short material is scanned again
+        line = terminator if terminator is not None else next(lines, None)
+
+
+def iter_materials(path, word_length=10, use_mmap=None):
+    """
+    Iterate over *MAT_CSCM materials of a deck.
+
+    Parameters:
+    -----------
+    path : str
+        Keyword file, optionally gzip compressed ('.gz')
+    word_length : int
+        Width of a field
+    use_mmap : bool, optional
+        Memory map the file; defaults to True for uncompressed files
+
+    Yields:
+    -------
+    tuple
+        (field values, MID if it is not numeric, title or None)
+    """
+    path = str(path)
+    compressed = path.endswith('.gz')
+    if use_mmap is None:
+        use_mmap = not compressed
+    if compressed or not use_mmap:
+        opener = gzip.open if compressed else open
+        with opener(path, 'rt', encoding='latin-1') as deck:
+            yield from _scan_lines(deck, word_length)
+        return
+    with open(path, 'rb') as deck:
+        if deck.seek(0, 2) == 0:
+            return
+        with mmap.mmap(deck.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            yield from _scan_mmap(buffer, word_length)
+
+
+def read_materials(path, word_length=10, use_mmap=None):
+    """
+    Read all *MAT_CSCM materials of a deck into one array.
+
+    Parameters:
+    -----------
+    path : str
+        Keyword file, optionally gzip compressed ('.gz')
+    word_length : int
+        Width of a field
+    use_mmap : bool, optional
+        Memory map the file; defaults to True for uncompressed files
+
+    Returns:
+    --------
+    tuple
+        (values of shape (n_materials, N_FIELDS) ordered as ``CSCM_LAYOUT``,
+        list of non-numeric MIDs or None if all MIDs are numeric)
+    """
+    rows = []
+    mids = []
+    for values, mid, heading in iter_materials(path, word_length, use_mmap):
+        rows.append(values)
+        mids.append(mid)
+    values = np.vstack(rows) if rows else np.empty((0, N_FIELDS))
+    if all(mid is None for mid in mids):
+        mids = None
+    return values, mids
+
+
+def read_records(path, word_length=10, use_mmap=None):
+    """
+    Read *MAT_CSCM materials as keyword records.
+
+    The records give the same dict-of-dicts view as ``MatCSCM.generate_keyword``.
+
+    Parameters:
+    -----------
+    path : str
+        Keyword file, optionally gzip compressed ('.gz')
+    word_length : int
+        Width of a field
+    use_mmap : bool, optional
+        Memory map the file; defaults to True for uncompressed files
+
+    Returns:
+    --------
+    list of KeywordRecord
+        One record per material in file order
+    """
+    return [KeywordRecord(values, mid)
+            for values, mid, heading in iter_materials(path, word_length, use_mmap)]
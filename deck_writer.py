@@ -0,0 +1,220 @@
+"""
+Streaming writer of LS-DYNA material decks.
+
+Materials are consumed from an iterator in chunks, formatted with the batch
+card formatter of ``cscm_keyword`` and written immediately, so the memory used
+does not depend on the number of materials. Output goes to a file, a text
+stream or stdout; ``.gz`` paths are gzip compressed. Large decks can be split
+into include files by MID range (the materials referenced by a range of
+parts) or with a fixed number of materials each.
+"""
+
+import gzip
+import os
+import sys
+from itertools import count as counter, groupby, islice
+
+import numpy as np
+
+from cscm_keyword import KeywordRecord, write_cards
+
+
+def _open_text(path, compress=None):
+    """Open ``path`` for writing text, gzip compressed for ``.gz`` or ``compress=True``."""
+    if compress is None:
+        compress = str(path).endswith('.gz')
+    if compress:
+        return gzip.open(path, 'wt', newline='\n')
+    return open(path, 'w', newline='\n')
+
+
+def _material_chunk(materials, include_ceb):
+    """Split a chunk of materials into a value array, MIDs and CEB trailers."""
+    values = []
+    mids = []
+    trailers = []
+    for material in materials:
+        if isinstance(material, KeywordRecord):
+            record = material
+            trailers.append('')
+        elif hasattr(material, 'keyword_record'):
+            record = material.keyword_record()
+            trailers.append(material.get_ceb_output() if include_ceb else '')
+        else:
+            record = KeywordRecord(material)
+            trailers.append('')
+        values.append(record.values)
+        mids.append(record.mid)
+    if all(mid is None for mid in mids):
+        mids = None
+    return np.vstack(values), mids, trailers
+
+
+def write_materials(materials, out, chunk_size=256, include_ceb=True,
+                    word_length=10, word_number=8, limit=None):
+    """
+    Write *MAT_CSCM cards of materials from an iterator to a text stream.
+
+    Parameters:
+    -----------
+    materials : iterable
+        MatCSCM objects, KeywordRecord objects or value arrays
+    out : file-like
+        Text stream with a ``write`` method
+    chunk_size : int
+        Number of materials formatted and written at once
+    include_ceb : bool
+        Append the CEB-FIP estimation comments after each MatCSCM material
+    word_length : int
+        Word length for formatting
+    word_number : int
+        Number of words per line
+    limit : int, optional
+        Stop after this many materials
+
+    Returns:
+    --------
+    int
+        Number of materials written
+    """
+    materials = iter(materials)
+    written = 0
+    while limit is None or written < limit:
+        size = chunk_size if limit is None else min(chunk_size, limit - written)
+        chunk = list(islice(materials, size))
+        if not chunk:
+            break
+        values, mids, trailers = _material_chunk(chunk, include_ceb)
+        written += write_cards(values, out, word_length, word_number, mids,
+                               chunk_size=chunk_size, trailers=trailers)
+    return written
+
+
+def _material_mid(material):
+    """MID of a MatCSCM object, KeywordRecord or value array."""
+    if isinstance(material, KeywordRecord):
+        mid = material['MID']['value']
+    elif hasattr(material, 'keyword_record'):
+        mid = material.mid
+    else:
+        mid = KeywordRecord(material)['MID']['value']
+    if not isinstance(mid, (int, float, np.number)) or not float(mid).is_integer():
+        raise ValueError(f"MID ranges need integer MIDs, got {mid!r}")
+    return int(mid)
+
+
+def _mid_range_batches(materials, mid_range):
+    """(label, materials) of consecutive materials in the same MID range."""
+    seen = set()
+    for key, group in groupby(materials, key=lambda material: (_material_mid(material) - 1) // mid_range):
+        if key in seen:
+            raise ValueError("Materials must be grouped by MID range, e.g. sorted by MID")
+        seen.add(key)
+        yield '{0:06d}-{1:06d}'.format(key * mid_range + 1, (key + 1) * mid_range), group, None
+
+
+def _count_batches(materials, materials_per_include):
+    """(label, materials, limit) of include files with a fixed number of materials."""
+    materials = iter(materials)
+    for index in counter():
+        first = next(materials, None)
+        if first is None:
+            return
+        yield '{0:06d}'.format(index * materials_per_include + 1), _prepend(first, materials), materials_per_include
+
+
+def write_deck(materials, path=None, chunk_size=256, include_ceb=True, compress=None,
+               materials_per_include=None, word_length=10, word_number=8, mid_range=None):
+    """
+    Write a complete keyword deck with the given materials.
+
+    Parameters:
+    -----------
+    materials : iterable
+        MatCSCM objects, KeywordRecord objects or value arrays
+    path : str, file-like or None
+        Output file, text stream, or None / '-' for stdout
+    chunk_size : int
+        Number of materials formatted and written at once
+    include_ceb : bool
+        Append the CEB-FIP estimation comments after each MatCSCM material
+    compress : bool, optional
+        Gzip the output; defaults to True for paths ending with '.gz'
+    materials_per_include : int, optional
+        Split materials into include files with this many materials each.
+        ``path`` must then be a file name; it becomes the master deck with
+        *INCLUDE keywords next to the include files.
+    mid_range : int, optional
+        Split materials into include files by MID range instead: MIDs
+        1..mid_range go to ``<stem>_000001-<mid_range>.k`` and so on. The
+        materials must be grouped by range (e.g. sorted by MID), and MIDs
+        must be integers.
+    word_length : int
+        Word length for formatting
+    word_number : int
+        Number of words per line
+
+    Returns:
+    --------
+    dict
+        'materials' - number of materials written,
+        'files' - list of written file names (empty for streams)
+    """
+    options = dict(chunk_size=chunk_size, include_ceb=include_ceb,
+                   word_length=word_length, word_number=word_number)
+
+    if materials_per_include is not None and mid_range is not None:
+        raise ValueError("Give either materials_per_include or mid_range")
+    if materials_per_include is None and mid_range is None:
+        if path is None or path == '-':
+            count = _write_keyword_file(materials, sys.stdout, options)
+            return {'materials': count, 'files': []}
+        if hasattr(path, 'write'):
+            count = _write_keyword_file(materials, path, options)
+            return {'materials': count, 'files': []}
+        with _open_text(path, compress) as out:
+            count = _write_keyword_file(materials, out, options)
+        return {'materials': count, 'files': [str(path)]}
+
+    if path is None or hasattr(path, 'write') or path == '-':
+        raise ValueError("Include files require the master deck to be a file path")
+
+    path = str(path)
+    suffix = '.k.gz' if path.endswith('.gz') else '.k'
+    stem = path[:-len('.gz')] if path.endswith('.gz') else path
+    stem = os.path.splitext(stem)[0]
+
+    if mid_range is not None:
+        batches = _mid_range_batches(materials, mid_range)
+    else:
+        batches = _count_batches(materials, materials_per_include)
+    files = []
+    count = 0
+    with _open_text(path, compress) as master:
+        master.write('*KEYWORD\n')
+        for label, batch, limit in batches:
+            include = '{0}_{1}{2}'.format(stem, label, suffix)
+            with _open_text(include, compress) as out:
+                written = _write_keyword_file(batch, out, options, limit=limit)
+            count += written
+            files.append(include)
+            master.write('*INCLUDE\n{0}\n'.format(os.path.basename(include)))
+        master.write('*END\n')
+    return {'materials': count, 'files': [path] + files}
+
+
+def _prepend(first, rest):
+    """Iterator yielding ``first`` followed by the items of ``rest``."""
+    yield first
+    # A plain loop instead of ``yield from``: closing this generator after
+    # an include file is full must not close the caller's iterator.
+    for item in rest:
+        yield item
+
+
+def _write_keyword_file(materials, out, options, limit=None):
+    """Write materials between *KEYWORD and *END."""
+    out.write('*KEYWORD\n')
+    count = write_materials(materials, out, limit=limit, **options)
+    out.write('*END\n')
+    return count
@@ -0,0 +1,213 @@
+"""
+Lazy dependency graph with change-aware invalidation.
+
+Inputs are named values; nodes are functions of inputs and other nodes.
+A node is computed on first access and kept until one of its (transitive)
+dependencies changes. Setting an input to an equal value invalidates
+nothing, so callers can push whole parameter sets and only the affected
+nodes are recomputed.
+
+Example:
+    graph = DependencyGraph()
+    graph.input('f_c', 35)
+    graph.input('dmax', 19)
+    graph.node('E', lambda f_c: ..., ('f_c',))
+    graph.node('G_f', lambda f_c, dmax: ..., ('f_c', 'dmax'))
+    graph.set(dmax=16)      # invalidates {'G_f'}, 'E' stays cached
+"""
+
+import numpy as np
+
+
+def _equal(a, b):
+    """Equality of input values that also handles arrays."""
+    if a is b:
+        return True
+    if isinstance(a, np.ndarray) or isinstance(b, np.ndarray):
+        return np.array_equal(a, b)
+    try:
+        return bool(a == b)
+    except (TypeError, ValueError):
+        return False
+
+
+class DependencyGraph:
+    """
+    Named inputs and lazily computed nodes.
+
+    Attributes:
+    -----------
+    evaluations : dict
+        Node name -> number of times the node has been computed
+    """
+
+    def __init__(self):
+        self._inputs = {}
+        self._nodes = {}
+        self._values = {}
+        self._dependents = {}
+        self.evaluations = {}
+
+    def input(self, name, value=None):
+        """
+        Declare an input.
+
+        Parameters:
+        -----------
+        name : str
+            Input name
+        value : object
+            Initial value
+        """
+        if name in self._nodes:
+            raise ValueError(f"{name!r} is already a node")
+        self._inputs[name] = value
+        self._dependents.setdefault(name, set())
+
+    def node(self, name, function, depends=()):
+        """
+        Declare a node computed from inputs and other nodes.
+
+        Parameters:
+        -----------
+        name : str
+            Node name
+        function : callable
+            Called with the values of ``depends`` as positional arguments
+        depends : sequence of str
+            Names of declared inputs or nodes
+        """
+        if name in self._inputs or name in self._nodes:
+            raise ValueError(f"{name!r} is already declared")
+        for dependency in depends:
+            if dependency not in self._inputs and dependency not in self._nodes:
+                raise KeyError(f"Unknown dependency {dependency!r} of {name!r}")
+            self._dependents[dependency].add(name)
+        self._nodes[name] = (function, tuple(depends))
+        self._dependents[name] = set()
+        self.evaluations[name] = 0
+
+    def __contains__(self, name):
+        return name in self._inputs or name in self._nodes
+
+    def __getitem__(self, name):
+        return self.get(name)
+
+    @property
+    def inputs(self):
+        """Current input values."""
+        return dict(self._inputs)
+
+    @property
+    def nodes(self):
+        """Names of the declared nodes."""
+        return tuple(self._nodes)
+
+    def get(self, name):
+        """
+        Value of an input or node, computing stale nodes on demand.
+
+        Parameters:
+        -----------
+        name : str
+            Input or node name
+
+        Returns:
+        --------
+        object
+            Current value
+        """
+        if name in self._inputs:
+            return self._inputs[name]
+        if name not in self._values:
+            function, depends = self._nodes[name]
+            self._values[name] = function(*(self.get(dependency) for dependency in depends))
+            self.evaluations[name] += 1
+        return self._values[name]
+
+    def dependents(self, names):
+        """
+        All nodes that depend on ``names``, directly or transitively.
+
+        Parameters:
+        -----------
+        names : iterable of str
+            Input or node names
+
+        Returns:
+        --------
+        set
+            Names of the dependent nodes
+        """
+        result = set()
+        stack = list(names)
+        while stack:
+            for dependent in self._dependents[stack.pop()]:
+                if dependent not in result:
+                    result.add(dependent)
+                    stack.append(dependent)
+        return result
+
+    def invalidate(self, names):
+        """
+        Drop the cached values of ``names`` and everything that depends on them.
+
+        Returns:
+        --------
+        set
+            Names of the invalidated nodes
+        """
+        names = set(names)
+        invalid = self.dependents(names) | (names & set(self._nodes))
+        for name in invalid:
+            self._values.pop(name, None)
+        return invalid
+
+    def set(self, **values):
+        """
+        Change inputs and invalidate the nodes that depend on changed ones.
+
+        Parameters:
+        -----------
+        **values
+            Input name -> new value
+
+        Returns:
+        --------
+        set
+            Names of the invalidated nodes
+        """
+        changed = []
+        for name, value in values.items():
+            if name not in self._inputs:
+                raise KeyError(f"Unknown input {name!r}")
+            if not _equal(self._inputs[name], value):
+                self._inputs[name] = value
+                changed.append(name)
+        return self.invalidate(changed)
+
+    def assign(self, name, value):
+        """
+        Replace the value of a node until one of its dependencies changes.
+
+        Parameters:
+        -----------
+        name : str
+            Node name
+        value : object
+            New value
+
+        Returns:
+        --------
+        set
+            Names of the invalidated dependent nodes
+        """
+        if name not in self._nodes:
+            raise KeyError(f"Unknown node {name!r}")
+        invalid = self.invalidate(self.dependents([name]))
+        self._values[name] = value
+        return invalid
+
+    def is_cached(self, name):
+        """True if node ``name`` holds a computed value."""
+        return name in self._values
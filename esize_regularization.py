@@ -0,0 +1,187 @@
+"""
+Element-size regularized *MAT_CSCM materials for meshes with varying element sizes.
+
+With ``Revision.REV_2`` the softening parameters ``B`` and ``D`` of
+``MatCSCM.Initialize`` scale the fracture energies with the element size
+``esize``, so one material per element size keeps the dissipated energy
+mesh independent. The characteristic lengths of a mesh are grouped into
+log-spaced bins, the parameters of all bins are evaluated in a single
+``batch_params.keyword_values`` call, and every part is mapped to the bin
+of its characteristic length.
+"""
+
+import numpy as np
+
+from MatCSCM import Revision
+from batch_params import keyword_values
+from cscm_keyword import FIELD_INDEX, KeywordRecord
+from deck_writer import write_deck
+
+MID_COLUMN = FIELD_INDEX['MID']
+
+
+def _weighted_geometric_mean(log_sizes, weights, groups, n_groups):
+    """Geometric mean of sizes per group."""
+    totals = np.bincount(groups, weights * log_sizes, minlength=n_groups)
+    counts = np.bincount(groups, weights, minlength=n_groups)
+    with np.errstate(invalid='ignore'):
+        return np.exp(totals / counts), counts
+
+
+class RegularizationTable:
+    """
+    Materials of element size bins.
+
+    Attributes:
+    -----------
+    edges : numpy.ndarray
+        Bin edges of the used bins, shape (n_bins, 2)
+    sizes : numpy.ndarray
+        Element size of every bin material (count-weighted geometric mean)
+    counts : numpy.ndarray
+        Number of elements (or histogram weight) per bin
+    values : numpy.ndarray
+        Keyword field values of shape (n_bins, N_FIELDS)
+    part_bins : dict
+        Part ID -> bin index (empty if no parts were given)
+    """
+
+    def __init__(self, edges, sizes, counts, values, part_bins):
+        self.edges = edges
+        self.sizes = sizes
+        self.counts = counts
+        self.values = values
+        self.part_bins = part_bins
+
+    def __len__(self):
+        return len(self.sizes)
+
+    @property
+    def mids(self):
+        """Material ID of every bin."""
+        return [KeywordRecord(row)['MID']['value'] for row in self.values]
+
+    @property
+    def part_mids(self):
+        """Part ID -> material ID of its bin."""
+        mids = self.mids
+        return {part: mids[index] for part, index in self.part_bins.items()}
+
+    def records(self):
+        """
+        Bin materials as keyword records.
+
+        Returns:
+        --------
+        list of KeywordRecord
+            One record per bin
+        """
+        return [KeywordRecord(row) for row in self.values]
+
+    def report(self):
+        """
+        Human readable table of the bins.
+
+        Returns:
+        --------
+        str
+            Formatted text report
+        """
+        text = '{0:>8s} {1:>10s} {2:>10s} {3:>10s} {4:>10s} {5:>10s} {6:>10s}\n'.format(
+            'MID', 'l_min', 'l_max', 'esize', 'count', 'B', 'D')
+        for mid, (low, high), size, count, row in zip(self.mids, self.edges, self.sizes,
+                                                      self.counts, self.values):
+            text += '{0:>8} {1:10.4G} {2:10.4G} {3:10.4G} {4:10.4G} {5:10.4G} {6:10.4G}\n'.format(
+                mid, low, high, size, count, row[FIELD_INDEX['B']], row[FIELD_INDEX['D']])
+        return text
+
+    def write_deck(self, path=None, **deck_options):
+        """
+        Write the bin materials with ``deck_writer.write_deck``.
+
+        Returns:
+        --------
+        dict
+            Result of ``write_deck`` with the added 'part_mids' mapping
+        """
+        result = write_deck(self.records(), path, **deck_options)
+        result['part_mids'] = self.part_mids
+        return result
+
+
+def regularization_table(sizes, parts=None, counts=None, f_c=35, dmax=19, n_bins=8, edges=None,
+                         first_mid=1, rev=Revision.REV_2, **material_options):
+    """
+    Element-size regularized materials for the size distribution of a mesh.
+
+    Parameters:
+    -----------
+    sizes : array_like
+        Characteristic element lengths (mm), per element or per histogram bin
+    parts : array_like, optional
+        Part ID of every entry of ``sizes``; a part is assigned to the bin of
+        the geometric mean of its element lengths
+    counts : array_like, optional
+        Non-negative weight of every entry of ``sizes``, e.g. histogram
+        counts; every part needs a positive total weight
+    f_c : float
+        Compressive strength (MPa)
+    dmax : float
+        Maximum aggregate size (mm)
+    n_bins : int
+        Number of log-spaced bins between the smallest and largest length
+    edges : array_like, optional
+        Explicit bin edges overriding ``n_bins``
+    first_mid : int
+        Material ID of the first used bin; further bins are numbered consecutively
+    rev : Revision
+        Revision of the yield surface and cap parameters
+    **material_options
+        Further ``MatCSCM`` constructor arguments
+
+    Returns:
+    --------
+    RegularizationTable
+        One material per non-empty bin with B and D regularized by the bin size
+    """
+    sizes = np.asarray(sizes, dtype=float).ravel()
+    if sizes.size == 0 or np.any(sizes <= 0):
+        raise ValueError("Element sizes must be positive")
+    weights = np.ones_like(sizes) if counts is None else np.asarray(counts, dtype=float).ravel()
+    if weights.shape != sizes.shape or np.any(weights < 0):
+        raise ValueError("Counts must be non-negative, one per element size")
+    log_sizes = np.log(sizes)
+
+    part_ids = None
+    if parts is not None:
+        # Collapse elements to one characteristic length per part
+        part_ids, groups = np.unique(np.asarray(parts).ravel(), return_inverse=True)
+        part_sizes, part_weights = _weighted_geometric_mean(log_sizes, weights, groups, len(part_ids))
+        if np.any(part_weights <= 0):
+            raise ValueError("Parts {0} have no weighted elements".format(
+                ', '.join(str(part) for part in part_ids[part_weights <= 0])))
+        log_sizes = np.log(part_sizes)
+        weights = part_weights
+
+    if edges is None:
+        low, high = np.exp(log_sizes.min()), np.exp(log_sizes.max())
+        edges = np.geomspace(low, high, n_bins + 1) if high > low else np.array([low, high])
+    edges = np.asarray(edges, dtype=float)
+    bins = np.clip(np.searchsorted(edges, np.exp(log_sizes), side='right') - 1, 0, len(edges) - 2)
+    bin_sizes, bin_counts = _weighted_geometric_mean(log_sizes, weights, bins, len(edges) - 1)
+
+    used = np.flatnonzero(bin_counts > 0)
+    renumber = np.full(len(edges) - 1, -1)
+    renumber[used] = np.arange(len(used))
+
+    values = keyword_values(f_c, dmax, bin_sizes[used], rev, Revision.REV_2, **material_options)
+    values[:, MID_COLUMN] = first_mid + np.arange(len(used))
+
+    part_bins = {}
+    if part_ids is not None:
+        part_bins = {part.item() if hasattr(part, 'item') else part: int(renumber[index])
+                     for part, index in zip(part_ids, bins)}
+        # Weighted parts always fall into a used bin
+        assert -1 not in part_bins.values()
+    return RegularizationTable(np.column_stack((edges[used], edges[used + 1])),
+                               bin_sizes[used], bin_counts[used], values, part_bins)
@@ -0,0 +1,385 @@
+"""
+Hydrostatic compression curves and calibration of the cap hardening law.
+
+Under hydrostatic compression the stress point sits on the I_1 axis at the
+cap, so the cap position is X = I_1 = 3 p. As in ``MatCSCM``, the X0 column
+is kappa_0, the initial intersection of the cap and the shear surface, and
+the initial cap sits at X_i = kappa_0 + R F_f(kappa_0). Once the cap has
+moved past X_i, the plastic volume strain follows the hardening law
+
+    eps_v_p = W * (1 - exp(-D1 * (X - X_i) - D2 * (X - X_i)^2))
+
+and the total volume strain adds the elastic part p / K.
+``hydrostatic_curves`` evaluates this for whole batches of materials.
+``fit_hydrostatic`` fits W, D1, D2 and X_i to measured pressure-strain
+curves; ``HydrostaticFit.apply`` converts X_i back to the X0 column. All
+specimens are solved together with a vectorized Levenberg-Marquardt
+iteration. Large batches can be split over worker processes.
+
+Pressures and strains are positive in compression.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from batch_driver import driver_parameters
+from cscm_keyword import FIELD_INDEX
+
+# Keyword columns set by the fit
+HYDROSTATIC_FIELDS = ('W', 'D1', 'D2', 'X0')
+
+# Fitted parameters, in fit order; X_i is the initial cap position
+FIT_FIELDS = ('W', 'D1', 'D2', 'X_i')
+
+# Scale of X_i in the iteration, so that all parameters are of order one
+_CAP_SCALE = 100.0
+
+# Newton steps of the cap inversion
+CAP_ITERATIONS = 30
+
+# Smallest D1 and D2 considered; a law without a quadratic term fits D2 -> 0
+_LOG_FLOOR = np.log(1e-15)
+
+
+def _shear_surface(p, I_1):
+    """Shear surface F_f(I_1) of ``batch_driver.driver_parameters``."""
+    return p['alpha'] - p['lamda'] * np.exp(-p['beta'] * I_1) + p['theta'] * I_1
+
+
+def cap_position(p, kappa):
+    """Cap intersection X = kappa + R F_f(kappa) with the I_1 axis."""
+    return kappa + p['R'] * _shear_surface(p, kappa)
+
+
+def cap_parameter(p, X, kappa=None):
+    """Invert X = kappa + R F_f(kappa) by Newton steps starting from kappa (default kappa_0)."""
+    kappa = p['kappa_0'] if kappa is None else kappa
+    for _ in range(CAP_ITERATIONS):
+        slope = 1 + p['R'] * (p['lamda'] * p['beta'] * np.exp(-p['beta'] * kappa) + p['theta'])
+        kappa = kappa - (cap_position(p, kappa) - X) / slope
+    return kappa
+
+
+def initial_cap(values):
+    """
+    Initial cap position X_i = kappa_0 + R F_f(kappa_0) of many materials.
+
+    Parameters:
+    -----------
+    values : numpy.ndarray
+        Keyword field values of shape (n_materials, N_FIELDS)
+
+    Returns:
+    --------
+    numpy.ndarray
+        X_i per material
+    """
+    p = driver_parameters(np.atleast_2d(np.asarray(values, dtype=float)))
+    return cap_position(p, p['kappa_0'])
+
+
+def plastic_volumetric_strain(pressure, W, D1, D2, X_i):
+    """
+    Plastic volume strain of the cap hardening law.
+
+    Parameters:
+    -----------
+    pressure : array_like
+        Hydrostatic pressure (MPa)
+    W, D1, D2 : array_like
+        Hardening parameters, broadcast against pressure
+    X_i : array_like
+        Initial cap position (``initial_cap``)
+
+    Returns:
+    --------
+    numpy.ndarray
+        Plastic volume strain
+    """
+    hardening = np.maximum(3 * np.asarray(pressure, dtype=float) - X_i, 0)
+    return W * (1 - np.exp(-D1 * hardening - D2 * hardening**2))
+
+
+def hardened_cap(epsilon_v_p, W, D1, D2, X_i):
+    """Cap position X reached at the plastic volume strain (inverse of the hardening law)."""
+    strain = np.clip(np.asarray(epsilon_v_p, dtype=float) / W, 0, 1 - 1e-12)
+    exponent = -np.log(1 - strain)
+    D1, D2 = np.asarray(D1, dtype=float), np.asarray(D2, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        quadratic = (np.sqrt(D1**2 + 4 * D2 * exponent) - D1) / (2 * D2)
+    return X_i + np.where(D2 > 0, quadratic, exponent / D1)
+
+
+def saturation_pressure(W, D1, D2, X_i, fraction=0.99):
+    """Pressure at which the plastic volume strain reaches ``fraction`` of W."""
+    return hardened_cap(fraction * np.asarray(W, dtype=float), W, D1, D2, X_i) / 3
+
+
+def hydrostatic_curves(values, pressure=None, num_points=200, p_max=None):
+    """
+    Hydrostatic compression curves of many materials.
+
+    Parameters:
+    -----------
+    values : numpy.ndarray
+        Keyword field values of shape (n_materials, N_FIELDS)
+    pressure : array_like, optional
+        Pressures (MPa), shared (1D) or per material (n_materials, m)
+    num_points : int
+        Number of pressures from 0 to p_max when pressure is not given
+    p_max : float or array_like, optional
+        Maximum pressure per material; defaults to the pressure at which
+        the plastic volume strain reaches 99% of W
+
+    Returns:
+    --------
+    dict
+        Arrays of shape (n_materials, m): 'pressure', 'plastic_volumetric_strain'
+        and 'volumetric_strain' (elastic plus plastic)
+    """
+    values = np.atleast_2d(np.asarray(values, dtype=float))
+    W, D1, D2, K = (values[:, [FIELD_INDEX[name]]] for name in ('W', 'D1', 'D2', 'K'))
+    X_i = initial_cap(values)[:, None]
+    if pressure is None:
+        if p_max is None:
+            p_max = saturation_pressure(W, D1, D2, X_i)
+        p_max = np.broadcast_to(np.asarray(p_max, dtype=float).reshape(-1, 1), W.shape)
+        pressure = p_max * np.linspace(0, 1, num_points)
+    pressure = np.broadcast_to(np.asarray(pressure, dtype=float), (len(values), np.shape(pressure)[-1]))
+    plastic = plastic_volumetric_strain(pressure, W, D1, D2, X_i)
+    return {'pressure': pressure, 'plastic_volumetric_strain': plastic,
+            'volumetric_strain': pressure / K + plastic}
+
+
+class HydrostaticFit:
+    """
+    Fitted hardening parameters of every specimen.
+
+    Attributes:
+    -----------
+    W, D1, D2, X_i : numpy.ndarray
+        Hardening parameters and initial cap position per specimen
+    rms : numpy.ndarray
+        Root mean square strain residual per specimen
+    iterations : numpy.ndarray
+        Levenberg-Marquardt iterations per specimen
+    converged : numpy.ndarray
+        True where the iteration met the tolerance
+    """
+
+    def __init__(self, W, D1, D2, X_i, rms, iterations, converged):
+        self.W = W
+        self.D1 = D1
+        self.D2 = D2
+        self.X_i = X_i
+        self.rms = rms
+        self.iterations = iterations
+        self.converged = converged
+
+    def __len__(self):
+        return len(self.W)
+
+    def parameters(self):
+        """
+        Parameters as an array.
+
+        Returns:
+        --------
+        numpy.ndarray
+            Shape (n_specimens, 4) in ``FIT_FIELDS`` order
+        """
+        return np.column_stack([self.W, self.D1, self.D2, self.X_i])
+
+    def apply(self, values):
+        """
+        Keyword values with the fitted hardening parameters.
+
+        The X0 column gets the kappa_0 whose cap starts at the fitted X_i,
+        on the shear surface and with the R of ``values``.
+
+        Parameters:
+        -----------
+        values : numpy.ndarray
+            Keyword field values of shape (n_specimens, N_FIELDS) or (N_FIELDS,)
+
+        Returns:
+        --------
+        numpy.ndarray
+            Copy of shape (n_specimens, N_FIELDS)
+        """
+        values = np.array(np.broadcast_to(values, (len(self), len(FIELD_INDEX))), dtype=float)
+        for name in ('W', 'D1', 'D2'):
+            values[:, FIELD_INDEX[name]] = getattr(self, name)
+        values[:, FIELD_INDEX['X0']] = cap_parameter(driver_parameters(values), self.X_i)
+        return values
+
+    def report(self):
+        """
+        Human readable table of the fits.
+
+        Returns:
+        --------
+        str
+            Formatted text report
+        """
+        text = '{0:>6s} {1:>10s} {2:>10s} {3:>10s} {4:>10s} {5:>10s}\n'.format('#', *FIT_FIELDS, 'rms')
+        for i, row in enumerate(np.column_stack([self.parameters(), self.rms])):
+            text += '{0:6d} {1:10.4G} {2:10.4G} {3:10.4G} {4:10.4G} {5:10.4G}\n'.format(i, *row)
+        return text
+
+
+def _pad(arrays):
+    """Stack ragged 1D arrays, padding with zeros; returns (array, mask)."""
+    arrays = [np.asarray(array, dtype=float).ravel() for array in arrays]
+    length = max(len(array) for array in arrays)
+    stacked = np.zeros((len(arrays), length))
+    mask = np.zeros((len(arrays), length), dtype=bool)
+    for i, array in enumerate(arrays):
+        stacked[i, :len(array)] = array
+        mask[i, :len(array)] = True
+    return stacked, mask
+
+
+def _initial_guess(pressure, strain, mask):
+    """Data driven start: onset of plastic strain, saturation and curvature."""
+    peak = np.max(np.where(mask, strain, -np.inf), axis=1)
+    onset = np.where(mask & (strain <= 0.01 * peak[:, None]), pressure, -np.inf).max(axis=1)
+    onset = np.where(np.isfinite(onset), onset, np.where(mask, pressure, np.inf).min(axis=1))
+    X_i = 3 * onset
+    W = 1.2 * peak
+    # Point closest to half the peak strain fixes the exponent there
+    half = np.argmin(np.where(mask, np.abs(strain - 0.5 * peak[:, None]), np.inf), axis=1)
+    hardening = np.maximum(3 * pressure[np.arange(len(pressure)), half] - X_i, 1e-3 * np.maximum(X_i, 1))
+    exponent = -np.log(1 - 0.5 / 1.2)
+    return W, 0.5 * exponent / hardening, 0.5 * exponent / hardening**2, X_i
+
+
+def _fit_chunk(pressure, strain, mask, weights, start, free, tol, max_iter):
+    """Vectorized Levenberg-Marquardt fit of one chunk of specimens."""
+    n = len(pressure)
+    theta = np.column_stack([np.log(start[0]), np.log(start[1]), np.log(start[2]), start[3] / _CAP_SCALE])
+    weights = np.where(mask, weights, 0.0)
+
+    def residual_and_jacobian(theta):
+        W, D1, D2 = (np.exp(theta[:, [i]]) for i in range(3))
+        X_i = theta[:, [3]] * _CAP_SCALE
+        hardening = 3 * pressure - X_i
+        active = hardening > 0
+        hardening = np.where(active, hardening, 0)
+        decay = np.exp(-D1 * hardening - D2 * hardening**2)
+        model = W * (1 - decay)
+        slope = W * decay
+        jacobian = np.stack([model, slope * D1 * hardening, slope * D2 * hardening**2,
+                             -np.where(active, slope * (D1 + 2 * D2 * hardening), 0) * _CAP_SCALE], axis=2)
+        jacobian *= weights[:, :, None] * free
+        return weights * (model - strain), jacobian
+
+    residual, jacobian = residual_and_jacobian(theta)
+    cost = np.sum(residual**2, axis=1)
+    damping = np.full(n, 1e-3)
+    iterations = np.zeros(n, dtype=int)
+    converged = np.zeros(n, dtype=bool)
+    identity = np.eye(4)
+    for _ in range(max_iter):
+        active = ~converged
+        if not active.any():
+            break
+        iterations[active] += 1
+        normal = np.einsum('nmi,nmj->nij', jacobian, jacobian)
+        gradient = np.einsum('nmi,nm->ni', jacobian, residual)
+        diagonal = np.einsum('nii->ni', normal)
+        scaled = normal + damping[:, None, None] * (diagonal[:, :, None] * identity + 1e-12 * identity)
+        # Fixed parameters get a unit diagonal and no gradient
+        scaled += (1 - free)[None, :, None] * identity
+        step = -np.linalg.solve(scaled, gradient[:, :, None])[:, :, 0] * free
+        trial = theta + step
+        trial[:, :3] = np.maximum(trial[:, :3], _LOG_FLOOR)
+        trial_residual, trial_jacobian = residual_and_jacobian(trial)
+        trial_cost = np.sum(trial_residual**2, axis=1)
+        better = active & (trial_cost < cost)
+        # Done when an accepted step hardly helps, no step helps any more, or the fit is exact
+        stalled = (cost - trial_cost <= tol * cost) | (np.max(np.abs(step), axis=1) < tol)
+        converged |= active & ((better & stalled) | (damping > 1e8) | (cost <= 1e-30))
+        theta[better] = trial[better]
+        residual[better], jacobian[better] = trial_residual[better], trial_jacobian[better]
+        cost[better] = trial_cost[better]
+        damping = np.where(better, np.maximum(damping / 3, 1e-12), damping * 4)
+    W, D1, D2 = (np.exp(theta[:, i]) for i in range(3))
+    X_i = theta[:, 3] * _CAP_SCALE
+    error = plastic_volumetric_strain(pressure, W[:, None], D1[:, None], D2[:, None], X_i[:, None]) - strain
+    rms = np.sqrt(np.sum(np.where(mask, error**2, 0), axis=1) / np.maximum(np.sum(mask, axis=1), 1))
+    return W, D1, D2, X_i, rms, iterations, converged
+
+
+def fit_hydrostatic(pressure, strain, bulk_modulus=None, initial=None, fixed=None, weights=None,
+                    tol=1e-10, max_iter=200, workers=1, chunk_size=4096):
+    """
+    Fit W, D1, D2 and X_i to measured hydrostatic compression curves.
+
+    Parameters:
+    -----------
+    pressure : sequence of array_like
+        Pressures (MPa) per specimen; curves may have different lengths
+    strain : sequence of array_like
+        Measured volume strains per specimen: plastic volume strains, or
+        total volume strains if ``bulk_modulus`` is given
+    bulk_modulus : float or array_like, optional
+        Bulk modulus K (MPa) per specimen; the elastic strain p / K is
+        subtracted from the measured strains
+    initial : dict, optional
+        Starting values per parameter name (``FIT_FIELDS``); defaults
+        are estimated from the data
+    fixed : dict, optional
+        Parameters held at the given values, e.g. {'X_i': 250.0}
+    weights : sequence of array_like, optional
+        Weights of the measured points
+    tol : float
+        Relative cost decrease and step size that end the iteration
+    max_iter : int
+        Maximum Levenberg-Marquardt iterations
+    workers : int, optional
+        Worker processes; None uses the CPU count, 1 fits in process
+    chunk_size : int
+        Specimens fitted together per task
+
+    Returns:
+    --------
+    HydrostaticFit
+        Fitted parameters and residuals
+    """
+    pressure, mask = _pad(pressure)
+    strain, strain_mask = _pad(strain)
+    if strain.shape != pressure.shape or not np.array_equal(mask, strain_mask):
+        raise ValueError("Pressure and strain curves must have the same lengths")
+    if bulk_modulus is not None:
+        strain = strain - pressure / np.asarray(bulk_modulus, dtype=float).reshape(-1, 1)
+    weights = np.ones_like(pressure) if weights is None else _pad(weights)[0]
+
+    start = list(_initial_guess(pressure, strain, mask))
+    free = np.ones(4)
+    for i, name in enumerate(FIT_FIELDS):
+        if initial is not None and name in initial:
+            start[i] = np.broadcast_to(np.asarray(initial[name], dtype=float), (len(pressure),))
+        if fixed is not None and name in fixed:
+            start[i] = np.broadcast_to(np.asarray(fixed[name], dtype=float), (len(pressure),))
+            free[i] = 0
+    start = np.array(start)
+    start[:3] = np.maximum(start[:3], np.exp(_LOG_FLOOR))
+
+    chunks = [slice(begin, begin + chunk_size) for begin in range(0, len(pressure), chunk_size)]
+    arguments = [(pressure[chunk], strain[chunk], mask[chunk], weights[chunk], start[:, chunk], free, tol, max_iter)
+                 for chunk in chunks]
+    workers = os.cpu_count() if workers is None else workers
+    if workers <= 1 or len(chunks) <= 1:
+        results = [_fit_chunk(*argument) for argument in arguments]
+    else:
+        with ProcessPoolExecutor(min(workers, len(chunks))) as executor:
+            results = list(executor.map(_fit_chunk, *zip(*arguments)))
+    fit = HydrostaticFit(*(np.concatenate(parts) for parts in zip(*results)))
+    # Fixed values are reported as given, not as clamped or rescaled in the iteration
+    for name in FIT_FIELDS:
+        if fixed is not None and name in fixed:
+            setattr(fit, name, np.array(np.broadcast_to(np.asarray(fixed[name], dtype=float), (len(pressure),))))
+    return fit
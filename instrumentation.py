@@ -0,0 +1,106 @@
+"""
+Instrumentation for the CSCM material-point driver.
+
+A ``DriverProbe`` is passed to ``MatCSCM.Evaluate.uniaxial_compression_response``
+through the ``probe`` argument. When no probe is given the driver only performs
+a ``None`` check per branch, so the hooks can stay in production batch runs.
+
+The probe collects:
+- per-step counters (elastic/plastic steps, cap and damage updates, fallback hits)
+- cumulative wall-clock timers per phase of a step
+- an optional ring buffer with the last ``trace_size`` states of internal variables
+"""
+
+from time import perf_counter
+
+import numpy as np
+
+
+class DriverProbe:
+    """
+    Opt-in collector of per-step statistics of the material-point driver.
+
+    Parameters:
+    -----------
+    trace_size : int
+        Number of most recent steps kept in the trace ring buffer (0 disables tracing)
+    timers : bool
+        Accumulate wall-clock time per phase of the step
+    """
+
+    COUNTERS = ('steps', 'elastic', 'plastic', 'cap_updates', 'damage_updates',
+                'cap_fallback', 'damage_fallback')
+    PHASES = ('trial', 'yield', 'plastic', 'damage')
+    TRACE_FIELDS = ('step', 'strain', 'stress', 'kappa', 'epsilon_v_p',
+                    'plastic_strain', 'damage')
+
+    def __init__(self, trace_size=0, timers=True):
+        self.trace_size = int(trace_size)
+        self.timers_enabled = timers
+        self.reset()
+
+    def reset(self):
+        """Clear counters, timers and the trace buffer."""
+        self.counters = dict.fromkeys(self.COUNTERS, 0)
+        self.timers = dict.fromkeys(self.PHASES, 0.0)
+        self._trace = np.zeros((self.trace_size, len(self.TRACE_FIELDS)))
+        self._trace_count = 0
+
+    def count(self, name, n=1):
+        """Increment counter ``name`` by ``n``."""
+        self.counters[name] += n
+
+    def clock(self):
+        """Return a time stamp for ``lap`` or ``None`` if timers are disabled."""
+        return perf_counter() if self.timers_enabled else None
+
+    def lap(self, phase, t_start):
+        """
+        Add time elapsed since ``t_start`` to ``phase`` and return a new time stamp.
+        """
+        if t_start is None:
+            return None
+        t_now = perf_counter()
+        self.timers[phase] += t_now - t_start
+        return t_now
+
+    def record(self, step, strain, stress, kappa, epsilon_v_p, plastic_strain, damage):
+        """Store the state of internal variables at the end of a step."""
+        if self.trace_size == 0:
+            return
+        row = self._trace_count % self.trace_size
+        self._trace[row] = (step, strain, stress, kappa, epsilon_v_p, plastic_strain, damage)
+        self._trace_count += 1
+
+    @property
+    def trace(self):
+        """
+        Recorded states in chronological order.
+
+        Returns:
+        --------
+        numpy.ndarray
+            Structured array with fields ``TRACE_FIELDS``
+        """
+        n = min(self._trace_count, self.trace_size)
+        start = self._trace_count % self.trace_size if self._trace_count > self.trace_size else 0
+        rows = np.roll(self._trace, -start, axis=0)[:n]
+        dtype = [(name, float) for name in self.TRACE_FIELDS]
+        return np.rec.fromarrays(rows.T, dtype=dtype)
+
+    def summary(self):
+        """
+        Human readable report of counters and timers.
+
+        Returns:
+        --------
+        str
+            Formatted text with one counter or timer per line
+        """
+        text = 'Driver statistics:\n'
+        for key, value in self.counters.items():
+            text += '  {0:<16s} {1:>10d}\n'.format(key, value)
+        if self.timers_enabled:
+            for key, value in self.timers.items():
+                text += '  {0:<16s} {1:>10.3G} s\n'.format('t_' + key, value)
+        return text
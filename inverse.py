@@ -0,0 +1,221 @@
+"""
+Inverse identification of the concrete behind existing *MAT_CSCM parameter sets.
+
+For every target parameter vector (e.g. cards read with ``deck_reader``)
+the compressive strength f_c, and optionally the aggregate size dmax and
+the revision, are found that minimize the weighted relative misfit between
+the target fields and ``batch_params.keyword_values``. All targets are
+solved together:
+
+1. bracketing: the misfit is evaluated on a coarse f_c grid for all targets
+   at once and the best grid point brackets the minimum
+2. safeguarded Newton iterations with central differences refine f_c inside
+   the bracket, falling back to bisection of the bracket
+
+The fitted fields depend linearly on dmax at fixed f_c (through the
+fracture energies), so the optimal dmax is obtained in closed form for
+every f_c candidate instead of adding a search dimension.
+"""
+
+import numpy as np
+
+from MatCSCM import Revision
+from batch_params import keyword_values
+from cscm_keyword import FIELD_INDEX
+from deck_diff import load_materials
+
+# Fields that follow from f_c, dmax and the revision
+FIT_FIELDS = ('G', 'K', 'ALPHA', 'THETA', 'LAMBDA', 'BETA', 'ALPHA1', 'THETA1', 'LAMBDA1',
+              'BETA1', 'ALPHA2', 'THETA2', 'LAMBDA2', 'BETA2', 'R', 'X0', 'W', 'D1', 'D2',
+              'GFC', 'GFT', 'GFS')
+
+
+class InverseResult:
+    """
+    Identified concrete of every target.
+
+    Attributes:
+    -----------
+    f_c, dmax : numpy.ndarray
+        Compressive strength (MPa) and aggregate size (mm) per target
+    revision : list of Revision
+        Revision of the yield surface and cap parameters per target; None
+        for targets without a finite misfit (unidentified)
+    misfit : numpy.ndarray
+        Weighted sum of squared relative field errors per target
+    mids : list
+        Material IDs of the targets
+    """
+
+    def __init__(self, f_c, dmax, revision, misfit, mids):
+        self.f_c = f_c
+        self.dmax = dmax
+        self.revision = revision
+        self.misfit = misfit
+        self.mids = mids
+
+    def __len__(self):
+        return len(self.f_c)
+
+    def fitted_values(self):
+        """
+        Keyword values of the identified concretes.
+
+        Returns:
+        --------
+        numpy.ndarray
+            Values of shape (n_targets, N_FIELDS); NaN rows for unidentified targets
+        """
+        values = np.full((len(self), len(FIELD_INDEX)), np.nan)
+        revisions = np.array([0 if rev is None else rev.value for rev in self.revision])
+        for value in np.unique(revisions[revisions > 0]):
+            rows = revisions == value
+            values[rows] = keyword_values(self.f_c[rows], self.dmax[rows], rev=Revision(int(value)))
+        return values
+
+    def report(self):
+        """
+        Human readable table of the identified concretes.
+
+        Returns:
+        --------
+        str
+            Formatted text report
+        """
+        text = '{0:>10s} {1:>10s} {2:>10s} {3:>8s} {4:>12s}\n'.format('MID', 'f_c', 'dmax', 'rev', 'misfit')
+        for mid, f_c, dmax, rev, misfit in zip(self.mids, self.f_c, self.dmax, self.revision, self.misfit):
+            if rev is None:
+                text += '{0:>10} {1:>10s} {2:>10s} {3:>8s} {4:>12s}\n'.format(mid, '-', '-', '-', '-')
+                continue
+            text += '{0:>10} {1:10.4G} {2:10.4G} {3:>8s} {4:12.4G}\n'.format(mid, f_c, dmax, rev.name, misfit)
+        return text
+
+
+class _Misfit:
+    """Vectorized misfit of f_c candidates against the targets of one revision."""
+
+    def __init__(self, targets, weights, rev, dmax, dmax_range):
+        self.targets = targets
+        self.rev = rev
+        self.dmax = dmax
+        self.dmax_range = dmax_range
+        blank = np.isnan(targets)
+        self.weights = np.where(blank, 0.0, weights)
+        self.targets = np.where(blank, 0.0, targets)
+        self.scale = np.where(self.targets != 0, np.abs(self.targets), 1.0)
+        self.columns = [FIELD_INDEX[name] for name in FIT_FIELDS]
+
+    def __call__(self, f_c, rows):
+        """Misfit and optimal dmax of candidates ``f_c`` for the targets ``rows``."""
+        targets, weights, scale = self.targets[rows], self.weights[rows], self.scale[rows]
+        if self.dmax is not None:
+            dmax = np.broadcast_to(np.asarray(self.dmax, dtype=float), f_c.shape)
+            values = keyword_values(f_c, dmax, rev=self.rev)[:, self.columns]
+        else:
+            low, high = self.dmax_range
+            at_low = keyword_values(f_c, low, rev=self.rev)[:, self.columns]
+            slope = (keyword_values(f_c, high, rev=self.rev)[:, self.columns] - at_low) / (high - low)
+            # Weighted least squares of the fields that are linear in dmax
+            w = weights / scale**2
+            denominator = np.sum(w * slope**2, axis=1)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                dmax = low + np.sum(w * slope * (targets - at_low), axis=1) / denominator
+            dmax = np.clip(np.where(denominator > 0, dmax, 0.5 * (low + high)), low, high)
+            values = at_low + slope * (dmax - low)[:, None]
+        residual = (values - targets) / scale
+        return np.sum(weights * residual**2, axis=1), dmax
+
+
+def _solve_revision(misfit, n, f_c_range, grid_step, tol, max_iter):
+    """Bracket and refine f_c of all targets for one revision."""
+    grid = np.arange(f_c_range[0], f_c_range[1] + 0.5 * grid_step, grid_step)
+    m = len(grid)
+    rows = np.repeat(np.arange(n), m)
+    values, _ = misfit(np.tile(grid, n), rows)
+    best = np.argmin(values.reshape(n, m), axis=1)
+    low = grid[np.maximum(best - 1, 0)]
+    high = grid[np.minimum(best + 1, m - 1)]
+    x = grid[best]
+    everything = np.arange(n)
+
+    for _ in range(max_iter):
+        h = 1e-4 * np.maximum(1.0, np.abs(x))
+        candidates = np.concatenate((x - h, x, x + h))
+        f, _ = misfit(candidates, np.tile(everything, 3))
+        f_minus, f_0, f_plus = f[:n], f[n:2 * n], f[2 * n:]
+        gradient = (f_plus - f_minus) / (2 * h)
+        curvature = (f_plus - 2 * f_0 + f_minus) / h**2
+
+        # Shrink the bracket on the side the gradient points away from
+        low = np.where(gradient < 0, np.maximum(low, x), low)
+        high = np.where(gradient > 0, np.minimum(high, x), high)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            newton = x - gradient / curvature
+        inside = (curvature > 0) & (newton > low) & (newton < high)
+        x_new = np.where(inside, newton, 0.5 * (low + high))
+        x_new = np.where(gradient == 0, x, x_new)
+        converged = np.abs(x_new - x) <= tol * np.maximum(1.0, np.abs(x))
+        x = x_new
+        if converged.all():
+            break
+
+    f, dmax = misfit(x, everything)
+    return x, dmax, f
+
+
+def identify_concrete(targets, fit_dmax=True, dmax=19, revisions=(Revision.REV_2,), weights=None,
+                      f_c_range=(10.0, 120.0), dmax_range=(4.0, 64.0), grid_step=2.0,
+                      tol=1e-8, max_iter=40):
+    """
+    Find the concrete that reproduces given *MAT_CSCM parameter sets.
+
+    Parameters:
+    -----------
+    targets : str, numpy.ndarray or iterable
+        Keyword deck, value array of shape (n, N_FIELDS), or MatCSCM /
+        KeywordRecord objects (see ``deck_diff.load_materials``)
+    fit_dmax : bool
+        Identify dmax as well; otherwise ``dmax`` is used
+    dmax : float
+        Aggregate size (mm) when ``fit_dmax`` is False
+    revisions : sequence of Revision
+        Candidate revisions of the yield surface and cap parameters; the
+        best one is chosen per target
+    weights : dict, optional
+        Field name -> weight of the relative misfit (default 1 for ``FIT_FIELDS``)
+    f_c_range : tuple
+        Search range of f_c (MPa)
+    dmax_range : tuple
+        Admissible range of dmax (mm)
+    grid_step : float
+        Spacing of the bracketing grid (MPa)
+    tol : float
+        Relative convergence tolerance of f_c
+    max_iter : int
+        Maximum number of Newton / bisection iterations
+
+    Returns:
+    --------
+    InverseResult
+        Identified f_c, dmax and revision per target
+    """
+    values, mids = load_materials(targets)
+    n = len(values)
+    columns = [FIELD_INDEX[name] for name in FIT_FIELDS]
+    field_weights = np.array([1.0 if weights is None else weights.get(name, 0.0) for name in FIT_FIELDS])
+    field_weights = np.broadcast_to(field_weights, (n, len(FIT_FIELDS)))
+
+    best_f = np.full(n, np.inf)
+    f_c = np.full(n, np.nan)
+    fitted_dmax = np.full(n, np.nan)
+    revision = [None] * n
+    for rev in revisions:
+        misfit = _Misfit(values[:, columns], field_weights, rev, None if fit_dmax else dmax, dmax_range)
+        x, d, f = _solve_revision(misfit, n, f_c_range, grid_step, tol, max_iter)
+        better = f < best_f
+        best_f = np.where(better, f, best_f)
+        f_c = np.where(better, x, f_c)
+        fitted_dmax = np.where(better, d, fitted_dmax)
+        for i in np.flatnonzero(better):
+            revision[i] = rev
+    return InverseResult(f_c, fitted_dmax, revision, best_f, mids)
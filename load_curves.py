@@ -0,0 +1,246 @@
+"""
+*DEFINE_CURVE export of CEB-FIP and DIF curves with point reduction.
+
+LS-DYNA interpolates load curves linearly between points, so points that
+lie (within a tolerance) on the line between their neighbours only enlarge
+the deck and the table lookups. ``simplify_curves`` removes them with the
+Douglas-Peucker algorithm, measuring the error vertically, i.e. as the
+error of the interpolated ordinate. All curves of a batch are reduced
+together: every iteration splits the open segments of all curves with a
+few array operations.
+
+``write_material_curves`` exports the compression, tension, crack opening
+and DIF curves of many materials with consecutive, unique LCIDs.
+"""
+
+import io
+
+import numpy as np
+
+from CEB import CEBClass, DIF_table
+
+# Curves exported per material, in LCID order
+CURVE_NAMES = ('compression', 'tension', 'crack_opening', 'dif_compression', 'dif_tension')
+
+DEFAULT_RTOL = 1e-3
+
+# Points of the log-spaced DIF tables before reduction
+DIF_POINTS = 500
+
+
+def _strictly_increasing(curve):
+    """Curve without points repeating the abscissa of their predecessor."""
+    curve = np.asarray(curve, dtype=float)
+    keep = np.concatenate(([True], np.diff(curve[0]) > 0))
+    if not np.all(np.diff(curve[0][keep]) > 0):
+        raise ValueError("Load curve abscissas must be increasing")
+    return curve[:, keep]
+
+
+def simplify_curves(curves, rtol=DEFAULT_RTOL, atol=None):
+    """
+    Reduce the points of many curves (Douglas-Peucker).
+
+    Parameters:
+    -----------
+    curves : sequence of array_like
+        Curves of shape (2, n) with increasing abscissas; points repeating
+        the previous abscissa are dropped
+    rtol : float
+        Tolerance relative to the largest absolute ordinate of each curve
+    atol : float or array_like, optional
+        Absolute tolerance per curve; overrides rtol
+
+    Returns:
+    --------
+    list of numpy.ndarray
+        Reduced curves; linear interpolation of a reduced curve deviates
+        from every original point by at most the tolerance
+    """
+    curves = [_strictly_increasing(curve) for curve in curves]
+    if not curves:
+        return []
+    x = np.concatenate([curve[0] for curve in curves])
+    y = np.concatenate([curve[1] for curve in curves])
+    sizes = np.array([curve.shape[1] for curve in curves])
+    ends = np.cumsum(sizes) - 1
+    starts = ends - sizes + 1
+    if atol is None:
+        tolerance = rtol * np.array([np.max(np.abs(curve[1])) if curve.size else 0 for curve in curves])
+    else:
+        tolerance = np.broadcast_to(np.asarray(atol, dtype=float), sizes.shape)
+    tolerance = np.repeat(tolerance, sizes)
+
+    keep = np.zeros(len(x), dtype=bool)
+    keep[starts] = keep[ends] = True
+    first, last = starts[sizes > 1], ends[sizes > 1]
+    while len(first):
+        lengths = last - first - 1
+        inner = lengths > 0
+        first, last, lengths = first[inner], last[inner], lengths[inner]
+        if not len(first):
+            break
+        # Interior points of all open segments
+        owner = np.repeat(np.arange(len(first)), lengths)
+        offsets = np.cumsum(lengths) - lengths
+        index = np.arange(lengths.sum()) - np.repeat(offsets, lengths) + np.repeat(first + 1, lengths)
+        x0, x1 = x[first][owner], x[last][owner]
+        y0, y1 = y[first][owner], y[last][owner]
+        deviation = np.abs(y[index] - (y0 + (y1 - y0) * (x[index] - x0) / (x1 - x0))) - tolerance[index]
+        largest = np.maximum.reduceat(deviation, offsets)
+        split = largest > 0
+        # First interior point with the largest deviation of each split segment
+        hits = np.flatnonzero(split[owner] & (deviation == largest[owner]))
+        _, unique = np.unique(owner[hits], return_index=True)
+        pivot = index[hits[unique]]
+        keep[pivot] = True
+        first = np.concatenate((first[split], pivot))
+        last = np.concatenate((pivot, last[split]))
+    return [curve[:, keep[start:end + 1]] for curve, start, end in zip(curves, starts, ends)]
+
+
+def simplify_curve(curve, rtol=DEFAULT_RTOL, atol=None):
+    """
+    Reduce the points of one curve; see ``simplify_curves``.
+
+    Returns:
+    --------
+    numpy.ndarray
+        Reduced curve of shape (2, m)
+    """
+    return simplify_curves([curve], rtol, atol)[0]
+
+
+def define_curve_text(lcid, curve, title=None, sfa=1.0, sfo=1.0):
+    """
+    Format a curve as *DEFINE_CURVE (or *DEFINE_CURVE_TITLE).
+
+    Parameters:
+    -----------
+    lcid : int
+        Load curve ID
+    curve : array_like
+        Points of shape (2, n)
+    title : str, optional
+        Curve title
+    sfa, sfo : float
+        Abscissa and ordinate scale factors
+
+    Returns:
+    --------
+    str
+        Keyword text
+    """
+    lines = ['*DEFINE_CURVE_TITLE\n{0}\n'.format(title) if title is not None else '*DEFINE_CURVE\n',
+             '$#    lcid      sidr       sfa       sfo      offa      offo    dattyp     lcint\n',
+             '{0:10d}{1:10d}{2:10.4G}{3:10.4G}{4:10.4G}{5:10.4G}{6:10d}{7:10d}\n'.format(
+                 int(lcid), 0, sfa, sfo, 0.0, 0.0, 0, 0),
+             '$#                a1                  o1\n']
+    curve = np.asarray(curve, dtype=float)
+    lines.extend(map('{0:20.12G}{1:20.12G}\n'.format, curve[0], curve[1]))
+    return ''.join(lines)
+
+
+def write_curves(curves, out, first_lcid=1, titles=None, rtol=DEFAULT_RTOL, atol=None):
+    """
+    Reduce and write many curves as *DEFINE_CURVE keywords.
+
+    Parameters:
+    -----------
+    curves : sequence of array_like
+        Curves of shape (2, n)
+    out : file-like
+        Text stream with a ``write`` method
+    first_lcid : int
+        LCID of the first curve; the others follow consecutively
+    titles : sequence of str, optional
+        Curve titles (*DEFINE_CURVE_TITLE)
+    rtol, atol : float, optional
+        Reduction tolerances of ``simplify_curves``; rtol=0 writes all points
+
+    Returns:
+    --------
+    numpy.ndarray
+        LCIDs of the curves
+    """
+    reduced = simplify_curves(curves, rtol, atol)
+    lcids = first_lcid + np.arange(len(reduced))
+    titles = [None] * len(reduced) if titles is None else titles
+    for lcid, curve, title in zip(lcids, reduced, titles):
+        out.write(define_curve_text(lcid, curve, title))
+    return lcids
+
+
+def material_curves(f_c, dmax=19, curve_array_size=100):
+    """
+    CEB-FIP and DIF curves of many materials.
+
+    Parameters:
+    -----------
+    f_c : array_like
+        Compressive strengths (MPa)
+    dmax : array_like
+        Maximum aggregate sizes (mm); broadcast against f_c
+    curve_array_size : int
+        Points of the CEB-FIP stress-strain curves
+
+    Returns:
+    --------
+    list of dict
+        ``CURVE_NAMES`` -> curve of shape (2, n), per material
+    """
+    f_c, dmax = np.broadcast_arrays(np.atleast_1d(np.asarray(f_c, dtype=float)), np.asarray(dmax, dtype=float))
+    materials = []
+    for strength, size in zip(f_c, dmax):
+        ceb = CEBClass(f_c=strength, d_max=size, curve_array_size=curve_array_size)
+        materials.append({
+            'compression': ceb.compression_curve,
+            'tension': ceb.tension_curve,
+            'crack_opening': ceb.crack_opening_curve,
+            'dif_compression': DIF_table(strength, 'compression', num_points=DIF_POINTS),
+            'dif_tension': DIF_table(strength, 'tension', num_points=DIF_POINTS),
+        })
+    return materials
+
+
+def write_material_curves(f_c, out=None, dmax=19, first_lcid=1, rtol=DEFAULT_RTOL, atol=None,
+                          curve_array_size=100, names=CURVE_NAMES):
+    """
+    Write the load curves of many materials with unique LCIDs.
+
+    Material i gets the LCIDs ``first_lcid + i * len(names)`` onwards, in the
+    order of ``names``.
+
+    Parameters:
+    -----------
+    f_c : array_like
+        Compressive strengths (MPa)
+    out : file-like, optional
+        Text stream; None returns the text
+    dmax : array_like
+        Maximum aggregate sizes (mm)
+    first_lcid : int
+        LCID of the first curve
+    rtol, atol : float, optional
+        Reduction tolerances of ``simplify_curves``
+    curve_array_size : int
+        Points of the CEB-FIP stress-strain curves before reduction
+    names : sequence of str
+        Curves to export, from ``CURVE_NAMES``
+
+    Returns:
+    --------
+    numpy.ndarray or tuple
+        LCIDs of shape (n_materials, len(names)); with out=None the tuple
+        (LCIDs, keyword text)
+    """
+    buffer = io.StringIO() if out is None else out
+    materials = material_curves(f_c, dmax, curve_array_size)
+    f_c, dmax = np.broadcast_arrays(np.atleast_1d(np.asarray(f_c, dtype=float)), np.asarray(dmax, dtype=float))
+    curves = [material[name] for material in materials for name in names]
+    titles = ['{0} f_c={1:g} dmax={2:g}'.format(name, strength, size)
+              for strength, size in zip(f_c, dmax) for name in names]
+    lcids = write_curves(curves, buffer, first_lcid, titles, rtol, atol).reshape(len(materials), len(names))
+    if out is None:
+        return lcids, buffer.getvalue()
+    return lcids
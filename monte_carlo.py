@@ -0,0 +1,366 @@
+"""
+Monte Carlo propagation of concrete property scatter through the *MAT_CSCM keyword.
+
+The inputs f_c, dmax, delta_f (mean minus characteristic strength of the
+CEB-FIP properties) and rho are sampled from user distributions and pushed
+through the batch evaluators in vectorized chunks: ``batch_params`` for the
+keyword parameters and, optionally, ``batch_driver`` for the uniaxial
+compression response. Chunks run in worker processes and write into shared
+memory; every chunk draws from its own seed of one ``SeedSequence``, so the
+samples do not depend on the number of workers.
+
+Distributions are given as:
+- a number: constant
+- ('normal', mean, std), ('normal', mean, std, low) or
+  ('normal', mean, std, low, high): normal, truncated below or to [low, high]
+- ('lognormal', mean, std): lognormal with the given mean and standard deviation
+- ('uniform', low, high)
+- ('triangular', low, mode, high)
+- a callable ``f(rng, n)`` returning n samples
+"""
+
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from MatCSCM import Revision
+from batch_driver import OUTPUTS, uniaxial_compression
+from batch_params import keyword_values
+from cscm_keyword import CSCM_FIELDS, FIELD_INDEX, N_FIELDS, KeywordRecord
+from deck_writer import write_deck
+
+INPUTS = ('f_c', 'dmax', 'delta_f', 'rho')
+
+DEFAULT_PERCENTILES = (5, 50, 95)
+
+# Accepted parameter counts and forms of the tuple distributions
+DISTRIBUTION_FORMS = {
+    'normal': ((2, 3, 4), "('normal', mean, std[, low[, high]])"),
+    'lognormal': ((2,), "('lognormal', mean, std)"),
+    'uniform': ((2,), "('uniform', low, high)"),
+    'triangular': ((3,), "('triangular', low, mode, high)"),
+}
+
+# Rational approximation of the standard normal quantile (relative error below 1.2e-9)
+_QUANTILE_A = (-3.969683028665376e+01, 2.209460984245205e+02, -2.759285104469687e+02,
+               1.383577518672690e+02, -3.066479806614716e+01, 2.506628277459239e+00)
+_QUANTILE_B = (-5.447609879822406e+01, 1.615858368580409e+02, -1.556989798598866e+02,
+               6.680131188771972e+01, -1.328068155288572e+01, 1.0)
+_QUANTILE_C = (-7.784894002430293e-03, -3.223964580411365e-01, -2.400758277161838e+00,
+               -2.549732539343734e+00, 4.374664141464968e+00, 2.938163982698783e+00)
+_QUANTILE_D = (7.784695709041462e-03, 3.224671290700398e-01, 2.445134137142996e+00,
+               3.754408661907416e+00, 1.0)
+_QUANTILE_TAIL = 0.02425
+
+
+def _normal_cdf(z):
+    """Standard normal CDF of a scalar, accurate far into the lower tail."""
+    return 0.5 * math.erfc(-z / math.sqrt(2))
+
+
+def _normal_quantile(p):
+    """Standard normal quantile of probabilities in (0, 1)."""
+    p = np.asarray(p, dtype=float)
+    tail = np.minimum(p, 1 - p)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        q = np.sqrt(-2 * np.log(tail))
+        outer = np.polyval(_QUANTILE_C, q) / np.polyval(_QUANTILE_D, q)
+        r = (p - 0.5)**2
+        inner = (p - 0.5) * np.polyval(_QUANTILE_A, r) / np.polyval(_QUANTILE_B, r)
+    return np.where(tail < _QUANTILE_TAIL, np.where(p < 0.5, outer, -outer), inner)
+
+
+def truncated_normal(mean, std, low, high, n, rng):
+    """
+    Samples of a normal distribution truncated to [low, high] by inverse CDF.
+
+    Parameters:
+    -----------
+    mean, std : float
+        Parameters of the untruncated distribution
+    low, high : float
+        Bounds; may be infinite
+    n : int
+        Number of samples
+    rng : numpy.random.Generator
+        Random number generator
+
+    Returns:
+    --------
+    numpy.ndarray
+        Samples of shape (n,)
+    """
+    if not std > 0:
+        raise ValueError(f"Invalid standard deviation: {std}")
+    if not low < high:
+        raise ValueError(f"Invalid bounds: low={low} must be below high={high}")
+    a, b = (low - mean) / std, (high - mean) / std
+    # Work in the lower tail, where the CDF keeps its precision
+    sign = -1.0 if a > 0 else 1.0
+    a, b = sorted((sign * a, sign * b))
+    p_low, p_high = _normal_cdf(a), _normal_cdf(b)
+    if not p_high > p_low:
+        raise ValueError(f"Bounds [{low}, {high}] lie too far in the tail of normal({mean}, {std})")
+    z = _normal_quantile(rng.uniform(p_low, p_high, n))
+    return np.clip(mean + std * sign * z, low, high)
+
+
+def sample(distribution, n, rng):
+    """
+    Draw samples from a distribution specification.
+
+    Parameters:
+    -----------
+    distribution : float, tuple or callable
+        Distribution as described in the module documentation
+    n : int
+        Number of samples
+    rng : numpy.random.Generator
+        Random number generator
+
+    Returns:
+    --------
+    numpy.ndarray
+        Samples of shape (n,)
+    """
+    if callable(distribution):
+        return np.asarray(distribution(rng, n), dtype=float)
+    if not isinstance(distribution, (tuple, list)):
+        return np.full(n, float(distribution))
+    kind, *parameters = distribution
+    if kind not in DISTRIBUTION_FORMS or len(parameters) not in DISTRIBUTION_FORMS[kind][0]:
+        forms = ', '.join(form for _, form in DISTRIBUTION_FORMS.values())
+        raise ValueError(f"Invalid distribution {tuple(distribution)}; expected one of {forms}")
+    if kind == 'normal':
+        mean, std, *bounds = parameters
+        if not bounds:
+            return rng.normal(mean, std, n)
+        low, high = bounds if len(bounds) == 2 else (bounds[0], np.inf)
+        return truncated_normal(mean, std, low, high, n, rng)
+    if kind == 'lognormal':
+        mean, std = parameters
+        sigma2 = np.log(1 + (std / mean)**2)
+        return rng.lognormal(np.log(mean) - sigma2 / 2, np.sqrt(sigma2), n)
+    if kind == 'uniform':
+        return rng.uniform(*parameters, n)
+    if kind == 'triangular':
+        return rng.triangular(*parameters, n)
+
+
+def _evaluate(seed, n, spec):
+    """Sample inputs and evaluate the keyword (and driver) for one chunk."""
+    rng = np.random.default_rng(seed)
+    inputs = np.column_stack([sample(spec['distributions'][name], n, rng) for name in INPUTS])
+    f_c, dmax, delta_f, rho = inputs.T
+    values = keyword_values(f_c, dmax, spec['esize'], spec['rev'], spec['softening_rev'],
+                            delta_f, **spec['material'])
+    values[:, FIELD_INDEX['RHO']] = rho
+    outputs = None
+    if spec['num_points']:
+        response = uniaxial_compression(f_c, values, spec['max_strain'], spec['num_points'])
+        outputs = np.column_stack([response[name] for name in OUTPUTS])
+    return inputs, values, outputs
+
+
+# Shared output arrays of the current worker process
+_worker = {}
+
+
+def _shapes(n, driver):
+    shapes = {'inputs': (n, len(INPUTS)), 'values': (n, N_FIELDS)}
+    if driver:
+        shapes['outputs'] = (n, len(OUTPUTS))
+    return shapes
+
+
+def _init_worker(spec, blocks, n):
+    _worker['spec'] = spec
+    _worker['blocks'] = {name: shared_memory.SharedMemory(name=block) for name, block in blocks.items()}
+    _worker['arrays'] = {name: np.ndarray(shape, buffer=_worker['blocks'][name].buf)
+                         for name, shape in _shapes(n, spec['num_points']).items()}
+
+
+def _run_chunk(seed, start, stop):
+    inputs, values, outputs = _evaluate(seed, stop - start, _worker['spec'])
+    arrays = _worker['arrays']
+    arrays['inputs'][start:stop] = inputs
+    arrays['values'][start:stop] = values
+    if outputs is not None:
+        arrays['outputs'][start:stop] = outputs
+    return stop - start
+
+
+class MonteCarloResult:
+    """
+    Samples and propagated results of a Monte Carlo run.
+
+    Attributes:
+    -----------
+    inputs : dict
+        'f_c', 'dmax', 'delta_f', 'rho' -> samples of shape (n,)
+    values : numpy.ndarray
+        Keyword field values of shape (n, N_FIELDS)
+    outputs : dict
+        Driver results (``batch_driver.OUTPUTS``) of shape (n,); empty
+        without the driver
+    """
+
+    def __init__(self, inputs, values, outputs):
+        self.inputs = inputs
+        self.values = values
+        self.outputs = outputs
+
+    def __len__(self):
+        return len(self.values)
+
+    def percentiles(self, q=DEFAULT_PERCENTILES):
+        """
+        Percentiles of inputs, keyword fields and driver outputs.
+
+        Parameters:
+        -----------
+        q : sequence of float
+            Percentiles in [0, 100]
+
+        Returns:
+        --------
+        dict
+            Name -> array of len(q); keyword fields under their card names
+        """
+        result = {name: np.percentile(samples, q) for name, samples in self.inputs.items()}
+        fields = np.nanpercentile(self.values, q, axis=0) if len(self) else np.full((len(q), N_FIELDS), np.nan)
+        result.update({name: fields[:, i] for i, name in enumerate(CSCM_FIELDS)})
+        result.update({name: np.percentile(samples, q) for name, samples in self.outputs.items()})
+        return result
+
+    def report(self, q=DEFAULT_PERCENTILES):
+        """
+        Human readable percentile table of all quantities that scatter.
+
+        Returns:
+        --------
+        str
+            Formatted text report
+        """
+        stats = self.percentiles(q)
+        text = 'Samples: {0}\n'.format(len(self))
+        text += '{0:<22s}'.format('quantity') + ''.join('{0:>12s}'.format('P{0:g}'.format(p)) for p in q) + '\n'
+        for name, values in stats.items():
+            if np.all(np.isnan(values)) or np.ptp(values) == 0:
+                continue
+            text += '{0:<22s}'.format(name) + ''.join('{0:12.4G}'.format(v) for v in values) + '\n'
+        return text
+
+    def stochastic_field(self, parts, first_mid=1):
+        """
+        Assign one sampled material to every part (or element set).
+
+        Parameters:
+        -----------
+        parts : sequence
+            Part IDs; part ``i`` gets sample ``i``
+        first_mid : int
+            Material ID of the first sample
+
+        Returns:
+        --------
+        tuple
+            (list of KeywordRecord, dict part ID -> MID)
+        """
+        parts = list(parts)
+        if len(parts) > len(self):
+            raise ValueError(f"{len(parts)} parts need at least as many samples, got {len(self)}")
+        values = self.values[:len(parts)].copy()
+        values[:, FIELD_INDEX['MID']] = first_mid + np.arange(len(parts))
+        records = [KeywordRecord(row) for row in values]
+        return records, {part: first_mid + i for i, part in enumerate(parts)}
+
+    def write_field_deck(self, parts, path=None, first_mid=1, **deck_options):
+        """
+        Write the stochastic-field materials of ``parts`` as a deck.
+
+        Returns:
+        --------
+        dict
+            Result of ``deck_writer.write_deck`` with the added 'part_mids' mapping
+        """
+        records, part_mids = self.stochastic_field(parts, first_mid)
+        result = write_deck(records, path, **deck_options)
+        result['part_mids'] = part_mids
+        return result
+
+
+def monte_carlo(n, f_c=35, dmax=19, delta_f=8., rho=2.4E-9, esize=200, rev=Revision.REV_2,
+                softening_rev=Revision.REV_1, num_points=0, max_strain=0.01, seed=None,
+                workers=1, chunk_size=65536, **material_options):
+    """
+    Propagate sampled concrete properties through the keyword and the driver.
+
+    Parameters:
+    -----------
+    n : int
+        Number of samples
+    f_c, dmax, delta_f, rho : float, tuple or callable
+        Distributions of compressive strength (MPa), aggregate size (mm),
+        mean minus characteristic strength (MPa) and density
+    esize : float
+        Element size (mm) of the softening parameters
+    rev, softening_rev : Revision
+        Revisions of ``batch_params.keyword_values``
+    num_points : int
+        Points of the uniaxial compression driver per sample; 0 skips the driver
+    max_strain : float
+        Maximum compression strain of the driver
+    seed : int, optional
+        Seed of the random streams
+    workers : int, optional
+        Worker processes; None uses the CPU count, 1 runs in process
+    chunk_size : int
+        Samples evaluated per vectorized chunk
+    **material_options
+        Further ``MatCSCM`` constructor arguments shared by all samples
+
+    Returns:
+    --------
+    MonteCarloResult
+        Samples, keyword values and driver outputs
+    """
+    spec = {
+        'distributions': {'f_c': f_c, 'dmax': dmax, 'delta_f': delta_f, 'rho': rho},
+        'esize': esize, 'rev': rev, 'softening_rev': softening_rev,
+        'num_points': num_points, 'max_strain': max_strain, 'material': material_options,
+    }
+    chunks = [(start, min(start + chunk_size, n)) for start in range(0, n, chunk_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(chunks))
+    workers = os.cpu_count() if workers is None else workers
+
+    if workers <= 1 or len(chunks) <= 1:
+        parts = [_evaluate(chunk_seed, stop - start, spec)
+                 for chunk_seed, (start, stop) in zip(seeds, chunks)]
+        inputs = np.vstack([part[0] for part in parts]) if parts else np.empty((0, len(INPUTS)))
+        values = np.vstack([part[1] for part in parts]) if parts else np.empty((0, N_FIELDS))
+        outputs = np.vstack([part[2] for part in parts]) if num_points and parts else None
+    else:
+        blocks = {name: shared_memory.SharedMemory(create=True, size=max(8, 8 * int(np.prod(shape))))
+                  for name, shape in _shapes(n, num_points).items()}
+        try:
+            with ProcessPoolExecutor(min(workers, len(chunks)), initializer=_init_worker,
+                                     initargs=(spec, {name: block.name for name, block in blocks.items()}, n)) as executor:
+                futures = [executor.submit(_run_chunk, chunk_seed, start, stop)
+                           for chunk_seed, (start, stop) in zip(seeds, chunks)]
+                for future in futures:
+                    future.result()
+            arrays = {name: np.ndarray(shape, buffer=blocks[name].buf).copy()
+                      for name, shape in _shapes(n, num_points).items()}
+        finally:
+            for block in blocks.values():
+                block.close()
+                block.unlink()
+        inputs, values, outputs = arrays['inputs'], arrays['values'], arrays.get('outputs')
+
+    return MonteCarloResult(
+        {name: inputs[:, i] for i, name in enumerate(INPUTS)}, values,
+        {} if outputs is None else {name: outputs[:, i] for i, name in enumerate(OUTPUTS)})
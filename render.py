@@ -0,0 +1,324 @@
+"""
+Headless, parallel rendering of calibration plots.
+
+The drawing code of ``plotcurves`` (``plot``, ``plotSingleCurve``,
+``plotTwoCurves``) and of ``cscm_plots.plot_cscm_compression`` lives here as
+functions that draw onto a given ``Axes``; the interactive functions wrap
+them in pyplot figures. For batch output the same functions draw onto
+object-oriented Agg figures without touching the pyplot state machine:
+
+- a ``Renderer`` keeps one figure per size and clears it between plots
+- ``render_batch`` exports plot jobs as PNG/SVG/PDF, spread over worker
+  processes that each reuse their own renderer
+- ``render_compression_family`` computes the uniaxial compression curves of
+  a whole f_c family with the vectorized driver and renders one plot each
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+DEFAULT_FORMATS = ('png',)
+
+
+def draw_curves(ax, stile, *curves):
+    """
+    Draw datasets with a plot style from ``plotcurves.plotStile``.
+
+    Parameters:
+    -----------
+    ax : matplotlib.axes.Axes
+        Target axes
+    stile : dict
+        Plot style
+    *curves : dict
+        Datasets with 'array' ([x, y]), 'lable', 'color', 'linestyle', 'linewidth'
+    """
+    for dataset in curves:
+        ax.plot(
+            dataset['array'][0],
+            dataset['array'][1],
+            label=dataset['lable'],
+            color=dataset['color'],
+            linestyle=dataset['linestyle'],
+            linewidth=dataset['linewidth'],
+        )
+    ax.tick_params(labelsize=stile['fontsize'])
+    ax.legend(loc=stile['legendLocation'], prop={'size': stile['fontsize']})
+    ax.set_xlabel(stile['xLabel'], fontsize=stile['fontsize'] + 2)
+    ax.set_ylabel(stile['yLabel'], fontsize=stile['fontsize'] + 2)
+    ax.set_title(stile['title'], fontsize=stile['fontsize'] + 4)
+    ax.grid(True)
+    ax.set_xscale(stile['xScale'])
+    ax.set_yscale(stile['yScale'])
+    # scope for axis: if no scope in input then use auto scope
+    if 'xLimBottom' in stile and 'xLimTop' in stile:
+        ax.set_xlim(stile['xLimBottom'], stile['xLimTop'])
+    if 'yLimBottom' in stile and 'yLimTop' in stile:
+        ax.set_ylim(stile['yLimBottom'], stile['yLimTop'])
+
+
+def draw_single_curve(ax, x, y, title, xLabel, yLabel, fontsize=18):
+    """Draw one curve with the layout of ``plotcurves.plotSingleCurve``."""
+    ax.grid(True)
+    ax.plot(x, y, color='blue', linewidth=2.0)
+    ax.set_xlabel(xLabel, fontsize=fontsize + 2)
+    ax.set_ylabel(yLabel, fontsize=fontsize + 2)
+    ax.set_title(title, fontsize=fontsize + 4)
+
+
+def draw_two_curves(ax, x, y1, y2, title='', label1='rev 1', label2='rev 2', xLabel='Ox', yLabel='Oy',
+                    fontsize=18):
+    """Draw two curves with the layout of ``plotcurves.plotTwoCurves``."""
+    ax.plot(x, y1, label=label1, color='blue', linewidth=2.0)
+    ax.plot(x, y2, label=label2, color='red', linewidth=2.0)
+    ax.grid(True)
+
+    # Axes through the origin
+    ax.spines['right'].set_color('none')
+    ax.spines['top'].set_color('none')
+    ax.xaxis.set_ticks_position('bottom')
+    ax.spines['bottom'].set_position(('data', 0))
+    ax.yaxis.set_ticks_position('left')
+    ax.spines['left'].set_position(('data', 0))
+    ax.tick_params(labelsize=fontsize)
+
+    ax.legend(loc='upper left', prop={'size': fontsize + 2})
+    ax.set_xlabel(xLabel, fontsize=fontsize + 2)
+    ax.set_ylabel(yLabel, fontsize=fontsize + 2)
+    ax.set_title(title, fontsize=fontsize + 4)
+
+
+def draw_cscm_compression(ax, strains, stresses, f_c, dmax, max_strain):
+    """Draw a uniaxial compression response with its peak, as ``plot_cscm_compression``."""
+    ax.plot(strains * 100, stresses, 'b-', linewidth=2,
+            label=f'CSCM Model (f\'c = {f_c} MPa)')
+    ax.set_xlabel('Compression Strain, %')
+    ax.set_ylabel('Compression Stress, MPa')
+    ax.set_title(f'CSCM Model under Uniaxial Compression\n(f\'c = {f_c} MPa, d_max = {dmax} mm)')
+    ax.grid(True, alpha=0.3)
+
+    # Add key points
+    peak_stress = np.max(stresses)
+    peak_strain = strains[np.argmax(stresses)] * 100
+    ax.plot(peak_strain, peak_stress, 'ro', markersize=8,
+            label=f'Peak: {peak_stress:.1f} MPa at {peak_strain:.3f}%')
+
+    ax.set_xlim(0, max_strain * 100)
+    ax.set_ylim(0, peak_stress * 1.1)
+    ax.legend()
+
+
+# Plot kinds of render jobs; names keep jobs small when sent to workers
+DRAW = {
+    'curves': draw_curves,
+    'single_curve': draw_single_curve,
+    'two_curves': draw_two_curves,
+    'cscm_compression': draw_cscm_compression,
+}
+
+# Figure sizes (inches) of the plot kinds, as in the interactive functions
+FIGURE_SIZES = {
+    'curves': (15, 10),
+    'single_curve': (15, 10),
+    'two_curves': (15, 10),
+    'cscm_compression': (10, 6),
+}
+
+# Fixed subplot margins of the plot kinds (tight layout plus padding); a
+# tight layout per plot costs as much as drawing it
+FIGURE_MARGINS = {
+    'curves': {'left': 0.08, 'right': 0.98, 'bottom': 0.09, 'top': 0.94},
+    'single_curve': {'left': 0.08, 'right': 0.98, 'bottom': 0.09, 'top': 0.94},
+    'two_curves': {'left': 0.07, 'right': 0.98, 'bottom': 0.06, 'top': 0.94},
+    'cscm_compression': {'left': 0.08, 'right': 0.97, 'bottom': 0.1, 'top': 0.89},
+}
+
+
+class Renderer:
+    """
+    Off-screen Agg renderer that reuses one figure per figure size.
+
+    Consecutive plots of the same kind also reuse the axes, which are only
+    cleared; other plots get fresh axes, since drawing may move spines.
+
+    Parameters:
+    -----------
+    dpi : int
+        Resolution of raster output
+    png_compression : int
+        zlib level of PNG output (0-9); encoding dominates at the default level 6
+    """
+
+    def __init__(self, dpi=100, png_compression=1):
+        self.dpi = dpi
+        self.png_compression = png_compression
+        self._figures = {}
+
+    def figure(self, size, kind=None):
+        """
+        Figure of ``size`` inches with cleared axes.
+
+        Parameters:
+        -----------
+        size : tuple
+            Figure size in inches
+        kind : str, optional
+            Plot kind; the axes of a previous plot of the same kind are reused
+
+        Returns:
+        --------
+        tuple
+            (matplotlib.figure.Figure, matplotlib.axes.Axes)
+        """
+        size = tuple(size)
+        figure, ax, previous = self._figures.get(size, (None, None, None))
+        if figure is None:
+            figure = Figure(figsize=size, dpi=self.dpi)
+            FigureCanvasAgg(figure)
+        if kind is not None and kind == previous:
+            ax.clear()
+        else:
+            figure.clear()
+            ax = figure.add_subplot(111)
+        self._figures[size] = (figure, ax, kind if isinstance(kind, str) else None)
+        return figure, ax
+
+    def render(self, kind, args, path, formats=DEFAULT_FORMATS, size=None, **options):
+        """
+        Draw one plot and save it in every format.
+
+        Parameters:
+        -----------
+        kind : str or callable
+            Name in ``DRAW`` or a function ``draw(ax, *args, **options)``
+        args : tuple
+            Positional arguments of the draw function after the axes
+        path : str
+            Output path without extension
+        formats : sequence of str
+            File extensions, e.g. 'png', 'svg', 'pdf'
+        size : tuple, optional
+            Figure size in inches; defaults to ``FIGURE_SIZES[kind]`` or (10, 6)
+
+        Returns:
+        --------
+        list of str
+            Written files
+        """
+        named = isinstance(kind, str)
+        draw = DRAW[kind] if named else kind
+        if size is None:
+            size = FIGURE_SIZES.get(kind, (10, 6)) if named else (10, 6)
+        figure, ax = self.figure(size, kind if named else None)
+        draw(ax, *args, **options)
+        if named and kind in FIGURE_MARGINS:
+            figure.subplots_adjust(**FIGURE_MARGINS[kind])
+        else:
+            figure.tight_layout()
+        files = []
+        for extension in formats:
+            name = '{0}.{1}'.format(path, extension)
+            extra = {'pil_kwargs': {'compress_level': self.png_compression}} if extension == 'png' else {}
+            figure.savefig(name, format=extension, **extra)
+            files.append(name)
+        return files
+
+
+# Renderer of the current worker process
+_worker = {}
+
+
+def _init_worker(dpi):
+    _worker['renderer'] = Renderer(dpi)
+
+
+def _render_jobs(jobs, formats):
+    renderer = _worker.get('renderer') or Renderer()
+    return [renderer.render(kind, args, path, formats, **options) for kind, args, path, options in jobs]
+
+
+def render_batch(jobs, directory='.', formats=DEFAULT_FORMATS, workers=None, dpi=100, chunk_size=8):
+    """
+    Render plot jobs off-screen, optionally in parallel.
+
+    Parameters:
+    -----------
+    jobs : iterable of tuple
+        (kind, args, name) or (kind, args, name, options): ``Renderer.render``
+        arguments with the file name (without extension) relative to ``directory``
+    directory : str
+        Output folder, created if missing
+    formats : sequence of str
+        File extensions
+    workers : int, optional
+        Worker processes; None uses the CPU count, 1 renders in process
+    dpi : int
+        Resolution of raster output
+    chunk_size : int
+        Jobs per task sent to a worker
+
+    Returns:
+    --------
+    list of str
+        Written files in job order
+    """
+    os.makedirs(directory, exist_ok=True)
+    jobs = [(job[0], tuple(job[1]), os.path.join(directory, job[2]), job[3] if len(job) > 3 else {})
+            for job in jobs]
+    chunks = [jobs[start:start + chunk_size] for start in range(0, len(jobs), chunk_size)]
+    workers = os.cpu_count() if workers is None else workers
+    if workers <= 1 or len(chunks) <= 1:
+        _init_worker(dpi)
+        results = [_render_jobs(chunk, formats) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(min(workers, len(chunks)), initializer=_init_worker,
+                                 initargs=(dpi,)) as executor:
+            results = list(executor.map(_render_jobs, chunks, [formats] * len(chunks)))
+    return [name for chunk in results for files in chunk for name in files]
+
+
+def render_compression_family(f_c, dmax=19, directory='.', formats=DEFAULT_FORMATS, workers=None,
+                              max_strain=0.01, num_points=1000, dpi=100):
+    """
+    Render the uniaxial compression plots of a family of concrete grades.
+
+    Curves are computed together with the vectorized driver and drawn like
+    ``MatCSCM.Evaluate.plot_cscm_compression``.
+
+    Parameters:
+    -----------
+    f_c : array_like
+        Compressive strengths (MPa)
+    dmax : float
+        Maximum aggregate size (mm)
+    directory : str
+        Output folder
+    formats : sequence of str
+        File extensions
+    workers : int, optional
+        Worker processes; None uses the CPU count
+    max_strain : float
+        Maximum compression strain
+    num_points : int
+        Number of calculation points
+    dpi : int
+        Resolution of raster output
+
+    Returns:
+    --------
+    list of str
+        Written files, named ``compression_fc<f_c>``
+    """
+    from batch_driver import uniaxial_compression
+    from batch_params import keyword_values
+
+    f_c = np.atleast_1d(np.asarray(f_c, dtype=float))
+    response = uniaxial_compression(f_c, keyword_values(f_c, dmax), max_strain, num_points, curves=True)
+    jobs = [('cscm_compression', (response['strains'], stresses, '{0:g}'.format(strength), dmax, max_strain),
+             'compression_fc{0:g}'.format(strength))
+            for strength, stresses in zip(f_c, response['stresses'])]
+    return render_batch(jobs, directory, formats, workers, dpi)
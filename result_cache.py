@@ -0,0 +1,437 @@
+"""
+Persistent content-addressed cache of expensive results.
+
+Results of the material-point driver and of the CEB-FIP curve routines are
+stored on disk under a stable hash of everything they depend on: the model
+version (source of the model modules), the routine, the material state
+(all scalar ``MatCSCM`` attributes, i.e. the constructor arguments and the
+element size) and the load path definition. Every entry is a directory of
+``.npy`` files that are loaded memory mapped, so repeated calibration runs
+and notebook sessions read results instead of recomputing them.
+
+The total cache size is bounded; least recently used entries are evicted
+first. Hit/miss statistics are collected per ``ResultCache`` instance.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from enum import Enum
+from functools import lru_cache
+
+import numpy as np
+
+# Bump when the on-disk layout or the key scheme changes
+CACHE_FORMAT = 1
+
+# Sources whose changes invalidate cached results
+MODEL_SOURCES = ('MatCSCM.py', 'CEB.py', 'theory.py', 'batch_params.py', 'batch_driver.py')
+
+DEFAULT_MAX_BYTES = 1 << 30
+
+# CEB-FIP properties of a material that enter its cache keys
+CEB_FINGERPRINT = ('f_c', 'd_max', 'E', 'G', 'K', 'nu', 'f_t', 'G_fc', 'G_ft', 'G_fs')
+
+
+@lru_cache(maxsize=None)
+def source_version(*names):
+    """
+    Hash of source files of this folder and the cache format.
+
+    Parameters:
+    -----------
+    *names : str
+        File names relative to the folder of this module
+
+    Returns:
+    --------
+    str
+        Hex digest that changes whenever one of the files changes
+    """
+    digest = hashlib.sha256(str(CACHE_FORMAT).encode())
+    folder = os.path.dirname(os.path.abspath(__file__))
+    for name in names:
+        with open(os.path.join(folder, name), 'rb') as source:
+            digest.update(source.read())
+    return digest.hexdigest()[:16]
+
+
+def model_version():
+    """
+    Hash of the model sources (``MODEL_SOURCES``) and the cache format.
+
+    Returns:
+    --------
+    str
+        Hex digest that changes whenever the model code changes
+    """
+    return source_version(*MODEL_SOURCES)
+
+
+def material_state(mat):
+    """
+    Scalar attributes of a MatCSCM object that determine its results.
+
+    The CEB-FIP properties are included as well, so that results of
+    assigned ``ceb_data`` are not confused with those of the default data.
+
+    Parameters:
+    -----------
+    mat : MatCSCM
+        Material object
+
+    Returns:
+    --------
+    dict
+        Attribute name -> value for the constructor arguments and element
+        size, and 'ceb_data' -> the ``CEB_FINGERPRINT`` properties
+    """
+    state = {name: value for name, value in sorted(vars(mat).items())
+             if isinstance(value, (bool, int, float, str, np.number))}
+    ceb = getattr(mat, 'ceb_data', None)
+    if ceb is not None:
+        state['ceb_data'] = {name: float(getattr(ceb, name)) for name in CEB_FINGERPRINT
+                             if getattr(ceb, name, None) is not None}
+    return state
+
+
+def _canonical(value):
+    """JSON serializable form of a key component with a stable representation."""
+    if isinstance(value, Enum):
+        return '{0}.{1}'.format(type(value).__name__, value.name)
+    if isinstance(value, dict):
+        return {str(name): _canonical(item) for name, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(item) for item in value]
+    if isinstance(value, np.ndarray):
+        value = np.ascontiguousarray(value)
+        return {'dtype': value.dtype.str, 'shape': list(value.shape),
+                'sha256': hashlib.sha256(value.tobytes()).hexdigest()}
+    if isinstance(value, (bool, np.bool_)):
+        return bool(value)
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    if isinstance(value, (float, np.floating)):
+        # repr round-trips, so equal floats give equal keys
+        return repr(float(value))
+    if value is None or isinstance(value, str):
+        return value
+    raise TypeError(f"Unsupported cache key component: {type(value).__name__}")
+
+
+class ResultCache:
+    """
+    On-disk cache of named array results.
+
+    Parameters:
+    -----------
+    directory : str, optional
+        Cache folder; defaults to ``$CSCM_CACHE_DIR`` or ``~/.cache/cscm``
+    max_bytes : int
+        Size limit of all entries; least recently used entries are evicted
+    mmap : bool
+        Load cached arrays memory mapped (read-only)
+    """
+
+    def __init__(self, directory=None, max_bytes=DEFAULT_MAX_BYTES, mmap=True):
+        if directory is None:
+            directory = os.environ.get('CSCM_CACHE_DIR',
+                                       os.path.join(os.path.expanduser('~'), '.cache', 'cscm'))
+        self.directory = str(directory)
+        self.max_bytes = max_bytes
+        self.mmap = mmap
+        os.makedirs(self.directory, exist_ok=True)
+        self._bytes = None
+        self.reset_stats()
+
+    def reset_stats(self):
+        """Clear hit, miss, write and eviction counters."""
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+
+    def key(self, *parts):
+        """
+        Stable hash of key components.
+
+        Parameters:
+        -----------
+        *parts
+            Scalars, strings, enums, arrays and nested lists/dicts of them
+
+        Returns:
+        --------
+        str
+            Hex digest
+        """
+        text = json.dumps(_canonical(list(parts)), sort_keys=True, separators=(',', ':'))
+        return hashlib.sha256(text.encode()).hexdigest()
+
+    def _entry(self, key):
+        return os.path.join(self.directory, key)
+
+    def _load(self, path):
+        if self.mmap:
+            try:
+                return np.load(path, mmap_mode='r')
+            except ValueError:
+                # Empty arrays cannot be memory mapped
+                pass
+        return np.load(path)
+
+    def get(self, key):
+        """
+        Cached arrays of ``key``.
+
+        Returns:
+        --------
+        dict or None
+            Name -> array, or None on a miss
+        """
+        entry = self._entry(key)
+        try:
+            names = sorted(name for name in os.listdir(entry) if name.endswith('.npy'))
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        arrays = {name[:-len('.npy')]: self._load(os.path.join(entry, name)) for name in names}
+        os.utime(entry)  # mark as recently used
+        self.hits += 1
+        return arrays
+
+    def put(self, key, arrays):
+        """
+        Store named arrays under ``key``.
+
+        Parameters:
+        -----------
+        key : str
+            Entry hash from ``key``
+        arrays : dict
+            Name -> array; names must be valid file names
+
+        Returns:
+        --------
+        dict
+            The stored arrays
+        """
+        entry = self._entry(key)
+        staging = tempfile.mkdtemp(prefix='.tmp-', dir=self.directory)
+        size = 0
+        try:
+            for name, array in arrays.items():
+                if not name.isidentifier():
+                    raise ValueError(f"Invalid result name: {name!r}")
+                path = os.path.join(staging, name + '.npy')
+                np.save(path, np.asarray(array))
+                size += os.path.getsize(path)
+            try:
+                os.rename(staging, entry)
+            except OSError:
+                # Another process stored the same entry first
+                shutil.rmtree(staging, ignore_errors=True)
+                return arrays
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        self.writes += 1
+        if self._bytes is not None:
+            self._bytes += size
+        if self.size() > self.max_bytes:
+            self.evict()
+        return arrays
+
+    def get_or_compute(self, key, compute):
+        """
+        Cached arrays of ``key``, computed and stored on a miss.
+
+        Parameters:
+        -----------
+        key : str
+            Entry hash from ``key``
+        compute : callable
+            Function without arguments returning a dict of named arrays
+
+        Returns:
+        --------
+        dict
+            Name -> array
+        """
+        arrays = self.get(key)
+        if arrays is None:
+            arrays = self.put(key, compute())
+        return arrays
+
+    def _entries(self):
+        """(last use, size, path) of all entries."""
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.startswith('.'):
+                continue
+            entry = os.path.join(self.directory, name)
+            try:
+                size = sum(item.stat().st_size for item in os.scandir(entry))
+                entries.append((os.stat(entry).st_mtime, size, entry))
+            except (FileNotFoundError, NotADirectoryError):
+                continue
+        return entries
+
+    def size(self):
+        """Total size of all entries in bytes."""
+        if self._bytes is None:
+            self._bytes = sum(size for mtime, size, entry in self._entries())
+        return self._bytes
+
+    def __len__(self):
+        return len(self._entries())
+
+    def evict(self, max_bytes=None):
+        """
+        Remove least recently used entries until the cache fits ``max_bytes``.
+
+        Parameters:
+        -----------
+        max_bytes : int, optional
+            Size limit; defaults to the limit of the cache
+
+        Returns:
+        --------
+        int
+            Number of removed entries
+        """
+        if max_bytes is None:
+            max_bytes = self.max_bytes
+        entries = sorted(self._entries())
+        total = sum(size for mtime, size, entry in entries)
+        removed = 0
+        for mtime, size, entry in entries:
+            if total <= max_bytes:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+            removed += 1
+        self._bytes = total
+        self.evictions += removed
+        return removed
+
+    def clear(self):
+        """Remove all entries."""
+        return self.evict(0)
+
+    def stats(self):
+        """
+        Cache statistics.
+
+        Returns:
+        --------
+        dict
+            'hits', 'misses', 'writes', 'evictions', 'hit_rate',
+            'entries' and 'bytes'
+        """
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'writes': self.writes,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'entries': len(self),
+            'bytes': self.size(),
+        }
+
+    def report(self):
+        """
+        Human readable cache statistics.
+
+        Returns:
+        --------
+        str
+            Formatted text report
+        """
+        stats = self.stats()
+        text = 'Cache: {0}\n'.format(self.directory)
+        text += 'Entries: {0} ({1:.1f} MB of {2:.1f} MB)\n'.format(
+            stats['entries'], stats['bytes'] / 2**20, self.max_bytes / 2**20)
+        text += 'Hits: {0}  Misses: {1}  Hit rate: {2:.1%}\n'.format(
+            stats['hits'], stats['misses'], stats['hit_rate'])
+        text += 'Writes: {0}  Evictions: {1}\n'.format(stats['writes'], stats['evictions'])
+        return text
+
+
+_default_cache = None
+
+
+def default_cache():
+    """Shared ResultCache in the default directory."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ResultCache()
+    return _default_cache
+
+
+def compression_response(mat, max_strain=0.01, num_points=1000, dt=1e-5, cache=None):
+    """
+    Cached ``MatCSCM.Evaluate.uniaxial_compression_response``.
+
+    Parameters:
+    -----------
+    mat : MatCSCM
+        Material object
+    max_strain : float
+        Maximum compression strain (positive value)
+    num_points : int
+        Number of calculation points
+    dt : float
+        Time step for strain rate calculation
+    cache : ResultCache, optional
+        Cache to use; defaults to ``default_cache()``
+
+    Returns:
+    --------
+    tuple
+        (strains, stresses) - arrays of strains and stresses
+    """
+    cache = default_cache() if cache is None else cache
+    path = {'max_strain': max_strain, 'num_points': num_points, 'dt': dt}
+    key = cache.key('uniaxial_compression_response', model_version(), material_state(mat), path)
+
+    def compute():
+        strains, stresses = mat.evaluate.uniaxial_compression_response(**path)
+        return {'strains': strains, 'stresses': stresses}
+
+    result = cache.get_or_compute(key, compute)
+    return result['strains'], result['stresses']
+
+
+def ceb_curves(f_c=40, d_max=16.0, rho=2.4E-9, curve_array_size=100, delta_f=8., cache=None):
+    """
+    Cached CEB-FIP stress-strain and crack opening curves.
+
+    Parameters:
+    -----------
+    f_c, d_max, rho, curve_array_size, delta_f
+        Arguments of ``CEB.CEBClass``
+    cache : ResultCache, optional
+        Cache to use; defaults to ``default_cache()``
+
+    Returns:
+    --------
+    dict
+        'compression_curve', 'tension_curve', 'crack_opening_curve'
+    """
+    cache = default_cache() if cache is None else cache
+    arguments = {'f_c': f_c, 'd_max': d_max, 'rho': rho,
+                 'curve_array_size': curve_array_size, 'delta_f': delta_f}
+    key = cache.key('ceb_curves', model_version(), arguments)
+
+    def compute():
+        from CEB import CEBClass
+        ceb = CEBClass(**arguments)
+        return {'compression_curve': ceb.compression_curve,
+                'tension_curve': ceb.tension_curve,
+                'crack_opening_curve': ceb.crack_opening_curve}
+
+    return cache.get_or_compute(key, compute)
@@ -0,0 +1,270 @@
+"""
+Global sensitivity of the uniaxial compression response to *MAT_CSCM parameters.
+
+Keyword parameters (R, X0, W, D1, D2, B, GFC, ...) are varied within bounds
+around the parameter set of a concrete grade and the vectorized driver
+(``batch_driver``) is evaluated for the sample designs:
+
+- Morris elementary effects (mu, mu*, sigma) from one-at-a-time trajectories
+- Sobol first order and total indices from Saltelli's A/B/AB_i design with
+  the Saltelli (2010) and Jansen estimators
+
+Designs are drawn so that a larger design starts with the rows of a smaller
+one (same seed). Evaluations are split into fixed row blocks per design
+matrix, keyed by their content and stored in a ``result_cache.ResultCache``;
+extending a design only evaluates the new blocks. Blocks run in parallel
+worker processes.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from batch_driver import DRIVER_FIELDS, OUTPUTS, uniaxial_compression
+from batch_params import keyword_values
+from cscm_keyword import FIELD_INDEX
+from result_cache import default_cache, model_version
+
+DEFAULT_PARAMETERS = ('G', 'K', 'R', 'X0', 'W', 'D1', 'D2', 'B', 'GFC')
+
+# Driver outputs analysed by default: peak stress, softening and damage
+DEFAULT_OUTPUTS = ('peak_stress', 'softening_slope', 'damage')
+
+# The default grades stay elastic and undamaged up to about 2 % strain;
+# softening and damage develop beyond 4 %
+DEFAULT_MAX_STRAIN = 0.1
+
+
+def _driver_outputs(f_c, base, columns, parameters, max_strain, num_points):
+    """Driver outputs of parameter rows inserted into the base keyword values."""
+    values = np.tile(base, (len(parameters), 1))
+    values[:, columns] = parameters
+    response = uniaxial_compression(f_c, values, max_strain, num_points)
+    return {name: response[name] for name in OUTPUTS}
+
+
+class SensitivityAnalysis:
+    """
+    Sensitivity analysis of driver outputs around a concrete grade.
+
+    Parameters:
+    -----------
+    names : sequence of str
+        Keyword fields that are varied, a subset of ``batch_driver.DRIVER_FIELDS``
+    f_c : float
+        Compressive strength (MPa) of the base material
+    dmax : float
+        Maximum aggregate size (mm) of the base material
+    spread : float
+        Relative half width of the default bounds around the base values
+    bounds : dict, optional
+        Field name -> (low, high) overriding the default bounds
+    max_strain : float
+        Maximum compression strain of the driver
+    num_points : int
+        Points of the driver curve
+    cache : ResultCache or bool, optional
+        Cache of evaluated blocks; None uses ``result_cache.default_cache()``,
+        False disables caching
+    workers : int
+        Worker processes; 1 evaluates in process
+    block_size : int
+        Rows per evaluated and cached block
+    """
+
+    def __init__(self, names=DEFAULT_PARAMETERS, f_c=35, dmax=19, spread=0.2, bounds=None,
+                 max_strain=DEFAULT_MAX_STRAIN, num_points=200, cache=None, workers=1, block_size=1024):
+        self.names = tuple(names)
+        ignored = [name for name in self.names if name not in DRIVER_FIELDS]
+        if ignored:
+            raise ValueError('fields {0} are not used by the driver; choose from {1}'
+                             .format(', '.join(ignored), ', '.join(DRIVER_FIELDS)))
+        self.f_c = f_c
+        self.base = keyword_values(f_c, dmax)[0]
+        self.columns = [FIELD_INDEX[name] for name in self.names]
+        center = self.base[self.columns]
+        self.bounds = np.column_stack((center * (1 - spread), center * (1 + spread)))
+        self.bounds.sort(axis=1)
+        for name, (low, high) in (bounds or {}).items():
+            self.bounds[self.names.index(name)] = (low, high)
+        self.max_strain = max_strain
+        self.num_points = num_points
+        if cache is None:
+            cache = default_cache()
+        self.cache = cache if cache is not False else None
+        self.workers = os.cpu_count() if workers is None else workers
+        self.block_size = block_size
+
+    def scale(self, unit):
+        """Map points of the unit cube to parameter values."""
+        low, high = self.bounds[:, 0], self.bounds[:, 1]
+        return low + np.asarray(unit) * (high - low)
+
+    def evaluate(self, parameters):
+        """
+        Driver outputs of parameter rows.
+
+        Parameters:
+        -----------
+        parameters : numpy.ndarray
+            Values of the varied fields, shape (n, len(names))
+
+        Returns:
+        --------
+        dict
+            Output name (``batch_driver.OUTPUTS``) -> array of shape (n,)
+        """
+        parameters = np.atleast_2d(np.asarray(parameters, dtype=float))
+        blocks = [(start, min(start + self.block_size, len(parameters)))
+                  for start in range(0, len(parameters), self.block_size)]
+        arguments = (self.f_c, self.base, self.columns)
+        settings = (self.max_strain, self.num_points)
+        results = [None] * len(blocks)
+        keys = [None] * len(blocks)
+        if self.cache is not None:
+            for i, (start, stop) in enumerate(blocks):
+                keys[i] = self.cache.key('sensitivity', model_version(), self.f_c, self.base,
+                                         self.names, parameters[start:stop], *settings)
+                results[i] = self.cache.get(keys[i])
+        missing = [i for i, result in enumerate(results) if result is None]
+
+        jobs = [arguments + (parameters[slice(*blocks[i])],) + settings for i in missing]
+        if self.workers > 1 and len(jobs) > 1:
+            with ProcessPoolExecutor(min(self.workers, len(jobs))) as executor:
+                computed = list(executor.map(_driver_outputs, *zip(*jobs)))
+        else:
+            computed = [_driver_outputs(*job) for job in jobs]
+        for i, result in zip(missing, computed):
+            results[i] = self.cache.put(keys[i], result) if self.cache is not None else result
+
+        return {name: np.concatenate([np.asarray(result[name]) for result in results])
+                if results else np.empty(0) for name in OUTPUTS}
+
+    def _evaluate_matrices(self, matrices):
+        """Evaluate every design matrix separately so that its blocks stay aligned."""
+        return [self.evaluate(self.scale(matrix)) for matrix in matrices]
+
+    def sobol(self, n, seed=0, outputs=DEFAULT_OUTPUTS):
+        """
+        Sobol first order and total indices.
+
+        Parameters:
+        -----------
+        n : int
+            Base sample size; the design costs n * (len(names) + 2) evaluations
+        seed : int
+            Seed of the design; designs with the same seed share their first rows
+        outputs : sequence of str
+            Driver outputs to analyse
+
+        Returns:
+        --------
+        dict
+            Output name -> {'S1': array, 'ST': array} over ``names``; NaN for
+            outputs that are constant over the design
+        """
+        k = len(self.names)
+        AB = np.random.default_rng(seed).random((n, 2 * k))
+        A, B = AB[:, :k], AB[:, k:]
+        matrices = [A, B]
+        for i in range(k):
+            AB_i = A.copy()
+            AB_i[:, i] = B[:, i]
+            matrices.append(AB_i)
+        results = self._evaluate_matrices(matrices)
+
+        indices = {}
+        for name in outputs:
+            # Centering reduces the estimator variance for outputs with a large mean
+            mean = np.mean(np.concatenate((results[0][name], results[1][name])))
+            f_A, f_B = results[0][name] - mean, results[1][name] - mean
+            variance = np.var(np.concatenate((f_A, f_B)))
+            S1 = np.full(k, np.nan)
+            ST = np.full(k, np.nan)
+            if variance > 0:
+                for i in range(k):
+                    f_AB = results[2 + i][name] - mean
+                    S1[i] = np.mean(f_B * (f_AB - f_A)) / variance
+                    ST[i] = 0.5 * np.mean((f_A - f_AB)**2) / variance
+            indices[name] = {'S1': S1, 'ST': ST}
+        return indices
+
+    def morris(self, trajectories, levels=4, seed=0, outputs=DEFAULT_OUTPUTS):
+        """
+        Morris elementary effects.
+
+        Parameters:
+        -----------
+        trajectories : int
+            Number of one-at-a-time trajectories of len(names) + 1 points
+        levels : int
+            Number of grid levels per parameter
+        seed : int
+            Seed of the design; trajectory ``i`` only depends on seed and ``i``
+        outputs : sequence of str
+            Driver outputs to analyse
+
+        Returns:
+        --------
+        dict
+            Output name -> {'mu': array, 'mu_star': array, 'sigma': array}
+            of elementary effects in units of the parameter range; NaN for
+            outputs that are constant over the design
+        """
+        k = len(self.names)
+        delta = levels / (2 * (levels - 1))
+        grid = np.arange(levels) / (levels - 1)
+        points = np.empty((trajectories, k + 1, k))
+        steps = np.empty((trajectories, k))
+        order = np.empty((trajectories, k), dtype=int)
+        for t, child in enumerate(np.random.SeedSequence(seed).spawn(trajectories)):
+            rng = np.random.default_rng(child)
+            x = rng.choice(grid, k)
+            order[t] = rng.permutation(k)
+            points[t, 0] = x
+            for j, i in enumerate(order[t]):
+                step = delta if x[i] + delta <= 1 else -delta
+                x = x.copy()
+                x[i] += step
+                steps[t, i] = step
+                points[t, j + 1] = x
+        result = self.evaluate(self.scale(points.reshape(-1, k)))
+
+        indices = {}
+        for name in outputs:
+            f = result[name].reshape(trajectories, k + 1)
+            effects = np.empty((trajectories, k))
+            for t in range(trajectories):
+                effects[t, order[t]] = np.diff(f[t]) / steps[t, order[t]]
+            if np.ptp(f) == 0:
+                effects[:] = np.nan
+            indices[name] = {'mu': effects.mean(axis=0),
+                             'mu_star': np.abs(effects).mean(axis=0),
+                             'sigma': effects.std(axis=0, ddof=1) if trajectories > 1
+                             else np.where(np.isnan(effects[0]), np.nan, 0.0)}
+        return indices
+
+    def report(self, indices):
+        """
+        Human readable table of sensitivity indices.
+
+        Parameters:
+        -----------
+        indices : dict
+            Result of ``sobol`` or ``morris``
+
+        Returns:
+        --------
+        str
+            Formatted text report, parameters ranked per output
+        """
+        text = ''
+        for output, measures in indices.items():
+            rank = measures['ST'] if 'ST' in measures else measures['mu_star']
+            text += '{0}\n'.format(output)
+            text += '{0:<10s}'.format('parameter') + ''.join('{0:>12s}'.format(m) for m in measures) + '\n'
+            for i in np.argsort(-rank):
+                text += '{0:<10s}'.format(self.names[i])
+                text += ''.join('{0:12.4G}'.format(values[i]) for values in measures.values()) + '\n'
+        return text
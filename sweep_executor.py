@@ -0,0 +1,242 @@
+"""
+Process-pool executor for full factorial material parameter sweeps.
+
+The grid f_c x dmax x esize x Revision is enumerated in a fixed (row-major)
+order, so row ``i`` always holds the same combination regardless of the
+number of workers. The grid is split into chunks of consecutive rows; a
+worker only receives the chunk bounds, derives the coordinates of its rows
+from the grid axes and writes keyword values (``batch_params``) and,
+optionally, uniaxial compression curves of the material-point driver
+directly into shared output arrays. Results are never pickled.
+
+Output goes to ``multiprocessing.shared_memory`` blocks that are copied
+into the returned arrays at the end, or to a ``SweepStore`` folder that
+workers open memory mapped.
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from MatCSCM import MatCSCM, Revision
+from batch_params import keyword_values
+from cscm_keyword import N_FIELDS
+from sweep_store import SWEEP_COLUMNS, SweepStore
+
+
+def sweep_grid(f_c, dmax=(19,), esize=(200,), revisions=(Revision.REV_2,)):
+    """
+    Axes of a full factorial sweep.
+
+    Parameters:
+    -----------
+    f_c, dmax, esize : sequence of float
+        Compressive strengths (MPa), aggregate sizes (mm), element sizes (mm)
+    revisions : sequence of Revision
+        Revisions of the yield surface and cap parameters
+
+    Returns:
+    --------
+    dict
+        Axis name -> 1D array; revisions are stored by their value
+    """
+    return {
+        'f_c': np.asarray(f_c, dtype=float).ravel(),
+        'dmax': np.asarray(dmax, dtype=float).ravel(),
+        'esize': np.asarray(esize, dtype=float).ravel(),
+        'revision': np.array([Revision(rev).value for rev in revisions], dtype=float),
+    }
+
+
+def grid_size(grid):
+    """Number of rows of a sweep grid."""
+    return int(np.prod([len(grid[name]) for name in SWEEP_COLUMNS]))
+
+
+def grid_coordinates(grid, start=0, stop=None):
+    """
+    Coordinates of the rows ``start:stop`` of a sweep grid.
+
+    Returns:
+    --------
+    dict
+        'f_c', 'dmax', 'esize', 'revision' -> arrays of shape (stop - start,)
+    """
+    shape = tuple(len(grid[name]) for name in SWEEP_COLUMNS)
+    stop = grid_size(grid) if stop is None else stop
+    indices = np.unravel_index(np.arange(start, stop), shape)
+    return {name: grid[name][index] for name, index in zip(SWEEP_COLUMNS, indices)}
+
+
+def _evaluate_chunk(grid, start, stop, options):
+    """Keyword values and optional driver curves of the rows ``start:stop``."""
+    coordinates = grid_coordinates(grid, start, stop)
+    values = np.empty((stop - start, N_FIELDS))
+    revisions = coordinates['revision']
+    for rev in np.unique(revisions):
+        rows = revisions == rev
+        values[rows] = keyword_values(coordinates['f_c'][rows], coordinates['dmax'][rows],
+                                      coordinates['esize'][rows], Revision(int(rev)),
+                                      options['softening_rev'], **options['material'])
+    stresses = None
+    if options['num_points']:
+        stresses = np.empty((stop - start, options['num_points']))
+        for i in range(stop - start):
+            mat = MatCSCM(f_c=coordinates['f_c'][i], dmax=coordinates['dmax'][i], **options['material'])
+            mat.esize = coordinates['esize'][i]
+            strains, stresses[i] = mat.evaluate.uniaxial_compression_response(
+                options['max_strain'], options['num_points'])
+    return coordinates, values, stresses
+
+
+# Output arrays of the current worker process, attached once per process
+_worker = {}
+
+
+def _attach_shared(names, n_rows, num_points):
+    """Attach the shared output blocks and wrap them as arrays."""
+    blocks = {name: shared_memory.SharedMemory(name=block) for name, block in names.items()}
+    arrays = {'values': np.ndarray((n_rows, N_FIELDS), buffer=blocks['values'].buf)}
+    if num_points:
+        arrays['stresses'] = np.ndarray((n_rows, num_points), buffer=blocks['stresses'].buf)
+    return blocks, arrays
+
+
+def _init_worker(grid, options, target):
+    """Pool initializer: keep the sweep definition and attach the outputs."""
+    _worker['grid'] = grid
+    _worker['options'] = options
+    if target['kind'] == 'store':
+        _worker['store'] = SweepStore.open(target['directory'], 'r+')
+    else:
+        _worker['blocks'], _worker['arrays'] = _attach_shared(
+            target['blocks'], grid_size(grid), options['num_points'])
+
+
+def _run_chunk(start, stop):
+    """Evaluate rows ``start:stop`` and write them to the worker outputs."""
+    coordinates, values, stresses = _evaluate_chunk(_worker['grid'], start, stop, _worker['options'])
+    store = _worker.get('store')
+    if store is not None:
+        if stresses is not None:
+            for i, row in enumerate(range(start, stop)):
+                store.set_curve('stress', row, stresses[i])
+        store.write(start, values, **coordinates)
+        store.flush()
+    else:
+        _worker['arrays']['values'][start:stop] = values
+        if stresses is not None:
+            _worker['arrays']['stresses'][start:stop] = stresses
+    return stop - start
+
+
+def print_progress(done, total, elapsed):
+    """Default progress callback writing one status line to stderr."""
+    rate = done / elapsed if elapsed > 0 else 0.0
+    sys.stderr.write('\r{0}/{1} rows ({2:.0%}) {3:.0f} rows/s'.format(done, total, done / total, rate))
+    if done == total:
+        sys.stderr.write('\n')
+    sys.stderr.flush()
+
+
+def run_sweep(grid, workers=None, chunk_size=None, store=None, num_points=0, max_strain=0.01,
+              softening_rev=Revision.REV_2, progress=None, **material_options):
+    """
+    Evaluate a full factorial sweep in worker processes.
+
+    Parameters:
+    -----------
+    grid : dict
+        Sweep axes from ``sweep_grid``
+    workers : int, optional
+        Number of worker processes; defaults to the CPU count, 1 runs in process
+    chunk_size : int, optional
+        Rows per task; defaults to about four tasks per worker
+    store : str, optional
+        Write results into a new ``SweepStore`` in this folder instead of
+        returning arrays
+    num_points : int
+        Points of the uniaxial compression curve computed per row with the
+        material-point driver; 0 skips the driver
+    max_strain : float
+        Maximum compression strain of the driver curves
+    softening_rev : Revision
+        Revision of B and D; REV_2 makes them depend on the element size
+    progress : callable, optional
+        Called as ``progress(done_rows, total_rows, elapsed_seconds)`` after
+        every finished chunk, e.g. ``print_progress``
+    **material_options
+        Further ``MatCSCM`` constructor arguments shared by all rows
+
+    Returns:
+    --------
+    dict or SweepStore
+        Without ``store``: grid coordinates, 'values' of shape
+        (n_rows, N_FIELDS), and 'strains'/'stresses' if ``num_points`` > 0.
+        With ``store``: the filled store opened read-only.
+    """
+    n_rows = grid_size(grid)
+    workers = os.cpu_count() if workers is None else workers
+    if chunk_size is None:
+        chunk_size = max(1, -(-n_rows // (4 * workers)))
+        if not num_points:
+            # Batch evaluation is cheap, keep tasks large enough to amortize dispatch
+            chunk_size = max(chunk_size, min(n_rows, 4096))
+    options = {'num_points': num_points, 'max_strain': max_strain,
+               'softening_rev': softening_rev, 'material': material_options}
+    chunks = [(start, min(start + chunk_size, n_rows)) for start in range(0, n_rows, chunk_size)]
+
+    blocks = {}
+    try:
+        if store is not None:
+            curves = {'stress': num_points} if num_points else None
+            SweepStore.create(store, n_rows, curves=curves)
+            target = {'kind': 'store', 'directory': str(store)}
+        else:
+            sizes = {'values': n_rows * N_FIELDS}
+            if num_points:
+                sizes['stresses'] = n_rows * num_points
+            for name, size in sizes.items():
+                blocks[name] = shared_memory.SharedMemory(create=True, size=max(1, size) * 8)
+            target = {'kind': 'shared', 'blocks': {name: block.name for name, block in blocks.items()}}
+
+        started = time.perf_counter()
+        done = 0
+        if workers <= 1 or len(chunks) <= 1:
+            _init_worker(grid, options, target)
+            try:
+                for start, stop in chunks:
+                    done += _run_chunk(start, stop)
+                    if progress is not None:
+                        progress(done, n_rows, time.perf_counter() - started)
+            finally:
+                _worker.clear()
+        else:
+            with ProcessPoolExecutor(min(workers, len(chunks)), initializer=_init_worker,
+                                     initargs=(grid, options, target)) as executor:
+                futures = [executor.submit(_run_chunk, start, stop) for start, stop in chunks]
+                for future in as_completed(futures):
+                    done += future.result()
+                    if progress is not None:
+                        progress(done, n_rows, time.perf_counter() - started)
+
+        if store is not None:
+            return SweepStore.open(store)
+        result = grid_coordinates(grid)
+        shared_blocks, arrays = _attach_shared(target['blocks'], n_rows, num_points)
+        result['values'] = arrays['values'].copy()
+        if num_points:
+            result['strains'] = np.linspace(0, max_strain, num_points)
+            result['stresses'] = arrays['stresses'].copy()
+        del arrays
+        for block in shared_blocks.values():
+            block.close()
+        return result
+    finally:
+        for block in blocks.values():
+            block.close()
+            block.unlink()
@@ -0,0 +1,306 @@
+"""
+Memory-mapped columnar store of parameter sweep results.
+
+A store is a folder of preallocated ``.npy`` files:
+- one column per keyword field (``cscm_keyword.CSCM_FIELDS``) and per sweep
+  coordinate (f_c, dmax, esize, revision by default)
+- ragged curves (e.g. stress-strain responses) as one flat data array per
+  curve name with an offset index of shape (n_rows + 1,) and the used
+  length of every row
+- a ``written`` flag per row
+
+All arrays are memory mapped, so sweeps larger than the available memory
+can be filled and queried. Offsets are fixed when the store is created,
+which lets several processes open the same store and fill disjoint row
+slices in parallel; readers get zero-copy views of the columns and curves.
+"""
+
+import json
+import os
+
+import numpy as np
+
+from cscm_keyword import CSCM_FIELDS, N_FIELDS
+
+STORE_FORMAT = 1
+META_FILE = 'sweep.json'
+
+# Sweep coordinates stored next to the keyword fields
+SWEEP_COLUMNS = ('f_c', 'dmax', 'esize', 'revision')
+
+
+def _column_file(name):
+    return 'column_{0}.npy'.format(name)
+
+
+def _curve_files(name):
+    return ('curve_{0}.npy'.format(name), 'curve_{0}_offsets.npy'.format(name),
+            'curve_{0}_lengths.npy'.format(name))
+
+
+class SweepStore:
+    """
+    Columnar sweep results backed by memory-mapped arrays.
+
+    Use ``SweepStore.create`` for a new store and ``SweepStore.open`` for an
+    existing one.
+
+    Attributes:
+    -----------
+    directory : str
+        Store folder
+    n_rows : int
+        Number of parameter sets
+    columns : dict
+        Column name -> memory-mapped array of shape (n_rows,)
+    written : numpy.memmap
+        Row flags set by ``write``
+    """
+
+    def __init__(self, directory, mode='r'):
+        self.directory = str(directory)
+        self.mode = mode
+        with open(os.path.join(self.directory, META_FILE)) as meta:
+            self.meta = json.load(meta)
+        if self.meta['format'] != STORE_FORMAT:
+            raise ValueError(f"Unsupported sweep store format: {self.meta['format']}")
+        self.n_rows = self.meta['n_rows']
+        self.columns = {name: self._load(_column_file(name)) for name in self.meta['columns']}
+        self.written = self._load('written.npy')
+        self._curves = {}
+        for name in self.meta['curves']:
+            data, offsets, lengths = (self._load(file) for file in _curve_files(name))
+            self._curves[name] = (data, np.asarray(offsets), lengths)
+
+    def _load(self, file):
+        return np.load(os.path.join(self.directory, file), mmap_mode=self.mode)
+
+    @classmethod
+    def create(cls, directory, n_rows, columns=CSCM_FIELDS + SWEEP_COLUMNS,
+               curves=None, dtype=np.float64):
+        """
+        Preallocate a new store.
+
+        Parameters:
+        -----------
+        directory : str
+            Store folder; created if missing, existing stores are overwritten
+        n_rows : int
+            Number of parameter sets
+        columns : sequence of str
+            Column names
+        curves : dict, optional
+            Curve name -> capacity per row, either an int for all rows or an
+            array of shape (n_rows,)
+        dtype : numpy.dtype
+            Data type of columns and curves
+
+        Returns:
+        --------
+        SweepStore
+            Store opened for writing
+        """
+        directory = str(directory)
+        os.makedirs(directory, exist_ok=True)
+        curves = curves or {}
+        for name in list(columns) + list(curves):
+            if not name.isidentifier():
+                raise ValueError(f"Invalid column or curve name: {name!r}")
+        open_memmap = np.lib.format.open_memmap
+        for name in columns:
+            column = open_memmap(os.path.join(directory, _column_file(name)), 'w+', dtype, (n_rows,))
+            column[:] = np.nan
+            del column
+        open_memmap(os.path.join(directory, 'written.npy'), 'w+', np.bool_, (n_rows,))
+        for name, capacity in curves.items():
+            capacity = np.broadcast_to(np.asarray(capacity, dtype=np.int64), (n_rows,))
+            offsets = np.zeros(n_rows + 1, dtype=np.int64)
+            np.cumsum(capacity, out=offsets[1:])
+            data_file, offsets_file, lengths_file = _curve_files(name)
+            open_memmap(os.path.join(directory, data_file), 'w+', dtype, (int(offsets[-1]),))
+            np.save(os.path.join(directory, offsets_file), offsets)
+            open_memmap(os.path.join(directory, lengths_file), 'w+', np.int64, (n_rows,))
+        meta = {'format': STORE_FORMAT, 'n_rows': int(n_rows),
+                'columns': list(columns), 'curves': list(curves)}
+        with open(os.path.join(directory, META_FILE), 'w') as fh:
+            json.dump(meta, fh, indent=1)
+        return cls(directory, 'r+')
+
+    @classmethod
+    def open(cls, directory, mode='r'):
+        """
+        Open an existing store.
+
+        Parameters:
+        -----------
+        directory : str
+            Store folder
+        mode : str
+            'r' for zero-copy read-only access, 'r+' to fill rows
+
+        Returns:
+        --------
+        SweepStore
+            Opened store
+        """
+        return cls(directory, mode)
+
+    def __len__(self):
+        return self.n_rows
+
+    @property
+    def curve_names(self):
+        """Names of the stored curves."""
+        return tuple(self._curves)
+
+    def write(self, start, values=None, **columns):
+        """
+        Fill rows ``start:start + n`` and mark them as written.
+
+        Parameters:
+        -----------
+        start : int
+            First row
+        values : numpy.ndarray, optional
+            Keyword field values of shape (n, N_FIELDS) ordered as ``CSCM_FIELDS``
+        **columns
+            Column name -> array of shape (n,) (or a scalar with ``values``)
+
+        Returns:
+        --------
+        int
+            Number of written rows
+        """
+        n = None
+        if values is not None:
+            values = np.atleast_2d(values)
+            if values.shape[1] != N_FIELDS:
+                raise ValueError(f"Expected {N_FIELDS} keyword fields, got {values.shape[1]}")
+            n = len(values)
+            for i, name in enumerate(CSCM_FIELDS):
+                if name in self.columns:
+                    self.columns[name][start:start + n] = values[:, i]
+        for name, column in columns.items():
+            if n is None:
+                n = len(column)
+            self.columns[name][start:start + n] = column
+        if n is None:
+            return 0
+        self.written[start:start + n] = True
+        return n
+
+    def set_curve(self, name, row, data):
+        """
+        Store the curve ``name`` of one row.
+
+        Parameters:
+        -----------
+        name : str
+            Curve name
+        row : int
+            Row index
+        data : numpy.ndarray
+            Curve points; at most the capacity given at creation
+        """
+        store, offsets, lengths = self._curves[name]
+        start, stop = offsets[row], offsets[row + 1]
+        data = np.asarray(data).ravel()
+        if len(data) > stop - start:
+            raise ValueError(f"Curve {name!r} of row {row} has {len(data)} points, capacity is {stop - start}")
+        store[start:start + len(data)] = data
+        lengths[row] = len(data)
+
+    def curve(self, name, row):
+        """
+        Zero-copy view of the curve ``name`` of one row.
+
+        Returns:
+        --------
+        numpy.ndarray
+            Stored curve points
+        """
+        store, offsets, lengths = self._curves[name]
+        start = offsets[row]
+        return store[start:start + lengths[row]]
+
+    def curves(self, name, rows):
+        """
+        Curves of several rows as a list of zero-copy views.
+
+        Parameters:
+        -----------
+        name : str
+            Curve name
+        rows : sequence of int
+            Row indices
+
+        Returns:
+        --------
+        list of numpy.ndarray
+            One view per row
+        """
+        return [self.curve(name, row) for row in rows]
+
+    def values(self, rows=slice(None)):
+        """
+        Keyword field values of the selected rows.
+
+        Parameters:
+        -----------
+        rows : slice or array of int or bool
+            Row selection
+
+        Returns:
+        --------
+        numpy.ndarray
+            Values of shape (n, N_FIELDS) ordered as ``CSCM_FIELDS``; fields
+            without a column are NaN
+        """
+        n = len(np.arange(self.n_rows)[rows])
+        values = np.full((n, N_FIELDS), np.nan)
+        for i, name in enumerate(CSCM_FIELDS):
+            if name in self.columns:
+                values[:, i] = self.columns[name][rows]
+        return values
+
+    def where(self, chunk_size=1 << 20, **conditions):
+        """
+        Rows matching all conditions.
+
+        Parameters:
+        -----------
+        chunk_size : int
+            Number of rows evaluated at once
+        **conditions
+            Column name -> value for equality or (low, high) for an
+            inclusive range; only written rows are returned
+
+        Returns:
+        --------
+        numpy.ndarray
+            Matching row indices
+        """
+        matches = []
+        for start in range(0, self.n_rows, chunk_size):
+            stop = min(start + chunk_size, self.n_rows)
+            mask = np.array(self.written[start:stop])
+            for name, condition in conditions.items():
+                column = self.columns[name][start:stop]
+                if isinstance(condition, tuple):
+                    low, high = condition
+                    mask &= (column >= low) & (column <= high)
+                else:
+                    mask &= column == condition
+            matches.append(np.flatnonzero(mask) + start)
+        return np.concatenate(matches) if matches else np.empty(0, dtype=np.int64)
+
+    def flush(self):
+        """Write changes of all memory-mapped arrays to disk."""
+        if self.mode == 'r':
+            return
+        self.written.flush()
+        for column in self.columns.values():
+            column.flush()
+        for data, offsets, lengths in self._curves.values():
+            data.flush()
+            lengths.flush()
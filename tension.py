@@ -0,0 +1,312 @@
+"""
+Vectorized uniaxial tension driver with brittle damage.
+
+For a batch of materials and element sizes the tensile response is
+
+    sigma = (1 - d) min(E eps, f_t),   tau_b = sqrt(E) eps,   r_0b = f_t / sqrt(E)
+    d = d_max / D * ((1 + D) / (1 + D exp(-C (tau_b - r_0b))) - 1)
+
+with the brittle shape parameter D of the keyword. Damage scales the
+plastic stress, which is limited by the tensile strength. As in the
+CSCM, the softening rate C is not an input. It is computed from the
+tensile fracture energy: the work up to the end of the followed softening,
+with d capped at d_max, times the element length equals G_ft, so the
+reported energy matches G_ft for every element size. The work is linear
+in 1 / C, so C is found in closed form
+for all rows. The tensile strength follows from the shear surface on the
+tensile meridian, sqrt(J_2) = Q_2 F_f with Q_2(I_1) from the ALPHA2,
+LAMBDA2, BETA2 and THETA2 columns.
+
+The outputs are stress-strain and stress-crack-opening curves. The crack
+opening is the inelastic strain times the element length. Each row also
+gets the dissipated energy per crack area, which is compared with G_ft.
+``render_tension_family`` overlays the curves of several element sizes
+on the CEB-FIP tension and crack opening curves of every grade.
+"""
+
+import numpy as np
+
+from batch_driver import DAMAGE_MAX, driver_parameters
+from cscm_keyword import FIELD_INDEX
+
+SQRT3 = np.sqrt(3.0)
+
+# Softening is followed until exp(-C (tau_b - r_0b)) drops to this value
+SOFTENING_RESIDUAL = 1e-4
+
+
+def tensile_strength(values, iterations=60):
+    """
+    Uniaxial tensile strength implied by the shear surface.
+
+    Solves f_t / sqrt(3) = Q_2(-f_t) F_f(-f_t) by bisection.
+
+    Parameters:
+    -----------
+    values : numpy.ndarray
+        Keyword field values of shape (n_materials, N_FIELDS)
+
+    Returns:
+    --------
+    numpy.ndarray
+        Tensile strength (MPa) per material
+    """
+    values = np.atleast_2d(np.asarray(values, dtype=float))
+    p = driver_parameters(values)
+    alpha_2, theta_2, lamda_2, beta_2 = (values[:, FIELD_INDEX[name]]
+                                         for name in ('ALPHA2', 'THETA2', 'LAMBDA2', 'BETA2'))
+    low = np.zeros(len(p['E']))
+    high = np.maximum(p['alpha'], 1.0)
+    for _ in range(iterations):
+        middle = 0.5 * (low + high)
+        # Meridians at I_1 = -f_t (positive in compression)
+        F_f = p['alpha'] - p['lamda'] * np.exp(p['beta'] * middle) - p['theta'] * middle
+        Q_2 = alpha_2 - lamda_2 * np.exp(beta_2 * middle) - theta_2 * middle
+        outside = middle / SQRT3 > Q_2 * F_f
+        high = np.where(outside, middle, high)
+        low = np.where(outside, low, middle)
+    return low
+
+
+def softening_rate(f_t, E, D, G_ft, esize, d_max=DAMAGE_MAX, residual=SOFTENING_RESIDUAL):
+    """
+    Brittle softening rate C that dissipates G_ft over the element length.
+
+    The work per unit volume up to exp(-C (tau_b - r_0b)) = residual, with
+    the damage capped at d_max, is
+
+        f_t^2 / (2 E) + r_0b / C * ((1 - d_max) U + d_max (1 + D) / D ln((1 + D) / (1 + D residual)))
+
+    with U = -ln(residual).
+
+    Parameters:
+    -----------
+    f_t, E, D, G_ft, esize : array_like
+        Tensile strength (MPa), Young's modulus (MPa), brittle shape
+        parameter, tensile fracture energy (N/mm) and element size (mm)
+    d_max : float
+        Damage cap
+    residual : float
+        End of the softening, as in ``SOFTENING_RESIDUAL``
+
+    Returns:
+    --------
+    tuple
+        (C, snapback): where the elastic energy alone exceeds G_ft / esize
+        (element too large) C is infinite and snapback is True
+    """
+    f_t, E, D, G_ft, esize = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (f_t, E, D, G_ft, esize)))
+    r_0b = f_t / np.sqrt(E)
+    available = G_ft / esize - f_t**2 / (2 * E)
+    snapback = available <= 0
+    U = -np.log(residual)
+    work = (1 - d_max) * U + d_max * (1 + D) / D * np.log((1 + D) / (1 + D * residual))
+    with np.errstate(divide='ignore'):
+        C = np.where(snapback, np.inf, r_0b * work / np.where(snapback, 1, available))
+    return C, snapback
+
+
+def uniaxial_tension(values, esize=200, f_t=None, num_points=500, curves=True):
+    """
+    Uniaxial tension response of many materials and element sizes.
+
+    Parameters:
+    -----------
+    values : numpy.ndarray
+        Keyword field values of shape (n_materials, N_FIELDS); E, D and GFT are used
+    esize : array_like
+        Element size (mm) per material, broadcast against the materials
+    f_t : array_like, optional
+        Tensile strength (MPa); defaults to ``tensile_strength(values)``
+    num_points : int
+        Points per curve; every row gets its own strain range up to nearly
+        complete softening
+    curves : bool
+        Return the curves
+
+    Returns:
+    --------
+    dict
+        Arrays of shape (n,): 'f_t', 'E', 'D', 'C', 'G_ft', 'esize', 'energy'
+        (dissipated energy per crack area up to the last point, N/mm) and
+        'snapback'; without snapback the energy equals G_ft. With
+        ``curves`` arrays of shape (n, num_points): 'strains', 'stresses',
+        'crack_opening' and 'damage'
+    """
+    values = np.atleast_2d(np.asarray(values, dtype=float))
+    p = driver_parameters(values)
+    E = p['E']
+    n = len(E)
+    esize = np.broadcast_to(np.asarray(esize, dtype=float), (n,))
+    f_t = tensile_strength(values) if f_t is None else np.broadcast_to(np.asarray(f_t, dtype=float), (n,))
+    D = values[:, FIELD_INDEX['D']]
+    G_ft = values[:, FIELD_INDEX['GFT']]
+    C, snapback = softening_rate(f_t, E, D, G_ft, esize)
+
+    r_0b = f_t / np.sqrt(E)
+    peak_strain = f_t / E
+    # Snapback rows drop to the residual stress; they continue to twice the peak strain
+    span = np.where(snapback, r_0b, -np.log(SOFTENING_RESIDUAL) / np.where(snapback, 1, C))
+    max_strain = peak_strain + span / np.sqrt(E)
+    # A quarter of the points for the elastic branch, the rest for softening
+    elastic = num_points // 4
+    step = np.arange(num_points)
+    strains = np.where(step < elastic, peak_strain[:, None] * step / elastic,
+                       peak_strain[:, None] + (max_strain - peak_strain)[:, None]
+                       * (step - elastic) / (num_points - 1 - elastic))
+    tau_b = np.sqrt(E)[:, None] * strains
+    with np.errstate(over='ignore', invalid='ignore'):
+        decay = np.exp(-C[:, None] * np.maximum(tau_b - r_0b[:, None], 0))
+        d = DAMAGE_MAX / D[:, None] * ((1 + D[:, None]) / (1 + D[:, None] * decay) - 1)
+    d = np.where(tau_b > r_0b[:, None], d, 0.0)
+    d = np.where(snapback[:, None] & (tau_b > r_0b[:, None]), DAMAGE_MAX, d)
+    stresses = (1 - d) * np.minimum(E[:, None] * strains, f_t[:, None])
+    crack_opening = esize[:, None] * (strains - stresses / E[:, None])
+    energy = esize * np.trapezoid(stresses, strains, axis=1)
+
+    result = {'f_t': f_t, 'E': E, 'D': D, 'C': C, 'G_ft': G_ft, 'esize': esize,
+              'energy': energy, 'snapback': snapback}
+    if curves:
+        result.update(strains=strains, stresses=stresses, crack_opening=crack_opening, damage=d)
+    return result
+
+
+def tension_family(f_c, esize=(50, 100, 200, 400), dmax=19, num_points=500, curves=True, **options):
+    """
+    Uniaxial tension of concrete grades at several element sizes.
+
+    Parameters:
+    -----------
+    f_c : array_like
+        Compressive strengths (MPa)
+    esize : array_like
+        Element sizes (mm); every grade is run at every size
+    dmax : float
+        Maximum aggregate size (mm)
+    num_points : int
+        Points per curve
+    curves : bool
+        Return the curves
+    **options
+        Further ``batch_params.keyword_values`` arguments (rev, softening_rev, ...)
+
+    Returns:
+    --------
+    dict
+        'f_c' (n_grades,), 'esize_values' (n_sizes,) and the results of
+        ``uniaxial_tension`` reshaped to (n_grades, n_sizes[, num_points])
+    """
+    from batch_params import keyword_values
+
+    f_c = np.atleast_1d(np.asarray(f_c, dtype=float))
+    sizes = np.atleast_1d(np.asarray(esize, dtype=float))
+    rows_f_c = np.repeat(f_c, len(sizes))
+    rows_esize = np.tile(sizes, len(f_c))
+    values = keyword_values(rows_f_c, dmax, esize=rows_esize, **options)
+    response = uniaxial_tension(values, rows_esize, num_points=num_points, curves=curves)
+    shape = (len(f_c), len(sizes))
+    result = {name: array.reshape(shape + array.shape[1:]) for name, array in response.items()}
+    result.update({'f_c': f_c, 'esize_values': sizes})
+    return result
+
+
+def draw_tension(ax, strains, stresses, labels, ceb_curve=None, title='Uniaxial Tension'):
+    """
+    Draw tensile stress-strain curves over the CEB-FIP tension curve.
+
+    Parameters:
+    -----------
+    strains, stresses : sequence of array_like
+        Curves of the driver, one per element size
+    labels : sequence of str
+        Legend entries of the curves
+    ceb_curve : array_like, optional
+        ``CEBClass.tension_curve`` of shape (2, n)
+    """
+    if ceb_curve is not None:
+        ax.plot(np.abs(ceb_curve[0]) * 100, np.abs(ceb_curve[1]), 'k--', linewidth=2, label='CEB-FIP')
+    for strain, stress, label in zip(strains, stresses, labels):
+        ax.plot(np.asarray(strain) * 100, stress, linewidth=1.5, label=label)
+    ax.set_xlabel('Strain, %')
+    ax.set_ylabel('Stress, MPa')
+    ax.set_title(title)
+    ax.grid(True, alpha=0.3)
+    ax.legend()
+
+
+def draw_crack_opening(ax, crack_opening, stresses, labels, ceb_curve=None, title='Crack Opening'):
+    """
+    Draw stress-crack-opening curves over the CEB-FIP crack opening curve.
+
+    Parameters:
+    -----------
+    crack_opening, stresses : sequence of array_like
+        Curves of the driver, one per element size
+    labels : sequence of str
+        Legend entries of the curves
+    ceb_curve : array_like, optional
+        ``CEBClass.crack_opening_curve`` of shape (2, n)
+    """
+    if ceb_curve is not None:
+        ax.plot(ceb_curve[0], ceb_curve[1], 'k--', linewidth=2, label='CEB-FIP')
+    for opening, stress, label in zip(crack_opening, stresses, labels):
+        ax.plot(opening, stress, linewidth=1.5, label=label)
+    ax.set_xlabel('Crack opening, mm')
+    ax.set_ylabel('Stress, MPa')
+    ax.set_title(title)
+    ax.grid(True, alpha=0.3)
+    ax.legend()
+
+
+def render_tension_family(f_c, esize=(50, 100, 200, 400), dmax=19, directory='.', formats=('png',), workers=None,
+                          num_points=500, dpi=100, **options):
+    """
+    Render the tension and crack opening overlays of a family of concrete grades.
+
+    Every grade gets two plots with one curve per element size, drawn over
+    the CEB-FIP curves: with a regularized softening the crack opening
+    curves of all element sizes dissipate the same energy.
+
+    Parameters:
+    -----------
+    f_c : array_like
+        Compressive strengths (MPa)
+    esize : array_like
+        Element sizes (mm)
+    dmax : float
+        Maximum aggregate size (mm)
+    directory : str
+        Output folder
+    formats : sequence of str
+        File extensions
+    workers : int, optional
+        Worker processes; None uses the CPU count
+    num_points : int
+        Points per curve
+    dpi : int
+        Resolution of raster output
+    **options
+        Further ``batch_params.keyword_values`` arguments
+
+    Returns:
+    --------
+    tuple
+        (written files named ``tension_fc<f_c>`` and ``crack_opening_fc<f_c>``,
+        result of ``tension_family``)
+    """
+    from CEB import CEBClass
+    from render import render_batch
+
+    family = tension_family(f_c, esize, dmax, num_points, **options)
+    jobs = []
+    for i, strength in enumerate(family['f_c']):
+        labels = ['esize={0:g} mm, G={1:.3g} N/mm'.format(size, energy)
+                  for size, energy in zip(family['esize_values'], family['energy'][i])]
+        ceb = CEBClass(f_c=strength, d_max=dmax)
+        title = 'f_c={0:g} MPa, dmax={1:g} mm'.format(strength, dmax)
+        jobs.append((draw_tension, (family['strains'][i], family['stresses'][i], labels, ceb.tension_curve,
+                                    'Uniaxial Tension, ' + title), 'tension_fc{0:g}'.format(strength)))
+        jobs.append((draw_crack_opening, (family['crack_opening'][i], family['stresses'][i], labels,
+                                          ceb.crack_opening_curve, 'Crack Opening, ' + title),
+                     'crack_opening_fc{0:g}'.format(strength)))
+    return render_batch(jobs, directory, formats, workers, dpi), family
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Tests for the vectorized uniaxial compression driver.
+"""
+
+import numpy as np
+
+from MatCSCM import MatCSCM
+from batch_driver import uniaxial_compression
+from batch_params import keyword_values
+
+
+def test_matches_scalar_driver():
+    """Batch curves equal MatCSCM.Evaluate.uniaxial_compression_response."""
+    f_c = np.array([20.0, 45.0, 80.0])
+    result = uniaxial_compression(f_c, keyword_values(f_c, 19), 0.01, 200, curves=True)
+    for i, strength in enumerate(f_c):
+        strains, stresses = MatCSCM(f_c=strength).evaluate.uniaxial_compression_response(0.01, 200)
+        assert np.allclose(result['strains'], strains)
+        assert np.allclose(result['stresses'][i], stresses, rtol=1e-12)
+        assert np.isclose(result['peak_stress'][i], stresses.max())
+        assert np.isclose(result['final_stress'][i], stresses[-1])
+
+
+def test_plastic_path():
+    """With a negative cap position the plastic branch matches the scalar driver."""
+    values = keyword_values([35.0, 50.0], 19)
+    values[:, 26] = -5.0  # X0
+    result = uniaxial_compression([35.0, 50.0], values, 0.01, 150, curves=True)
+    assert np.all(result['plastic_volume_strain'] > 0)
+    for i, strength in enumerate((35.0, 50.0)):
+        mat = MatCSCM(f_c=strength)
+        mat.initialize.kappa_0 = lambda rev=None: -5.0
+        strains, stresses = mat.evaluate.uniaxial_compression_response(0.01, 150)
+        assert np.allclose(result['stresses'][i], stresses, rtol=1e-12)
+
+
+if __name__ == "__main__":
+    test_matches_scalar_driver()
+    test_plastic_path()
+    print("✅ All batch driver tests passed!")
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Tests for the vectorized *MAT_CSCM parameter evaluation.
+"""
+
+import numpy as np
+
+from CEB import CEBClass
+from MatCSCM import MatCSCM, Revision
+from batch_params import batch_initialize, ceb_properties, keyword_values
+
+
+def test_ceb_properties():
+    """Array CEB-FIP properties equal CEBClass on both sides of the f_c = 50 branch."""
+    f_c = np.array([12.0, 35.0, 50.0, 65.0, 110.0])
+    props = ceb_properties(f_c, 19.0)
+    for i, value in enumerate(f_c):
+        ceb = CEBClass(f_c=value, d_max=19.0)
+        for name in ('f_t', 'E', 'G', 'K', 'G_fc', 'G_ft', 'G_fs'):
+            assert np.isclose(props[name][i], getattr(ceb, name), rtol=1e-12)
+    props = ceb_properties(35.0, 16.0, delta_f=[4.0, 12.0])
+    for i, delta_f in enumerate((4.0, 12.0)):
+        assert np.isclose(props['G_fc'][i], CEBClass(f_c=35.0, delta_f=delta_f).G_fc, rtol=1e-12)
+
+
+def test_keyword_values_match_matcscm():
+    """Every batch row equals MatCSCM.keyword_values of the same inputs."""
+    f_c = np.array([20.0, 45.5, 58.0, 90.0])
+    dmax = np.array([8.0, 16.0, 19.0, 32.0])
+    values = keyword_values(f_c, dmax, mid=7, irate='off')
+    for row, (strength, size) in zip(values, zip(f_c, dmax)):
+        expected = MatCSCM(f_c=strength, dmax=size, mid=7, irate='off').keyword_values()
+        assert np.allclose(row, expected, rtol=1e-12)
+
+
+def test_revisions_and_element_size():
+    """Revisions are evaluated per call and REV_2 softening follows the element size."""
+    for rev in Revision:
+        init = batch_initialize([30.0, 60.0])
+        mat = MatCSCM(f_c=60.0)
+        for name in ('alpha', 'alpha_2', 'theta_1', 'R', 'kappa_0', 'W'):
+            batch = np.broadcast_to(getattr(init, name)(rev), (2,))
+            assert np.isclose(batch[1], getattr(mat.initialize, name)(rev))
+    values = keyword_values(40.0, 19, [50.0, 100.0, 200.0], softening_rev=Revision.REV_2)
+    mat = MatCSCM(f_c=40.0)
+    mat.esize = 100.0
+    assert np.isclose(values[1, 30], mat.initialize.B(Revision.REV_2))
+    assert np.isclose(values[1, 32], mat.initialize.D(Revision.REV_2))
+    assert values[0, 32] < values[1, 32] < values[2, 32]
+
+
+if __name__ == "__main__":
+    test_ceb_properties()
+    test_keyword_values_match_matcscm()
+    test_revisions_and_element_size()
+    print("✅ All batch parameter tests passed!")
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Tests for the batch calibration report.
+"""
+
+import os
+import re
+import tempfile
+
+import matplotlib
+matplotlib.use('Agg')
+import numpy as np
+
+import calibration_report
+from MatCSCM import MatCSCM
+from calibration_report import REPORT_FIGURES, CalibrationReport, build_report, meridians
+from cscm_keyword import FIELD_INDEX
+from result_cache import MODEL_SOURCES, ResultCache
+
+
+def test_meridians_and_cap():
+    """Meridians follow the shear surface; the cap closes at X = L + R * F_f(L)."""
+    values = MatCSCM(f_c=40).keyword_values()[None]
+    lines = meridians(values, num_points=50)
+    assert lines['TXC'].shape == (1, 50)
+    assert np.all(lines['TOR'] < lines['TXC']) and np.all(lines['TXE'] <= lines['TOR'])
+    assert np.isclose(lines['cap_I_1'][0, 0], values[0, FIELD_INDEX['X0']])
+    assert np.isclose(lines['cap_J'][0, -1], 0) and np.isclose(lines['cap_I_1'][0, -1], lines['I_1'][0, -1])
+
+
+def test_incremental_rebuild():
+    """A rebuild computes and renders only the added grade."""
+    with tempfile.TemporaryDirectory() as folder:
+        cache = ResultCache(os.path.join(folder, 'cache'))
+        path = os.path.join(folder, 'report.html')
+        report = build_report([30, 45], path, cache=cache, workers=1, num_points=100, dpi=40)
+        assert report.computed == 2 and report.rendered == 2 * len(REPORT_FIGURES)
+        text = open(path, encoding='utf-8').read()
+        assert text.count('data:image/png;base64,') == 8 and text.count('*MAT_CSCM') == 2
+
+        report = build_report([30, 45, 60], path, cache=cache, workers=1, num_points=100, dpi=40, first_mid=7)
+        assert report.computed == 1 and report.rendered == len(REPORT_FIGURES)
+        assert [row['MID'] for row in report.summary()] == [7, 8, 9]
+        assert [row['f_c'] for row in report.summary()] == [30, 45, 60]
+
+        uncached = CalibrationReport([30, 45, 60], first_mid=7, cache=False, num_points=100)
+        assert np.allclose(uncached.values(), report.values(), equal_nan=True)
+
+        # A change of the report or plotting code recomputes everything
+        sources = calibration_report.REPORT_SOURCES
+        try:
+            calibration_report.REPORT_SOURCES = ('calibration_report.py',)
+            report = build_report([30, 45], path, cache=cache, workers=1, num_points=100, dpi=40)
+            assert report.computed == 2 and report.rendered == 2 * len(REPORT_FIGURES)
+        finally:
+            calibration_report.REPORT_SOURCES = sources
+    assert 'theory.py' in MODEL_SOURCES
+
+
+def test_pdf_report():
+    """The PDF report has one page per grade."""
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, 'report.pdf')
+        build_report([35, 50], path, cache=False, num_points=100)
+        with open(path, 'rb') as pdf:
+            assert len(re.findall(rb'/Type\s*/Page[^s]', pdf.read())) == 2
+
+
+if __name__ == "__main__":
+    test_meridians_and_cap()
+    test_incremental_rebuild()
+    test_pdf_report()
+    print("✅ All calibration report tests passed!")
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Tests for the CEB-FIP dynamic increase factor API.
+"""
+
+import numpy as np
+
+from CEB import DIF, DIF_STRAIN_RATE_CUTOFF, DIF_c, DIF_t, DIF_table
+
+
+def test_dif_matches_legacy_curves():
+    """DIF evaluates the legacy curves at arbitrary, broadcast strain rates."""
+    for curve, mode in ((DIF_c(40), 'compression'), (DIF_t(40), 'tension')):
+        low = curve[0] < DIF_STRAIN_RATE_CUTOFF
+        assert np.allclose(DIF(curve[0][low], 40, mode), curve[1][low])
+        assert np.allclose(DIF(curve[0][-1], 40, mode), curve[1][-1])
+    values = DIF([1e-8, 1.0, 100.0], [[20], [60]])
+    assert values.shape == (2, 3) and np.all(values[:, 0] == 1)
+    assert np.all(values[0, 1:] > values[1, 1:])
+
+
+def test_tables_are_small_and_accurate():
+    """Adaptive tables meet the tolerance with far fewer points than the legacy curves."""
+    rates = np.geomspace(3e-6, 300, 20000)
+    for mode in ('compression', 'tension'):
+        for rtol in (1e-2, 1e-3):
+            table = DIF_table(50, mode, rtol=rtol)
+            assert table.shape[1] < 60 and np.all(np.diff(table[0]) > 0)
+            assert DIF_STRAIN_RATE_CUTOFF in table[0]
+            exact = DIF(rates, 50, mode)
+            error = np.abs(np.interp(rates, *table) - exact) / exact
+            assert np.max(error[rates >= table[0, 0]]) <= rtol * 1.01
+    table = DIF_table(40, 'tension', num_points=30)
+    assert table.shape[1] == 32 and np.isclose(table[0, 0], 3e-6) and table[0, -1] == 300
+
+
+if __name__ == "__main__":
+    test_dif_matches_legacy_curves()
+    test_tables_are_small_and_accurate()
+    print("✅ All DIF tests passed!")
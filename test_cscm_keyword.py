@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Tests for the compact *MAT_CSCM keyword record.
+"""
+
+import numpy as np
+
+from MatCSCM import MatCSCM, keyword_to_text
+import io
+
+from cscm_keyword import (CSCM_FIELDS, N_FIELDS, KeywordRecord, format_cards,
+                          records_to_text, write_cards)
+
+
+def test_record_matches_dict_keyword():
+    """The record view and text are identical to the dict keyword."""
+    mat = MatCSCM(f_c=42, dmax=16, mid=7, irate='off', recov='0.8')
+    record = mat.keyword_record()
+    data = mat.generate_keyword()
+
+    assert isinstance(data, dict)
+    assert list(record.keys()) == ['NAME'] + list(CSCM_FIELDS)
+    assert record['MID']['value'] == 7
+    assert record['IRATE'] == data['IRATE']
+    assert record.values.shape == (N_FIELDS,)
+    assert record.to_text() == keyword_to_text(data)
+    assert keyword_to_text(record) == keyword_to_text(data)
+
+
+def test_batch_text_from_values_array():
+    """Batch formatting from a value array matches per-material formatting."""
+    mats = [MatCSCM(f_c=f_c, mid=i + 1) for i, f_c in enumerate([25, 35, 60])]
+    values = np.vstack([mat.keyword_values() for mat in mats])
+    expected = ''.join(keyword_to_text(mat.generate_keyword()) for mat in mats)
+    assert records_to_text(values) == expected
+
+
+def test_string_mid_and_blank_fields():
+    """Non-numeric MIDs survive the round trip and NaN fields print blank."""
+    record = MatCSCM(mid='conc1').keyword_record()
+    assert record['MID']['value'] == 'conc1'
+    assert KeywordRecord.from_dict(record.to_dict()).to_text() == record.to_text()
+
+    values = record.values.copy()
+    values[CSCM_FIELDS.index('PRED')] = np.nan
+    blank = KeywordRecord(values, record.mid)
+    assert blank['PRED']['value'] == 'AUTO'
+    assert blank.to_text() == keyword_to_text(blank.to_dict())
+
+
+def test_write_cards_in_chunks():
+    """Chunked writes with mixed blank rows and word lengths match keyword_to_text."""
+    mats = [MatCSCM(f_c=20 + 5 * i, mid=i + 1) for i in range(7)]
+    values = np.vstack([mat.keyword_values() for mat in mats])
+    values[3, CSCM_FIELDS.index('NH')] = np.nan
+
+    for word_length in (8, 10, 16):
+        expected = ''.join(keyword_to_text(KeywordRecord(row).to_dict(), word_length)
+                           for row in values)
+        buffer = io.StringIO()
+        assert write_cards(values, buffer, word_length, chunk_size=2) == len(mats)
+        assert buffer.getvalue() == expected
+        assert format_cards(values, word_length) == expected
+
+    # A blank MID (string MIDs are NaN in keyword_values) stays blank
+    values[:, CSCM_FIELDS.index('MID')] = np.nan
+    for blank_row in (None, 3):
+        rows = values.copy()
+        if blank_row is None:
+            rows[:, CSCM_FIELDS.index('NH')] = 1.0
+        expected = ''.join(keyword_to_text(KeywordRecord(row).to_dict()) for row in rows)
+        assert format_cards(rows) == expected
+        assert format_cards(rows, mids=[None] * len(rows)) == expected
+
+
+if __name__ == "__main__":
+    test_record_matches_dict_keyword()
+    test_batch_text_from_values_array()
+    test_string_mid_and_blank_fields()
+    test_write_cards_in_chunks()
+    print("✅ All keyword record tests passed!")
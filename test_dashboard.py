@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Tests for the dependency graph and the debounced dashboard controller.
+"""
+
+from dashboard import Debouncer, cscm_dashboard
+from dependency_graph import DependencyGraph
+
+
+def test_dependency_graph():
+    """Only nodes downstream of a changed input are recomputed."""
+    graph = DependencyGraph()
+    graph.input('a', 1)
+    graph.input('b', 2)
+    graph.node('double', lambda a: 2 * a, ('a',))
+    graph.node('total', lambda double, b: double + b, ('double', 'b'))
+    assert graph['total'] == 4
+    assert graph.set(b=3) == {'total'}
+    assert graph['total'] == 5
+    assert graph.evaluations == {'double': 1, 'total': 2}
+    assert graph.set(a=1) == set()
+    assert graph.set(a=2) == {'double', 'total'}
+    assert not graph.is_cached('total') and graph['total'] == 7
+
+
+def test_debouncer():
+    """Bursts of events result in one call."""
+    calls = []
+    debouncer = Debouncer(10, lambda: calls.append(1))
+    for _ in range(5):
+        debouncer()
+    assert calls == [] and debouncer.pending
+    debouncer.flush()
+    assert calls == [1] and not debouncer.pending
+
+
+def test_incremental_dashboard():
+    """Widget changes redraw only affected views and reuse figures."""
+    controller, box = cscm_dashboard(delay=10)
+    inputs = {name: box.children[i + 1] for i, name in enumerate(('f_c', 'dmax', 'rho', 'nplot', 'iretrc'))}
+    assert controller.renders == {'elastic_curve': 1, 'compression_curve': 1, 'result_text': 1}
+    figure = controller.views['compression_curve'].figure
+
+    for value in (4, 40, 40.5):
+        inputs['f_c'].value = value
+    assert controller.renders['elastic_curve'] == 1
+    controller.flush()
+    assert controller.renders == {'elastic_curve': 2, 'compression_curve': 2, 'result_text': 2}
+    assert controller.graph.evaluations['material'] == 2
+    assert controller.views['compression_curve'].figure is figure
+
+    inputs['nplot'].value = 3
+    controller.flush()
+    assert controller.renders == {'elastic_curve': 2, 'compression_curve': 2, 'result_text': 3}
+    assert controller.graph.evaluations['ceb_text'] == 2
+
+    inputs['dmax'].value = 12.0
+    controller.flush()
+    assert controller.renders['elastic_curve'] == 2 and controller.renders['compression_curve'] == 3
+    assert 'NPLOT' in controller.graph['result_text'] and '$# d_max = 12' in controller.graph['result_text']
+
+
+if __name__ == "__main__":
+    test_dependency_graph()
+    test_debouncer()
+    test_incremental_dashboard()
+    print("✅ All dashboard tests passed!")
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Tests for the experimental dataset registry.
+"""
+
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from datasets import DATA_DIR, DatasetRegistry, parse_header, parse_name
+from result_cache import ResultCache
+
+
+def test_repository_data():
+    """The Malvar & Ross tables are indexed by material, load and source."""
+    with tempfile.TemporaryDirectory() as folder:
+        registry = DatasetRegistry(cache=ResultCache(folder))
+        assert len(registry) == 2 and registry.materials == ['concrete']
+        assert registry.loads == ['compression', 'tension'] and registry.sources == ['Malvar & Ross [1998]']
+        tension = registry.get(load='tension', source='malvar')
+        reference = np.genfromtxt(os.path.join(DATA_DIR, 'Malvar & Ross [1998] tension.txt'), skip_header=1)
+        assert np.array_equal(tension.table, reference)
+        assert tension.columns == ('Strain-Rate', 'DIF') and tension.units == ('1/ms', '')
+        assert tension(1e-3) == 1.45 and np.isclose(tension(np.sqrt(1e-3 * 3e-3), log=True), (1.45 + 2.09) / 2)
+        assert registry.find(material='steel') == []
+
+
+def test_index_reuse_and_updates():
+    """Only new or modified files are parsed again; touched files are not."""
+    with tempfile.TemporaryDirectory() as folder:
+        data = os.path.join(folder, 'data')
+        shutil.copytree(DATA_DIR, data)
+        os.makedirs(os.path.join(data, 'steel'))
+        cache = ResultCache(os.path.join(folder, 'cache'))
+        assert DatasetRegistry(data, cache).parsed == 2
+
+        path = os.path.join(data, 'steel', 'Test [2020] tension.txt')
+        np.savetxt(path, [[0, 1], [1, 2]], header='Strain-Rate(1/s), DIF', comments='')
+        registry = DatasetRegistry(data, cache)
+        assert registry.parsed == 1 and len(registry) == 3
+        assert registry.get(material='steel')(0.5) == 1.5
+
+        os.utime(path, ns=(0, 0))
+        assert DatasetRegistry(data, cache).parsed == 0
+        np.savetxt(path, [[0, 1], [1, 4]], header='Strain-Rate(1/s), DIF', comments='')
+        assert registry.scan() == 3 and registry.parsed == 1
+        assert registry.get(material='steel')(0.5) == 2.5
+        os.remove(path)
+        assert registry.scan() == 2 and DatasetRegistry(data, cache).parsed == 0
+
+
+def test_name_and_header_parsing():
+    assert parse_header('Strain-Rate(1/ms), DIF ') == (('Strain-Rate', 'DIF'), ('1/ms', ''))
+    assert parse_name(os.path.join('rock', 'Smith et al. [2001a] direct tension')) == {
+        'source': 'Smith et al. [2001a]', 'load': 'direct tension', 'material': 'rock'}
+
+
+if __name__ == "__main__":
+    test_repository_data()
+    test_index_reuse_and_updates()
+    test_name_and_header_parsing()
+    print("✅ All dataset tests passed!")
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Tests for deck assembly with material deduplication.
+"""
+
+import io
+
+import numpy as np
+
+from MatCSCM import MatCSCM
+from deck_assembly import MaterialIndex, assemble_materials, write_assembled_deck
+
+
+def test_duplicates_are_emitted_once():
+    """Parts sharing a grade map to a single material."""
+    grades = [MatCSCM(f_c=f_c, mid=100 + i).keyword_record() for i, f_c in enumerate([25, 35, 50])]
+    parts = [(pid, grades[pid % 3]) for pid in range(1, 1001)]
+    records, part_mids = assemble_materials(parts, chunk_size=128)
+
+    assert len(records) == 3
+    assert [record['MID']['value'] for record in records] == [101, 102, 100]
+    assert part_mids[1] == 101 and part_mids[3] == 100
+    assert len(part_mids) == 1000
+
+
+def test_tolerance_and_renumbering():
+    """Values within rtol collapse, exact mode keeps them apart, MIDs can be renumbered."""
+    values = MatCSCM(f_c=35).keyword_values()
+    close = values.copy()
+    close[1] *= 1 + 1e-9
+    close[0] = 5
+    other = MatCSCM(f_c=40).keyword_values()
+    stack = np.vstack([values, close, other])
+
+    # A different material reusing the default MID 159 gets the next free MID
+    index = MaterialIndex(rtol=1e-6)
+    assert index.add(stack) == [159, 159, 160]
+    assert [record['MID']['value'] for record in index.records()] == [159, 160]
+    try:
+        MaterialIndex().add(np.vstack([values, other]), mids=['slab', 'slab'])
+        assert False
+    except ValueError:
+        pass
+
+    exact = MaterialIndex(rtol=0)
+    exact.add(stack)
+    assert len(exact) == 3
+
+    renumbered = MaterialIndex(first_mid=1)
+    assert renumbered.add(stack) == [1, 1, 2]
+    assert renumbered.records()[1]['MID']['value'] == 2
+
+
+def test_assembled_deck():
+    """The written deck holds one card per unique material."""
+    grades = [MatCSCM(f_c=f_c) for f_c in (30, 40)]
+    parts = ((pid, grades[pid % 2]) for pid in range(50))
+    buffer = io.StringIO()
+    result = write_assembled_deck(parts, buffer, first_mid=10)
+    assert buffer.getvalue().count('*MAT_CSCM') == 2
+    assert set(result['part_mids'].values()) == {10, 11}
+
+
+if __name__ == "__main__":
+    test_duplicates_are_emitted_once()
+    test_tolerance_and_renumbering()
+    test_assembled_deck()
+    print("✅ All deck assembly tests passed!")
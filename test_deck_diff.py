@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Tests for the bulk *MAT_CSCM deck comparison.
+"""
+
+import os
+import tempfile
+
+import numpy as np
+
+from MatCSCM import MatCSCM
+from deck_diff import compare, relative_difference
+from deck_writer import write_deck
+
+
+def test_relative_difference():
+    """Blank fields compare equal to blanks and infinitely different to values."""
+    reference = np.array([1.0, 0.0, np.nan, np.nan, -2.0])
+    other = np.array([1.1, 0.0, np.nan, 3.0, -2.0])
+    relative = relative_difference(reference, other)
+    assert np.isclose(relative[0], 0.1 / 1.1)
+    assert relative[1] == 0.0
+    assert relative[2] == 0.0
+    assert np.isinf(relative[3])
+    assert relative[4] == 0.0
+
+
+def test_compare_by_mid():
+    """Changed fields and unmatched materials are reported per MID."""
+    reference = [MatCSCM(f_c=f_c, mid=i + 1) for i, f_c in enumerate(range(20, 60, 5))]
+    other = [MatCSCM(f_c=f_c, dmax=32 if i == 2 else 19, mid=i + 2)
+             for i, f_c in enumerate(range(25, 65, 5))]
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, 'reference.k')
+        write_deck(reference, path)
+        diff = compare(path, other)
+    assert diff.only_in_reference == [1]
+    assert diff.only_in_other == [9]
+    assert diff.changed_materials() == [4]
+    assert set(diff.summary()) == {'GFC', 'GFT', 'GFS'}
+    assert 'Changed materials: 1' in diff.report()
+
+
+def test_compare_by_content():
+    """Configurations are matched to printed cards regardless of MID."""
+    mats = [MatCSCM(f_c=f_c, mid=i + 100) for i, f_c in enumerate(range(20, 90, 10))]
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, 'deck.k')
+        write_deck(mats[::-1], path)
+        diff = compare(path, [MatCSCM(f_c=f_c) for f_c in range(20, 90, 10)], align='content')
+    assert len(diff.mids) == len(mats)
+    assert sorted(diff.mids) == [mat.mid for mat in mats]
+    assert diff.changed_materials() == []
+    assert diff.only_in_reference == [] and diff.only_in_other == []
+
+
+if __name__ == "__main__":
+    test_relative_difference()
+    test_compare_by_mid()
+    test_compare_by_content()
+    print("✅ All deck diff tests passed!")
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Tests for the *MAT_CSCM deck reader.
+"""
+
+import os
+import tempfile
+
+import numpy as np
+
+from MatCSCM import MatCSCM
+from deck_reader import read_materials, read_records
+from deck_writer import write_deck
+
+
+def test_round_trip():
+    """Materials written by the deck writer are read back within print precision."""
+    mats = [MatCSCM(f_c=f_c, mid=i + 1) for i, f_c in enumerate(range(20, 90, 7))]
+    expected = np.vstack([mat.keyword_values() for mat in mats])
+    with tempfile.TemporaryDirectory() as folder:
+        for name in ('deck.k', 'deck.k.gz'):
+            path = os.path.join(folder, name)
+            write_deck(mats, path)
+            for use_mmap in (True, False):
+                values, mids = read_materials(path, use_mmap=use_mmap)
+                assert mids is None
+                assert values.shape == expected.shape
+                assert np.allclose(values, expected, rtol=5e-4)
+
+
+def test_legacy_deck():
+    """The archived deck is read into the generate_keyword structure."""
+    records = read_records(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'arc', 'mat_cscm.K'))
+    assert len(records) == 1
+    assert records[0]['MID']['value'] == 159
+    assert records[0]['X0'] == {'card': 5, 'position': 2, 'type': 'F', 'value': 92.77}
+
+
+def test_title_free_format_and_string_mid():
+    """_TITLE keywords, comma separated cards, blanks and string MIDs are supported."""
+    card_text = MatCSCM(f_c=35).keyword_record().to_text().split('\n', 1)[1]
+    deck = ('*KEYWORD\n*NODE\n       1             0.0             0.0             0.0\n'
+            '*MAT_CSCM_TITLE\nconcrete C35\n' + card_text +
+            '*MAT_CSCM\nconc2,2.4e-9,1,,1,0.99,0,0\n' + card_text.split('\n', 2)[2] + '*END\n')
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, 'deck.k')
+        with open(path, 'w') as fh:
+            fh.write(deck)
+        values, mids = read_materials(path)
+        records = read_records(path)
+    assert values.shape[0] == 2
+    assert mids == [None, 'conc2']
+    assert records[1]['MID']['value'] == 'conc2'
+    assert records[1]['INCRE']['value'] == 'AUTO'
+    assert np.allclose(values[0, 9:], values[1, 9:])
+
+
+def test_keyword_case_and_short_materials():
+    """Mixed-case keywords and a keyword right after a short material read alike on both paths."""
+    card_text = MatCSCM(f_c=35).keyword_record().to_text().split('\n', 1)[1]
+    short = card_text.rsplit('\n', 3)[0] + '\n'  # last card missing
+    deck = ('*keyword\n*Mat_Cscm\n' + card_text + '*mat_cscm_title\nshort\n' + short +
+            '*MAT_CSCM\n' + card_text + '*end\n')
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, 'deck.k')
+        with open(path, 'w') as fh:
+            fh.write(deck)
+        read = [read_materials(path, use_mmap=use_mmap)[0] for use_mmap in (True, False)]
+    for values in read:
+        assert values.shape[0] == 3
+        assert np.isnan(values[1, -1]) and not np.isnan(values[2, -1])
+        assert np.allclose(values[0], values[2])
+    assert np.array_equal(read[0], read[1], equal_nan=True)
+
+
+if __name__ == "__main__":
+    test_round_trip()
+    test_legacy_deck()
+    test_title_free_format_and_string_mid()
+    test_keyword_case_and_short_materials()
+    print("✅ All deck reader tests passed!")
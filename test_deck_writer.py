@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Tests for the streaming deck writer.
+"""
+
+import gzip
+import io
+import os
+import tempfile
+
+from MatCSCM import MatCSCM, keyword_to_text
+from deck_writer import write_deck
+
+
+def _materials(n):
+    return (MatCSCM(f_c=20 + i, mid=i + 1) for i in range(n))
+
+
+def test_stream_matches_concatenated_text():
+    """Chunked streaming output equals the concatenated per-material text."""
+    expected = ''.join(keyword_to_text(mat.generate_keyword()) + mat.get_ceb_output()
+                       for mat in _materials(7))
+    buffer = io.StringIO()
+    result = write_deck(_materials(7), buffer, chunk_size=3)
+    assert result['materials'] == 7
+    assert buffer.getvalue() == '*KEYWORD\n' + expected + '*END\n'
+
+
+def test_gzip_include_files():
+    """Include files hold fixed material ranges and the master deck references them."""
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, 'deck.k.gz')
+        result = write_deck(_materials(10), path, materials_per_include=4, include_ceb=False)
+        assert result['materials'] == 10
+        assert len(result['files']) == 4
+
+        with gzip.open(path, 'rt') as master:
+            text = master.read()
+        assert text.count('*INCLUDE') == 3
+        assert os.path.basename(result['files'][1]) in text
+
+        counts = []
+        for include in result['files'][1:]:
+            with gzip.open(include, 'rt') as deck:
+                counts.append(deck.read().count('*MAT_CSCM'))
+        assert counts == [4, 4, 2]
+
+
+def test_mid_range_include_files():
+    """Include files cover MID ranges; empty ranges get no file."""
+    mids = [1, 2, 3, 9, 10, 11, 12, 13]
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, 'deck.k')
+        result = write_deck((MatCSCM(f_c=30, mid=mid) for mid in mids), path, mid_range=5, include_ceb=False)
+        assert result['materials'] == 8
+        names = [os.path.basename(name) for name in result['files'][1:]]
+        assert names == ['deck_000001-000005.k', 'deck_000006-000010.k', 'deck_000011-000015.k']
+        counts = [open(name).read().count('*MAT_CSCM') for name in result['files'][1:]]
+        assert counts == [3, 2, 3]
+
+        for materials, options in (([MatCSCM(mid=1), MatCSCM(mid=9), MatCSCM(mid=2)], {'mid_range': 5}),
+                                   ([MatCSCM(mid='slab')], {'mid_range': 5}),
+                                   (_materials(2), {'mid_range': 5, 'materials_per_include': 1})):
+            try:
+                write_deck(materials, path, **options)
+                assert False
+            except ValueError:
+                pass
+
+
+if __name__ == "__main__":
+    test_stream_matches_concatenated_text()
+    test_gzip_include_files()
+    test_mid_range_include_files()
+    print("✅ All deck writer tests passed!")
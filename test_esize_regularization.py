@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Tests for the element-size regularization table.
+"""
+
+import io
+
+import numpy as np
+
+from MatCSCM import MatCSCM, Revision
+from esize_regularization import regularization_table
+
+
+def test_parts_are_mapped_to_bins():
+    """Parts get the material of the bin of their geometric mean element size."""
+    sizes = [10.0, 10.0, 40.0, 160.0, 90.0]
+    parts = [1, 1, 2, 3, 3]
+    table = regularization_table(sizes, parts, f_c=40, n_bins=2, first_mid=100)
+    assert len(table) == 2
+    assert table.part_mids == {1: 100, 2: 101, 3: 101}
+    assert np.isclose(table.sizes[0], 10.0)
+    # Part 3 (two elements, mean size 120) weighs twice as much as part 2
+    assert np.isclose(table.sizes[1], np.exp((np.log(40.0) + 2 * np.log(120.0)) / 3))
+    mat = MatCSCM(f_c=40)
+    mat.esize = table.sizes[1]
+    assert np.isclose(table.values[1, 30], mat.initialize.B(Revision.REV_2))
+    assert np.isclose(table.values[1, 32], mat.initialize.D(Revision.REV_2))
+
+
+def test_unweighted_parts_are_rejected():
+    """Parts without weighted elements have no size and are rejected."""
+    sizes = [10.0, 10.0, 40.0, 160.0]
+    parts = [1, 1, 2, 3]
+    table = regularization_table(sizes, parts, counts=[1, 0, 2, 1], n_bins=2)
+    assert set(table.part_bins) == {1, 2, 3} and -1 not in table.part_bins.values()
+    for counts in ([1, 1, 0, 1], [1, 1, -1, 2], [1, 1, 1]):
+        try:
+            regularization_table(sizes, parts, counts=counts, n_bins=2)
+            assert False, 'invalid counts {0} accepted'.format(counts)
+        except ValueError as error:
+            assert counts[2] != 0 or 'Parts 2 ' in str(error)
+
+
+def test_histogram_input():
+    """Histogram weights define the bin sizes and empty bins are dropped."""
+    table = regularization_table([10, 20, 40, 80], counts=[5, 0, 7, 1], edges=[10, 20, 40, 80])
+    # The [20, 40) bin is empty, the largest size falls into the last bin
+    assert table.mids == [1, 2]
+    assert np.array_equal(table.counts, [5, 8])
+    assert np.allclose(table.sizes, [10, np.exp((7 * np.log(40) + np.log(80)) / 8)])
+    assert table.part_bins == {}
+    out = io.StringIO()
+    assert table.write_deck(out)['materials'] == 2
+    assert out.getvalue().count('*MAT_CSCM') == 2
+
+
+if __name__ == "__main__":
+    test_parts_are_mapped_to_bins()
+    test_unweighted_parts_are_rejected()
+    test_histogram_input()
+    print("✅ All element size regularization tests passed!")
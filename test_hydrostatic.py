@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Tests for hydrostatic compression curves and the cap hardening fitter.
+"""
+
+import numpy as np
+
+from MatCSCM import MatCSCM, Revision
+from batch_params import keyword_values
+from cscm_keyword import FIELD_INDEX
+from hydrostatic import HYDROSTATIC_FIELDS, fit_hydrostatic, hydrostatic_curves, initial_cap
+from triaxial import triaxial_compression
+
+COLUMNS = [FIELD_INDEX[name] for name in HYDROSTATIC_FIELDS]
+
+
+def _materials(n, seed=0):
+    rng = np.random.default_rng(seed)
+    values = keyword_values(rng.uniform(20, 80, n), 19)
+    values[:, COLUMNS] *= np.exp(rng.normal(0, [0.2, 0.3, 0.5, 0.1], (n, 4)))
+    return values
+
+
+def test_curves_match_material():
+    """Batch curves follow the hardening law of MatCSCM.Evaluate.epsilon_v_p."""
+    mat = MatCSCM(f_c=35)
+    values = keyword_values(np.array([35.0]), 19, rev=Revision.REV_2)
+    curves = hydrostatic_curves(values, num_points=50)
+    X = 3 * curves['pressure'][0]
+    assert np.allclose(curves['plastic_volumetric_strain'][0], mat.evaluate.epsilon_v_p(X, Revision.REV_2))
+    assert np.isclose(curves['plastic_volumetric_strain'][0, -1], 0.99 * values[0, FIELD_INDEX['W']])
+    assert np.all(curves['volumetric_strain'] >= curves['plastic_volumetric_strain'])
+    assert mat.evaluate.hydrostatic_compression_parameters(0.0, Revision.REV_2) == 0
+    # Hardening starts at the initial cap, not at kappa_0
+    X_i = initial_cap(values)[0]
+    assert X_i > values[0, FIELD_INDEX['X0']]
+    assert mat.evaluate.hydrostatic_compression_parameters(X_i, Revision.REV_2) == 0
+
+
+def test_triaxial_preload_matches_curves():
+    """The TXC preload strain is continuous in p_c and follows hydrostatic_curves."""
+    values = keyword_values(np.array([40.0, 70.0]), 19)
+    X_i = initial_cap(values)
+    confinement = np.linspace(0, 1.5 * X_i.max() / 3, 301)
+    # Only the preload: the volume strain of the first step, before any axial strain
+    result = triaxial_compression(values, confinement, max_strain=0, num_points=1, curves=True)
+    K = values[:, [FIELD_INDEX['K']]]
+    plastic = result['volumetric_strain'][:, :, 0] - confinement / K
+    curves = hydrostatic_curves(values, confinement)
+    assert np.allclose(plastic, curves['plastic_volumetric_strain'], atol=1e-12)
+    assert np.all(plastic[:, confinement <= X_i.min() / 3] == 0)
+    assert np.max(np.abs(np.diff(plastic, axis=1))) < 0.01 * values[:, FIELD_INDEX['W']].max()
+
+
+def test_fit_recovers_parameters():
+    """Exact and noisy curves of many specimens are fitted together."""
+    values = _materials(300)
+    curves = hydrostatic_curves(values, num_points=40)
+    fit = fit_hydrostatic(curves['pressure'], curves['volumetric_strain'], bulk_modulus=values[:, FIELD_INDEX['K']])
+    assert fit.converged.all()
+    expected = np.column_stack([values[:, COLUMNS[:3]], initial_cap(values)])
+    assert np.allclose(fit.parameters(), expected, rtol=1e-8)
+    assert np.allclose(fit.apply(values), values, equal_nan=True)
+
+    noise = np.random.default_rng(1).normal(0, 1e-4, curves['pressure'].shape)
+    noisy = fit_hydrostatic(curves['pressure'], curves['plastic_volumetric_strain'] + noise)
+    assert np.median(np.abs(noisy.W / values[:, FIELD_INDEX['W']] - 1)) < 0.01
+    assert np.all(noisy.rms < 2e-4)
+
+
+def test_ragged_fixed_and_parallel():
+    """Curves of different lengths, fixed parameters and worker chunks."""
+    values = _materials(6, seed=2)
+    curves = hydrostatic_curves(values, num_points=60)
+    pressure = [curves['pressure'][i, :30 + 5 * i] for i in range(6)]
+    strain = [curves['plastic_volumetric_strain'][i, :30 + 5 * i] for i in range(6)]
+    X_i = initial_cap(values)
+    fit = fit_hydrostatic(pressure, strain, fixed={'X_i': X_i}, workers=2, chunk_size=3)
+    assert np.array_equal(fit.X_i, X_i)
+    assert np.allclose(fit.apply(values), values, rtol=1e-6, equal_nan=True)
+    assert len(fit.report().splitlines()) == 7
+
+    # A law without quadratic term: D2 held at zero is reported as zero
+    linear = values.copy()
+    linear[:, FIELD_INDEX['D2']] = 0
+    curves = hydrostatic_curves(linear, num_points=40)
+    fit = fit_hydrostatic(curves['pressure'], curves['plastic_volumetric_strain'], fixed={'D2': 0.0})
+    assert np.all(fit.D2 == 0)
+    assert np.allclose(fit.D1, linear[:, FIELD_INDEX['D1']], rtol=1e-6)
+    assert np.array_equal(fit.apply(linear)[:, FIELD_INDEX['D2']], np.zeros(6))
+
+
+if __name__ == "__main__":
+    test_curves_match_material()
+    test_triaxial_preload_matches_curves()
+    test_fit_recovers_parameters()
+    test_ragged_fixed_and_parallel()
+    print("✅ All hydrostatic tests passed!")
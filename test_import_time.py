@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Tests that computational modules stay import-light.
+"""
+
+import matplotlib
+matplotlib.use('Agg')
+
+from bench_import_time import MODULES, import_time
+
+
+def test_computational_modules_do_not_import_matplotlib():
+    """Importing computational modules must not load matplotlib."""
+    for module in MODULES:
+        elapsed, loads_matplotlib = import_time(module, repeats=1)
+        assert not loads_matplotlib, f"{module} imports matplotlib"
+
+
+def test_lazy_plot_helpers():
+    """Plot helpers are still reachable through MatCSCM."""
+    import MatCSCM
+    import cscm_plots
+    from MatCSCM import plot_cscm_compression, plot_elastic_compression_curve
+    assert plot_cscm_compression is cscm_plots.plot_cscm_compression
+    assert plot_elastic_compression_curve is cscm_plots.plot_elastic_compression_curve
+
+    mat = MatCSCM.MatCSCM(f_c=35, dmax=19)
+    plot = mat.evaluate.plot_cscm_compression(num_points=50)
+    plot.close('all')
+
+
+def test_cached_elastic_modulus_inputs():
+    """Scalars share the cached modulus; arrays bypass the cache instead of raising."""
+    import numpy as np
+    import theory
+    assert theory.G(30) == theory.G(np.float64(30)) == theory.G(np.array(30.0))
+    assert theory.K(45.0) == theory.K(np.array(45.0))
+
+    lookup = theory._ceb_elastic_modulus
+    try:
+        theory._ceb_elastic_modulus = lambda f_c: 1000 * np.asarray(f_c)
+        hits = theory._cached_elastic_modulus.cache_info().currsize
+        assert np.allclose(theory._elastic_modulus(np.array([30.0, 40.0])), [30000, 40000])
+        assert theory._cached_elastic_modulus.cache_info().currsize == hits
+    finally:
+        theory._ceb_elastic_modulus = lookup
+
+
+if __name__ == "__main__":
+    test_computational_modules_do_not_import_matplotlib()
+    test_lazy_plot_helpers()
+    test_cached_elastic_modulus_inputs()
+    print("✅ All import tests passed!")
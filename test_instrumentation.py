@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Tests for the material-point driver instrumentation.
+"""
+
+import numpy as np
+
+from MatCSCM import MatCSCM
+from instrumentation import DriverProbe
+
+
+def test_probe_does_not_change_response():
+    """Instrumented and plain runs produce identical curves."""
+    mat = MatCSCM(f_c=35, dmax=19)
+    strains, stresses = mat.evaluate.uniaxial_compression_response(num_points=200)
+    probe = DriverProbe(trace_size=10)
+    strains_p, stresses_p = mat.evaluate.uniaxial_compression_response(num_points=200, probe=probe)
+    assert np.array_equal(strains, strains_p)
+    assert np.array_equal(stresses, stresses_p)
+
+
+def test_probe_counters_and_trace():
+    """Counters cover every step and the trace keeps the last steps in order."""
+    mat = MatCSCM(f_c=35, dmax=19)
+    probe = DriverProbe(trace_size=10)
+    strains, stresses = mat.evaluate.uniaxial_compression_response(num_points=200, probe=probe)
+
+    assert probe.counters['steps'] == 200
+    assert probe.counters['elastic'] + probe.counters['plastic'] == 200
+    assert all(value >= 0.0 for value in probe.timers.values())
+
+    trace = probe.trace
+    assert len(trace) == 10
+    assert np.array_equal(trace.step, np.arange(190, 200))
+    assert np.allclose(trace.stress, stresses[190:])
+    assert 'steps' in probe.summary()
+
+
+def test_probe_without_trace_or_timers():
+    """Disabled tracing and timers leave an empty trace and zero timers."""
+    mat = MatCSCM(f_c=35, dmax=19)
+    probe = DriverProbe(timers=False)
+    mat.evaluate.uniaxial_compression_response(num_points=50, probe=probe)
+    assert len(probe.trace) == 0
+    assert all(value == 0.0 for value in probe.timers.values())
+    assert probe.counters['steps'] == 50
+
+
+if __name__ == "__main__":
+    test_probe_does_not_change_response()
+    test_probe_counters_and_trace()
+    test_probe_without_trace_or_timers()
+    print("✅ All instrumentation tests passed!")
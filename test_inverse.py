@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Tests for the inverse identification of *MAT_CSCM parameter sets.
+"""
+
+import os
+import tempfile
+
+import numpy as np
+
+from MatCSCM import MatCSCM, Revision
+from batch_params import keyword_values
+from deck_writer import write_deck
+from inverse import identify_concrete
+
+
+def test_recover_strength_and_aggregate_size():
+    """Cards generated from known concretes give back their f_c and dmax."""
+    rng = np.random.default_rng(3)
+    f_c = rng.uniform(20, 90, 300)
+    dmax = rng.uniform(8, 32, 300)
+    result = identify_concrete(keyword_values(f_c, dmax))
+    assert np.allclose(result.f_c, f_c, rtol=1e-5)
+    assert np.allclose(result.dmax, dmax, rtol=1e-5)
+    assert np.all(result.misfit < 1e-10)
+    assert np.allclose(result.fitted_values(), keyword_values(f_c, dmax), rtol=1e-5, equal_nan=True)
+
+    fixed = identify_concrete(keyword_values(f_c[:5], 19), fit_dmax=False)
+    assert np.allclose(fixed.f_c, f_c[:5], rtol=1e-5) and np.all(fixed.dmax == 19)
+
+
+def test_revision_classification():
+    """The candidate revision that produced a card has the smallest misfit."""
+    f_c = np.array([25.0, 48.0, 70.0])
+    revisions = tuple(Revision)
+    for rev in revisions:
+        result = identify_concrete(keyword_values(f_c, 19, rev=rev), revisions=revisions)
+        assert all(found is rev for found in result.revision)
+        assert np.allclose(result.f_c, f_c, rtol=1e-4)
+
+
+def test_unidentified_targets():
+    """Targets without a finite misfit are reported as unidentified."""
+    values = keyword_values(np.array([30.0, 60.0]), 19)
+    values[1, 9] = np.inf
+    result = identify_concrete(values)
+    assert result.revision == [Revision.REV_2, None]
+    fitted = result.fitted_values()
+    assert np.allclose(fitted[0], keyword_values(30.0, 19)[0], rtol=1e-5, equal_nan=True)
+    assert np.all(np.isnan(fitted[1]))
+    assert result.report().splitlines()[2].split()[1:] == ['-', '-', '-', '-']
+
+
+def test_deck_targets():
+    """Legacy decks are read with their material IDs."""
+    materials = [MatCSCM(f_c=30, mid=7), MatCSCM(f_c=55, dmax=12, mid=8)]
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, 'legacy.k')
+        write_deck(materials, path)
+        result = identify_concrete(path)
+    assert result.mids == [7, 8]
+    # Printed cards are rounded, so the recovery is approximate
+    assert np.allclose(result.f_c, [30, 55], rtol=1e-3)
+    assert np.allclose(result.dmax, [19, 12], rtol=1e-2)
+    assert result.report().splitlines()[1].split()[0] == '7'
+
+
+if __name__ == "__main__":
+    test_recover_strength_and_aggregate_size()
+    test_revision_classification()
+    test_unidentified_targets()
+    test_deck_targets()
+    print("✅ All inverse tests passed!")
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Tests for *DEFINE_CURVE export with point reduction.
+"""
+
+import io
+
+import numpy as np
+
+from load_curves import CURVE_NAMES, material_curves, simplify_curve, simplify_curves, write_material_curves
+
+
+def test_reduction_error_bound():
+    """Reduced curves stay within the tolerance of every original point."""
+    x = np.linspace(0, 10, 400)
+    curves = [np.vstack((x, np.sin(x))), np.vstack((x, 2 * x + 1)), np.vstack((x[:2], [0, 1]))]
+    curves += [material[name] for material in material_curves([25, 60]) for name in CURVE_NAMES]
+    reduced = simplify_curves(curves, rtol=1e-3)
+    assert reduced[1].shape == (2, 2) and reduced[2].shape == (2, 2)
+    for curve, small in zip(curves, reduced):
+        curve = curve[:, np.concatenate(([True], np.diff(curve[0]) > 0))]
+        assert small[0, 0] == curve[0, 0] and small[0, -1] == curve[0, -1]
+        error = np.abs(np.interp(curve[0], *small) - curve[1])
+        assert np.max(error) <= 1e-3 * np.max(np.abs(curve[1])) + 1e-12
+    assert sum(curve.shape[1] for curve in reduced) < sum(curve.shape[1] for curve in curves) / 4
+
+    assert simplify_curve(curves[0], atol=0.5).shape[1] < simplify_curve(curves[0], atol=0.01).shape[1]
+    assert simplify_curve(curves[0], rtol=0).shape[1] == 400
+
+
+def test_define_curve_output():
+    """Materials get consecutive unique LCIDs and parseable *DEFINE_CURVE cards."""
+    out = io.StringIO()
+    lcids = write_material_curves([30, 40, 50], out, dmax=[16, 19, 32], first_lcid=101)
+    assert lcids.shape == (3, len(CURVE_NAMES)) and list(lcids.ravel()) == list(range(101, 116))
+    blocks = out.getvalue().split('*DEFINE_CURVE_TITLE\n')[1:]
+    assert len(blocks) == 15 and blocks[0].startswith('compression f_c=30 dmax=16\n')
+    lines = blocks[-1].splitlines()
+    assert int(lines[2][:10]) == 115
+    points = np.array([[float(line[:20]), float(line[20:40])] for line in lines[4:]])
+    assert np.all(np.diff(points[:, 0]) > 0) and points[0, 1] == 1
+
+    text = write_material_curves(35, names=('dif_tension',))[1]
+    assert text.count('*DEFINE_CURVE_TITLE') == 1
+
+
+if __name__ == "__main__":
+    test_reduction_error_bound()
+    test_define_curve_output()
+    print("✅ All load curve tests passed!")
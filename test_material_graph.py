@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Tests for the lazy, invalidation-aware evaluation of MatCSCM quantities.
+"""
+
+import pickle
+
+import numpy as np
+
+from MatCSCM import MatCSCM, Revision
+from cscm_keyword import CSCM_FIELDS
+
+
+def test_esize_invalidates_softening_only():
+    """Changing the element size recomputes B, D and the damage outputs only."""
+    mat = MatCSCM(f_c=40)
+    values = mat.keyword_values()
+    mat.initialize.B(Revision.REV_2)
+    mat.evaluate.uniaxial_compression_response(num_points=100)
+    before = dict(mat.graph.evaluations)
+
+    mat.esize = 100
+    updated = mat.keyword_values()
+    mat.initialize.B(Revision.REV_2)
+    mat.evaluate.uniaxial_compression_response(num_points=100)
+    recomputed = {name for name, count in mat.graph.evaluations.items() if count > before.get(name, 0)}
+    assert {name[0] for name in recomputed} == {
+        'MatCSCM.keyword_values', 'MatCSCM.Initialize.B', 'MatCSCM.Initialize.D',
+        'MatCSCM.Evaluate.uniaxial_compression_response'}
+    assert mat.graph.evaluations['ceb_data'] == 1
+    assert np.array_equal(updated, MatCSCM(f_c=40).keyword_values(), equal_nan=True)
+    assert mat.initialize.B(Revision.REV_2) != MatCSCM(f_c=40).initialize.B(Revision.REV_2)
+    assert np.array_equal(values, updated, equal_nan=True)  # B/D of REV_1 do not depend on esize
+
+
+def test_strength_change_matches_new_object():
+    """Cached results follow input changes and equal those of a fresh object."""
+    mat = MatCSCM(f_c=30)
+    mat.keyword_values()
+    mat.f_c = 50
+    assert mat.graph.evaluations['ceb_data'] == 1
+    assert np.array_equal(mat.keyword_values(), MatCSCM(f_c=50).keyword_values(), equal_nan=True)
+    assert mat.ceb_data.f_c == 50
+    strains, stresses = mat.evaluate.uniaxial_compression_response(num_points=50)
+    assert np.allclose(stresses, MatCSCM(f_c=50).evaluate.uniaxial_compression_response(num_points=50)[1])
+    # Callers get writeable copies; the cache is unaffected by their changes
+    stresses[:] = 0
+    values = mat.keyword_values()
+    values[1] = -1
+    assert mat.evaluate.uniaxial_compression_response(num_points=50)[1].any()
+    assert mat.keyword_values()[1] != -1
+
+    copy = pickle.loads(pickle.dumps(mat))
+    assert copy.f_c == 50 and copy.graph.evaluations['ceb_data'] == 0
+    assert np.array_equal(copy.keyword_values(), mat.keyword_values(), equal_nan=True)
+
+
+def test_ceb_data_assignment():
+    """Assigned CEB data is used until f_c or dmax change."""
+    mat = MatCSCM(f_c=30)
+    mat.initialize.D(Revision.REV_2)
+    before = mat.keyword_values()
+    mat.ceb_data = MatCSCM(f_c=45).ceb_data
+    assert mat.ceb_data.f_c == 45
+    # Results that depend on the CEB data are recomputed from the assigned data
+    assert mat.initialize.D(Revision.REV_2) == MatCSCM(f_c=45).initialize.D(Revision.REV_2)
+    # The keyword takes the elastic and fracture properties of the assigned data
+    after = mat.keyword_values()
+    G = CSCM_FIELDS.index('G')
+    assert after[G] == mat.ceb_data.G and after[G] != before[G]
+    assert mat.generate_keyword()['G']['value'] == after[G]
+    mat.dmax = 16
+    assert mat.ceb_data.f_c == 30 and mat.ceb_data.d_max == 16
+
+
+if __name__ == "__main__":
+    test_esize_invalidates_softening_only()
+    test_strength_change_matches_new_object()
+    test_ceb_data_assignment()
+    print("✅ All material graph tests passed!")
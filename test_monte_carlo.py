@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Tests for the Monte Carlo uncertainty propagation.
+"""
+
+import io
+
+import numpy as np
+
+from batch_params import keyword_values
+from monte_carlo import monte_carlo, sample
+
+
+def test_distributions():
+    """Sampled moments and bounds follow the distribution specifications."""
+    rng = np.random.default_rng(0)
+    normal = sample(('normal', 35.0, 5.0, 30.0, 40.0), 20000, rng)
+    assert normal.min() >= 30.0 and normal.max() <= 40.0
+    # Bounds far in a tail: mean of N(0, 1) on [8, 9] is close to 8.12
+    tail = sample(('normal', 0.0, 1.0, 8.0, 9.0), 20000, rng)
+    assert tail.min() >= 8.0 and tail.max() <= 9.0 and abs(tail.mean() - 8.121) < 0.01
+    upper = sample(('normal', 0.0, 1.0, 1.0, np.inf), 200000, rng)
+    assert abs(upper.mean() - 1.525) < 0.01
+    lower = sample(('normal', 0.0, 1.0, 1.0), 200000, rng)
+    assert lower.min() >= 1.0 and abs(lower.mean() - 1.525) < 0.01
+    for invalid in (('normal', 35.0, 5.0, 40.0, 30.0), ('normal', 0.0, 1.0, 40.0, 50.0),
+                    ('normal', 35.0), ('uniform', 1.0, 2.0, 3.0), ('weibull', 1.0, 2.0)):
+        try:
+            sample(invalid, 10, rng)
+            assert False
+        except ValueError:
+            pass
+    lognormal = sample(('lognormal', 35.0, 5.0), 200000, rng)
+    assert abs(lognormal.mean() - 35.0) < 0.1 and abs(lognormal.std() - 5.0) < 0.1
+    assert np.all(sample(19.0, 3, rng) == 19.0)
+    assert np.all(sample(lambda rng, n: np.arange(n), 3, rng) == [0, 1, 2])
+
+
+def test_propagation_is_reproducible():
+    """Results depend on the seed only, not on the number of workers."""
+    options = dict(f_c=('normal', 40.0, 4.0), dmax=('uniform', 8.0, 32.0), seed=7, chunk_size=25)
+    serial = monte_carlo(100, workers=1, num_points=50, **options)
+    parallel = monte_carlo(100, workers=2, num_points=50, **options)
+    assert np.array_equal(serial.values, parallel.values)
+    assert np.array_equal(serial.outputs['peak_stress'], parallel.outputs['peak_stress'])
+    expected = keyword_values(serial.inputs['f_c'], serial.inputs['dmax'])
+    assert np.allclose(serial.values[:, 9:], expected[:, 9:])
+    percentiles = serial.percentiles((50,))
+    assert np.isclose(percentiles['f_c'][0], np.median(serial.inputs['f_c']))
+    assert 'peak_stress' in serial.report()
+
+
+def test_stochastic_field():
+    """Every part gets its own sampled material and MID."""
+    result = monte_carlo(10, f_c=('uniform', 30.0, 50.0), seed=1)
+    out = io.StringIO()
+    deck = result.write_field_deck(['a', 'b', 'c'], out, first_mid=500)
+    assert deck['part_mids'] == {'a': 500, 'b': 501, 'c': 502}
+    assert out.getvalue().count('*MAT_CSCM') == 3
+    try:
+        result.stochastic_field(range(11))
+        assert False, "Expected ValueError"
+    except ValueError:
+        pass
+
+
+if __name__ == "__main__":
+    test_distributions()
+    test_propagation_is_reproducible()
+    test_stochastic_field()
+    print("✅ All Monte Carlo tests passed!")
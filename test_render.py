@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Tests for headless batch rendering.
+"""
+
+import os
+import tempfile
+
+import matplotlib
+matplotlib.use('Agg')
+import numpy as np
+
+import plotcurves
+from render import Renderer, render_batch, render_compression_family
+
+
+def _jobs():
+    x = np.linspace(0, 1, 20)
+    stile = plotcurves.plotStile(title='DIF', xLabel='x', yLabel='y')
+    curve = {'array': [x, x**2], 'lable': 'a', 'color': 'blue', 'linestyle': '-', 'linewidth': 2}
+    return [
+        ('curves', (stile, curve), 'curves'),
+        ('single_curve', (x, x, 'single', 'x', 'y'), 'single'),
+        ('two_curves', (x, x, -x, 'two'), 'two'),
+        ('cscm_compression', (x / 100, 40 * x, 35, 19, 0.01), 'compression'),
+        (lambda ax, y: ax.plot(y), (x,), 'custom'),
+    ]
+
+
+def test_render_batch():
+    """Every plot kind is exported in every format, in process and in workers."""
+    with tempfile.TemporaryDirectory() as folder:
+        files = render_batch(_jobs(), folder, formats=('png', 'svg'), workers=1)
+        assert len(files) == 10
+        assert all(os.path.getsize(name) > 0 for name in files)
+        assert files[0] == os.path.join(folder, 'curves.png')
+
+        parallel = render_batch(_jobs()[:4], os.path.join(folder, 'parallel'), workers=2, chunk_size=2)
+        assert [os.path.basename(name) for name in parallel] == [
+            'curves.png', 'single.png', 'two.png', 'compression.png']
+
+
+def test_figure_reuse_and_family():
+    """Figures are reused across plots; a family renders one plot per grade."""
+    renderer = Renderer()
+    first, ax = renderer.figure((10, 6), 'cscm_compression')
+    second, same = renderer.figure((10, 6), 'cscm_compression')
+    third, other = renderer.figure((10, 6), 'single_curve')
+    assert first is second is third and ax is same and other is not ax
+
+    with tempfile.TemporaryDirectory() as folder:
+        files = render_compression_family([25, 40.5], directory=folder, workers=1, num_points=50)
+        assert [os.path.basename(name) for name in files] == ['compression_fc25.png', 'compression_fc40.5.png']
+
+
+def test_interactive_wrappers():
+    """The pyplot functions still draw through the shared drawing code."""
+    x = np.linspace(0, 1, 20)
+    plotcurves.plotSingleCurve(x, x, 'single', 'x', 'y')
+    plotcurves.plotTwoCurves(x, x, -x, 'two')
+    ax = plotcurves.plt.gca()
+    assert ax.get_title() == 'two' and len(ax.get_lines()) == 2
+    plotcurves.plt.close('all')
+
+
+if __name__ == "__main__":
+    test_render_batch()
+    test_figure_reuse_and_family()
+    test_interactive_wrappers()
+    print("✅ All render tests passed!")
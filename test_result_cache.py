@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Tests for the persistent result cache.
+"""
+
+import os
+import tempfile
+
+import numpy as np
+
+from MatCSCM import MatCSCM, Revision
+from result_cache import ResultCache, ceb_curves, compression_response
+
+
+def test_key_is_stable():
+    """Equal inputs give equal keys, any changed input a different key."""
+    with tempfile.TemporaryDirectory() as folder:
+        cache = ResultCache(folder)
+        key = cache.key('f', Revision.REV_2, {'f_c': 35.0, 'esize': 200}, np.arange(3.0))
+        assert key == cache.key('f', Revision.REV_2, {'esize': 200, 'f_c': np.float64(35.0)}, np.arange(3.0))
+        assert key != cache.key('f', Revision.REV_3, {'f_c': 35.0, 'esize': 200}, np.arange(3.0))
+        assert key != cache.key('f', Revision.REV_2, {'f_c': 35.0 + 1e-12, 'esize': 200}, np.arange(3.0))
+
+
+def test_compression_response_cached():
+    """The second call is served from disk with identical, memory mapped results."""
+    with tempfile.TemporaryDirectory() as folder:
+        cache = ResultCache(folder)
+        mat = MatCSCM(f_c=40)
+        strains, stresses = compression_response(mat, num_points=200, cache=cache)
+        cached_strains, cached_stresses = compression_response(mat, num_points=200, cache=cache)
+        assert isinstance(cached_stresses, np.memmap)
+        assert np.array_equal(stresses, cached_stresses)
+        assert np.array_equal(strains, cached_strains)
+        mat.esize = 100
+        compression_response(mat, num_points=200, cache=cache)
+        assert cache.stats()['hits'] == 1
+        assert cache.stats()['misses'] == 2
+        assert len(ResultCache(folder)) == 2
+
+        # Assigned CEB data is part of the key
+        mat.ceb_data = MatCSCM(f_c=50).ceb_data
+        strains, stresses = compression_response(mat, num_points=200, cache=cache)
+        assert cache.stats()['hits'] == 1
+        assert np.allclose(stresses, mat.evaluate.uniaxial_compression_response(num_points=200)[1])
+
+
+def test_lru_eviction():
+    """The least recently used entry is evicted when the size limit is exceeded."""
+    with tempfile.TemporaryDirectory() as folder:
+        cache = ResultCache(folder, max_bytes=10**6)
+        first = ceb_curves(30, cache=cache)
+        ceb_curves(40, cache=cache)
+        entry_size = cache.size() // 2
+        for name in os.listdir(folder):
+            os.utime(os.path.join(folder, name), (0, 0))
+        # Using the f_c=30 entry leaves f_c=40 as the least recently used one
+        assert np.array_equal(ceb_curves(30, cache=cache)['compression_curve'], first['compression_curve'])
+        cache.max_bytes = 2 * entry_size
+        ceb_curves(50, cache=cache)
+        assert cache.stats()['evictions'] == 1
+        assert len(cache) == 2
+        hits = cache.hits
+        ceb_curves(30, cache=cache)
+        assert cache.hits == hits + 1
+        assert 'Evictions: 1' in cache.report()
+
+
+if __name__ == "__main__":
+    test_key_is_stable()
+    test_compression_response_cached()
+    test_lru_eviction()
+    print("✅ All result cache tests passed!")
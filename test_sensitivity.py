@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Tests for the sensitivity analysis of the compression driver.
+"""
+
+import tempfile
+
+import numpy as np
+
+from result_cache import ResultCache
+from sensitivity import SensitivityAnalysis
+
+
+def test_sobol_indices():
+    """Elastic peak stress is governed by the moduli, inactive fields have zero indices."""
+    analysis = SensitivityAnalysis(('G', 'K', 'ALPHA', 'W'), cache=False, num_points=50,
+                                   max_strain=0.01)
+    indices = analysis.sobol(2048)['peak_stress']
+    assert indices['ST'][0] > 0.8
+    assert 0 < indices['ST'][1] < 0.2
+    assert np.all(indices['S1'][2:] == 0) and np.all(indices['ST'][2:] == 0)
+    assert abs(indices['S1'][:2].sum() - 1) < 0.1
+    # No softening before the peak: constant outputs have undefined indices
+    assert np.all(np.isnan(analysis.sobol(16)['softening_slope']['ST']))
+
+
+def test_default_design():
+    """Default outputs vary over the default strain range, ignored fields are rejected."""
+    analysis = SensitivityAnalysis(cache=False, num_points=50)
+    for measures in analysis.sobol(16).values():
+        assert np.all(np.isfinite(measures['ST'])) and measures['ST'].max() > 0
+    try:
+        SensitivityAnalysis(('G', 'GFT'), cache=False)
+        assert False, 'GFT is not read by the driver'
+    except ValueError as error:
+        assert 'GFT' in str(error)
+
+
+def test_morris_and_incremental_cache():
+    """Extended designs reuse cached blocks and give the same leading results."""
+    with tempfile.TemporaryDirectory() as folder:
+        cache = ResultCache(folder)
+        analysis = SensitivityAnalysis(('G', 'B', 'W'), cache=cache, num_points=50, block_size=8,
+                                       max_strain=0.01)
+        small = analysis.morris(4)
+        assert cache.stats()['misses'] == 2
+        analysis.morris(8)
+        assert cache.stats()['hits'] == 2
+        assert cache.stats()['misses'] == 2 + 2
+        mu_star = small['peak_stress']['mu_star']
+        assert mu_star[0] > mu_star[1] > 0 and mu_star[2] == 0
+        report = analysis.report(small)
+        assert report.splitlines()[2].startswith('G')
+
+
+if __name__ == "__main__":
+    test_sobol_indices()
+    test_default_design()
+    test_morris_and_incremental_cache()
+    print("✅ All sensitivity tests passed!")
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Tests for the process-pool sweep executor.
+"""
+
+import tempfile
+
+import numpy as np
+
+from MatCSCM import MatCSCM, Revision
+from batch_params import keyword_values
+from sweep_executor import grid_coordinates, run_sweep, sweep_grid
+
+
+def test_deterministic_order():
+    """Rows follow the grid order independently of workers and chunking."""
+    grid = sweep_grid([20, 35, 50], [16, 32], [100, 200], [Revision.REV_2, Revision.REV_3])
+    serial = run_sweep(grid, workers=1)
+    parallel = run_sweep(grid, workers=2, chunk_size=5)
+    assert np.array_equal(serial['values'], parallel['values'])
+    assert len(serial['values']) == 24
+    row = 1 * 8 + 1 * 4 + 0 * 2 + 1  # f_c=35, dmax=32, esize=100, REV_3
+    assert serial['f_c'][row] == 35 and serial['dmax'][row] == 32
+    assert serial['esize'][row] == 100 and serial['revision'][row] == Revision.REV_3.value
+    expected = keyword_values(35, 32, 100, Revision.REV_3, Revision.REV_2)[0]
+    assert np.allclose(serial['values'][row], expected)
+
+
+def test_driver_curves_and_store():
+    """Driver curves and a SweepStore target hold the same results."""
+    grid = sweep_grid([30, 45], [19], [150])
+    progress = []
+    result = run_sweep(grid, workers=2, chunk_size=1, num_points=40,
+                       progress=lambda done, total, elapsed: progress.append(done))
+    assert sorted(progress) == [1, 2]
+    mat = MatCSCM(f_c=45, dmax=19)
+    strains, stresses = mat.evaluate.uniaxial_compression_response(0.01, 40)
+    assert np.allclose(result['strains'], strains)
+    assert np.allclose(result['stresses'][1], stresses)
+    with tempfile.TemporaryDirectory() as folder:
+        store = run_sweep(grid, workers=2, chunk_size=1, num_points=40, store=folder)
+        assert store.written.all()
+        assert np.allclose(store.values(), result['values'])
+        assert np.allclose(store.curve('stress', 1), stresses)
+        assert np.array_equal(store.columns['f_c'], grid_coordinates(grid)['f_c'])
+
+
+if __name__ == "__main__":
+    test_deterministic_order()
+    test_driver_curves_and_store()
+    print("✅ All sweep executor tests passed!")
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Tests for the memory-mapped sweep result store.
+"""
+
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from MatCSCM import MatCSCM
+from sweep_store import SweepStore
+
+
+def _fill(args):
+    """Fill a row slice of a store from a separate process."""
+    directory, start, stop = args
+    store = SweepStore.open(directory, 'r+')
+    mats = [MatCSCM(f_c=20 + row) for row in range(start, stop)]
+    store.write(start, np.vstack([mat.keyword_values() for mat in mats]),
+                f_c=[mat.f_c for mat in mats], dmax=19.0)
+    for row in range(start, stop):
+        store.set_curve('stress', row, np.arange(row % 5, dtype=float))
+    store.flush()
+    return stop - start
+
+
+def test_parallel_writers():
+    """Processes filling disjoint slices produce a complete, queryable store."""
+    with tempfile.TemporaryDirectory() as folder:
+        SweepStore.create(folder, 40, curves={'stress': 4 + np.arange(40) % 2})
+        with ProcessPoolExecutor(2) as executor:
+            assert sum(executor.map(_fill, [(folder, 0, 20), (folder, 20, 40)])) == 40
+        store = SweepStore.open(folder)
+        assert store.written.all()
+        assert np.array_equal(store.columns['f_c'], 20 + np.arange(40))
+        assert np.allclose(store.values([5])[0], MatCSCM(f_c=25).keyword_values(), equal_nan=True)
+        assert np.array_equal(store.curve('stress', 7), np.arange(2.0))
+        rows = store.where(f_c=(30, 34), dmax=19.0)
+        assert np.array_equal(rows, np.arange(10, 15))
+        assert np.isnan(store.columns['esize']).all()
+
+
+def test_capacity_and_unwritten_rows():
+    """Curves beyond their capacity are rejected and unwritten rows never match."""
+    with tempfile.TemporaryDirectory() as folder:
+        store = SweepStore.create(folder, 10, columns=('f_c',), curves={'stress': 3})
+        store.write(0, f_c=np.full(5, 30.0))
+        try:
+            store.set_curve('stress', 0, np.zeros(4))
+            assert False, "Expected ValueError"
+        except ValueError:
+            pass
+        store.columns['f_c'][5:] = 30.0
+        assert np.array_equal(store.where(f_c=30.0, chunk_size=3), np.arange(5))
+        assert len(store.curve('stress', 9)) == 0
+
+
+if __name__ == "__main__":
+    test_parallel_writers()
+    test_capacity_and_unwritten_rows()
+    print("✅ All sweep store tests passed!")
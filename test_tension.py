@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Tests for the vectorized uniaxial tension driver.
+"""
+
+import os
+import tempfile
+
+import numpy as np
+
+from CEB import CEBClass
+from MatCSCM import Revision
+from batch_params import keyword_values
+from cscm_keyword import FIELD_INDEX
+from tension import render_tension_family, softening_rate, tensile_strength, tension_family, uniaxial_tension
+
+SIZES = [25, 100, 400]
+
+
+def test_strength_and_energy():
+    """The peak is the surface tensile strength and G_ft is dissipated at every size."""
+    result = tension_family([20, 40, 80], SIZES, softening_rev=Revision.REV_2, num_points=800)
+    assert result['stresses'].shape == (3, 3, 800)
+    assert np.allclose(result['stresses'].max(axis=2), result['f_t'])
+    ceb = np.array([CEBClass(f_c=f_c, d_max=19).f_t for f_c in (20, 40, 80)])
+    assert np.allclose(result['f_t'][:, 0], ceb, rtol=0.1)
+    assert np.allclose(result['energy'], result['G_ft'], rtol=1e-3)
+    assert not result['snapback'].any()
+    # Damage grows monotonically and the crack opens monotonically
+    assert np.all(np.diff(result['damage'], axis=2) >= 0)
+    assert np.all(np.diff(result['crack_opening'], axis=2) >= -1e-12)
+
+    legacy = tension_family([20, 40, 80], SIZES, softening_rev=Revision.REV_1, num_points=800)
+    assert np.allclose(legacy['energy'], legacy['G_ft'], rtol=1e-3)
+
+
+def test_strength_follows_tensile_meridian():
+    """The tensile strength responds to the Q_2 columns of the keyword."""
+    values = keyword_values(np.array([40.0, 40.0, 40.0]))
+    values[1, FIELD_INDEX['ALPHA2']] *= 1.2
+    values[2, [FIELD_INDEX[name] for name in ('ALPHA2', 'LAMBDA2', 'THETA2')]] = [0.5, 0.0, 0.0]
+    f_t = tensile_strength(values)
+    assert f_t[1] > 1.1 * f_t[0]
+    # Constant Q_2 = 1/2: f_t / sqrt(3) = F_f(-f_t) / 2
+    p = {name: values[2, FIELD_INDEX[name]] for name in ('ALPHA', 'LAMBDA', 'BETA', 'THETA')}
+    F_f = p['ALPHA'] - p['LAMBDA'] * np.exp(p['BETA'] * f_t[2]) - p['THETA'] * f_t[2]
+    assert np.isclose(f_t[2] / np.sqrt(3), 0.5 * F_f)
+
+
+def test_batch_matches_single_runs():
+    """Rows of a batch equal separate runs."""
+    f_c = np.array([30.0, 60.0])
+    esize = np.array([50.0, 300.0])
+    batch = uniaxial_tension(keyword_values(f_c, esize=esize), esize)
+    for i in range(2):
+        single = uniaxial_tension(keyword_values(f_c[i:i + 1], esize=esize[i]), esize[i])
+        assert np.allclose(single['stresses'][0], batch['stresses'][i])
+        assert np.isclose(single['energy'][0], batch['energy'][i])
+
+
+def test_snapback():
+    """Elements too large for G_ft drop to residual stress right after the peak."""
+    C, snapback = softening_rate([3.0, 3.0], 30000, 1.0, 0.1, [100, 1000])
+    assert list(snapback) == [False, True]
+    assert np.isfinite(C[0]) and np.isinf(C[1])
+
+    values = keyword_values(np.array([40.0]), esize=5000)
+    result = uniaxial_tension(values, 5000)
+    assert result['snapback'][0]
+    assert np.isclose(result['stresses'][0, -1], result['f_t'][0] * 0.01)
+
+
+def test_render_overlay():
+    """Every grade gets a tension and a crack opening plot."""
+    with tempfile.TemporaryDirectory() as directory:
+        files, family = render_tension_family([30, 50], [100, 200], directory=directory, workers=1,
+                                              num_points=200, dpi=40)
+        names = sorted(os.path.basename(name) for name in files)
+        assert names == ['crack_opening_fc30.png', 'crack_opening_fc50.png', 'tension_fc30.png', 'tension_fc50.png']
+        assert all(os.path.getsize(name) > 0 for name in files)
+        assert family['energy'].shape == (2, 2)
+
+
+if __name__ == "__main__":
+    test_strength_and_energy()
+    test_strength_follows_tensile_meridian()
+    test_batch_matches_single_runs()
+    test_snapback()
+    test_render_overlay()
+    print("✅ All tension tests passed!")
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Tests for the batched triaxial compression sweep.
+"""
+
+import numpy as np
+
+from MatCSCM import MatCSCM, Revision
+from batch_params import keyword_values
+from triaxial import triaxial_compression, txc_sweep
+
+CONFINEMENT = [0, 5, 20, 60, 150]
+
+
+def test_envelope_against_txc():
+    """Unconfined peaks reach f_c on TXC; confined peaks rise but stay on or below it."""
+    result = txc_sweep([30, 50], CONFINEMENT, num_points=500)
+    assert result['peak_deviator'].shape == (2, 5)
+    assert np.allclose(result['peak_deviator'][:, 0], [30, 50], rtol=0.03)
+    assert np.allclose(result['peak_sqrt_J2'][:, :2], result['TXC'][:, :2], rtol=1e-6)
+    assert np.all(result['peak_sqrt_J2'] <= result['TXC'] * (1 + 1e-6))
+    assert np.all(np.diff(result['peak_deviator'], axis=1) > 0)
+    assert np.allclose(result['peak_I_1'], 3 * np.array(CONFINEMENT) + result['peak_deviator'])
+
+    mat = MatCSCM(f_c=30)
+    I_1 = result['peak_I_1'][0, :2]
+    assert np.allclose(result['TXC'][0, :2], mat.evaluate.F_f(I_1, Revision.REV_2))
+    assert np.allclose(result['TXC'][0, :2], mat.initialize.TXC(I_1, Revision.REV_2) / 30)
+
+
+def test_batch_matches_single_runs():
+    """Rows of a batch do not interact; curves start elastic."""
+    values = keyword_values(np.array([25.0, 45.0]), 19)
+    batch = triaxial_compression(values, CONFINEMENT, 0.02, 200, curves=True)
+    single = triaxial_compression(values[1:], CONFINEMENT[3:4], 0.02, 200, curves=True)
+    assert np.allclose(batch['deviator'][1, 3], single['deviator'][0, 0])
+    assert batch['deviator'].shape == batch['volumetric_strain'].shape == (2, 5, 200)
+    E = 9 * values[:, 10] * values[:, 9] / (3 * values[:, 10] + values[:, 9])
+    assert np.allclose(batch['deviator'][:, 0, 1], E * batch['strains'][1])
+    assert np.all(batch['volumetric_strain'][:, :, 0] >= 0)
+
+
+def test_damage_softening():
+    """Ductile damage softens the post-peak response."""
+    plain = txc_sweep(35, [0, 10], max_strain=0.02, num_points=300)
+    damaged = txc_sweep(35, [0, 10], max_strain=0.02, num_points=300, damage=True)
+    assert np.all(damaged['final_deviator'] < plain['final_deviator'])
+    try:
+        triaxial_compression(keyword_values(np.array([35.0])), [0], damage=True)
+        assert False
+    except ValueError:
+        pass
+
+
+if __name__ == "__main__":
+    test_envelope_against_txc()
+    test_batch_matches_single_runs()
+    test_damage_softening()
+    print("✅ All triaxial tests passed!")
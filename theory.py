@@ -1,4 +1,28 @@
 import numpy as np
+from functools import lru_cache
+
+
+def _ceb_elastic_modulus(f_c):
+    # CEB imports this module, so the import is deferred to the first call
+    from CEB import CEBClass
+    return CEBClass(f_c=f_c).E
+
+
+@lru_cache(maxsize=256)
+def _cached_elastic_modulus(f_c):
+    return _ceb_elastic_modulus(f_c)
+
+
+def _elastic_modulus(f_c):
+    """CEB-FIP elastic modulus for f_c; scalars are cached across G and K calls."""
+    if isinstance(f_c, np.ndarray):
+        if f_c.ndim == 0:
+            return _cached_elastic_modulus(f_c.item())
+        return _ceb_elastic_modulus(f_c)
+    try:
+        return _cached_elastic_modulus(f_c)
+    except TypeError:  # unhashable input
+        return _ceb_elastic_modulus(f_c)
 
 
 class Theory:
@@ -22,9 +46,7 @@ class Theory:
         float
             Shear modulus G (MPa)
         """ 
-        from CEB import CEBClass
-        ceb = CEBClass(f_c=f_c)
-        E = ceb.E
+        E = _elastic_modulus(f_c)
         nu_value = Theory.nu(f_c)
         return E / (2*(1+nu_value))
 
@@ -41,9 +63,7 @@ class Theory:
         float
             Bulk modulus K (MPa)
         """ 
-        from CEB import CEBClass
-        ceb = CEBClass(f_c=f_c)
-        E = ceb.E
+        E = _elastic_modulus(f_c)
         nu_value = Theory.nu(f_c)
         return E / (3*(1-2*nu_value)) 
 
@@ -0,0 +1,204 @@
+"""
+Vectorized triaxial compression (TXC) sweeps over confining pressures.
+
+Every (material, confinement) pair is one row of a batch that runs through
+the same strain steps, like ``batch_driver.uniaxial_compression``:
+
+1. hydrostatic preload to the confining pressure p_c; the cap moves if
+   3 p_c exceeds it (hardening law and cap position of ``hydrostatic``)
+2. axial compression at constant lateral stress: the stress point moves
+   along I_1 = 3 p_c + q, where q = sigma_axial - sigma_lateral. Plastic
+   steps return it to the shear surface F_f times the cap, by a vectorized
+   bisection along the path. The associated flow rule gives the plastic
+   volume strain that moves the cap.
+
+Stresses and strains are positive in compression. As in ``MatCSCM``, the
+X0 column is kappa_0, the initial intersection of the cap and the shear
+surface. The initial cap sits at X = kappa_0 + R F_f(kappa_0). Kinematic
+pre-peak hardening is not modelled, because the peak is reached on the
+fully hardened surface. The peak envelope (I_1, sqrt(J_2)) can therefore
+be compared directly with the TXC meridian F_f(I_1)
+(``MatCSCM.Evaluate.F_f``; ``Initialize.TXC`` is f_c times larger).
+Ductile damage as in the uniaxial driver can be switched on for post-peak
+curves.
+"""
+
+import numpy as np
+
+from batch_driver import DAMAGE_MAX, driver_parameters
+from cscm_keyword import FIELD_INDEX
+from hydrostatic import _shear_surface, cap_parameter, cap_position, hardened_cap, plastic_volumetric_strain
+
+SQRT3 = np.sqrt(3.0)
+
+# Bisection steps of the stress return
+RETURN_ITERATIONS = 50
+
+
+def _hardened_cap(p, epsilon_v_p, X_i):
+    """Cap position of the hardening law for the plastic volume strain."""
+    return hardened_cap(epsilon_v_p, p['W'], p['D1'], p['D2'], X_i)
+
+
+def _strength(p, I_1, kappa, X):
+    """sqrt(J_2) on the TXC meridian of the shear surface times the cap."""
+    L = np.maximum(kappa, p['kappa_0'])
+    cap = 1 - (np.maximum(I_1 - L, 0) / (X - L))**2
+    return _shear_surface(p, I_1) * np.sqrt(np.maximum(cap, 0))
+
+
+def triaxial_compression(values, confinement, max_strain=0.05, num_points=1000, f_c=None, damage=False,
+                         curves=False):
+    """
+    Triaxial compression responses of many materials at many confinements.
+
+    Parameters:
+    -----------
+    values : numpy.ndarray
+        Keyword field values of shape (n_materials, N_FIELDS)
+    confinement : array_like
+        Confining pressures p_c (MPa)
+    max_strain : float
+        Axial strain of the compression stage (positive value)
+    num_points : int
+        Number of axial strain steps
+    f_c : array_like, optional
+        Compressive strength (MPa) per material; needed for ductile damage
+    damage : bool
+        Apply ductile damage to the deviatoric stress
+    curves : bool
+        Return the deviatoric stress and volume strain curves
+
+    Returns:
+    --------
+    dict
+        'confinement' (n_confinements,), 'strains' (num_points,) and arrays of
+        shape (n_materials, n_confinements): 'peak_deviator' (q at the peak),
+        'peak_I_1' and 'peak_sqrt_J2' (stress invariants at the peak), 'TXC'
+        (F_f at peak_I_1) and 'final_deviator'. With ``curves``: 'deviator'
+        and 'volumetric_strain' of shape (n_materials, n_confinements, num_points)
+    """
+    values = np.atleast_2d(np.asarray(values, dtype=float))
+    confinement = np.atleast_1d(np.asarray(confinement, dtype=float))
+    n_materials, n_confinements = len(values), len(confinement)
+    rows = np.repeat(values, n_confinements, axis=0)
+    p = driver_parameters(rows)
+    p_c = np.tile(confinement, n_materials)
+    E, nu, K = p['E'], p['nu'], rows[:, FIELD_INDEX['K']]
+    if damage:
+        if f_c is None:
+            raise ValueError("Ductile damage needs f_c")
+        r_0d = np.repeat(np.broadcast_to(np.asarray(f_c, dtype=float), (n_materials,)), n_confinements)**2 / (2 * E)
+        B = p['B']
+
+    # Hydrostatic preload: the cap follows the pressure once it is passed
+    X_initial = cap_position(p, p['kappa_0'])
+    X = np.maximum(X_initial, 3 * p_c)
+    epsilon_v_p = plastic_volumetric_strain(p_c, p['W'], p['D1'], p['D2'], X_initial)
+    kappa = cap_parameter(p, X)
+
+    strains = np.linspace(0, max_strain, num_points)
+    n = len(p_c)
+    deviator_curve = np.empty((n, num_points)) if curves else None
+    volume_curve = np.empty((n, num_points)) if curves else None
+    plastic_axial = np.zeros(n)
+    q_effective = np.zeros(n)
+    d = np.zeros(n)
+    damage_threshold = np.zeros(n)
+    peak = np.zeros(n)
+    peak_I_1 = 3 * p_c
+    q = np.zeros(n)
+
+    with np.errstate(over='ignore', invalid='ignore', divide='ignore'):
+        for i, axial in enumerate(strains):
+            q_trial = E * (axial - plastic_axial)
+            plastic = q_trial / SQRT3 > _strength(p, 3 * p_c + q_trial, kappa, X)
+            q_effective = q_trial
+            if plastic.any():
+                # Bisection for q on the surface along I_1 = 3 p_c + q
+                low = np.zeros(n)
+                high = q_trial.copy()
+                for _ in range(RETURN_ITERATIONS):
+                    middle = 0.5 * (low + high)
+                    outside = middle / SQRT3 > _strength(p, 3 * p_c + middle, kappa, X)
+                    high = np.where(outside, middle, high)
+                    low = np.where(outside, low, middle)
+                q_effective = np.where(plastic, low, q_trial)
+                delta_axial = np.where(plastic, (q_trial - q_effective) / E, 0.0)
+                plastic_axial += delta_axial
+
+                # Associated flow: ratio of plastic volume to deviatoric strain
+                I_1 = 3 * p_c + q_effective
+                h = 1e-6 * np.maximum(np.abs(I_1), 1.0)
+                slope = (_strength(p, I_1 + h, kappa, X) - _strength(p, I_1 - h, kappa, X)) / (2 * h)
+                ratio = -3 * SQRT3 * slope
+                delta_volume = delta_axial * ratio / np.maximum(1 + ratio / 3, 0.1)
+                epsilon_v_p = epsilon_v_p + delta_volume
+
+                # The cap only expands
+                X_new = np.maximum(X, _hardened_cap(p, epsilon_v_p, X_initial))
+                moved = plastic & (X_new > X)
+                if moved.any():
+                    kappa = np.where(moved, cap_parameter(p, X_new, kappa), kappa)
+                    X = np.where(moved, X_new, X)
+
+            if damage:
+                tau_d = np.abs(q_effective * axial)
+                grow = tau_d > damage_threshold
+                damage_threshold = np.where(grow, tau_d, damage_threshold)
+                active = grow & (tau_d > r_0d)
+                if active.any():
+                    tau_diff = tau_d - r_0d
+                    a = np.where(B + tau_diff > 0, p['G_fc'] / (B + tau_diff), 0.01)
+                    new = ((1 + B) / (1 + B * np.exp(-a * tau_diff)) - 1) * DAMAGE_MAX / B
+                    d = np.where(active, np.minimum(DAMAGE_MAX, np.maximum(d, new)), d)
+
+            q = q_effective * (1 - d)
+            if curves:
+                deviator_curve[:, i] = q
+                volume_curve[:, i] = p_c / K + (1 - 2 * nu) * q_effective / E + epsilon_v_p
+            higher = q > peak
+            peak = np.where(higher, q, peak)
+            peak_I_1 = np.where(higher, 3 * p_c + q, peak_I_1)
+
+    shape = (n_materials, n_confinements)
+    result = {
+        'confinement': confinement,
+        'strains': strains,
+        'peak_deviator': peak.reshape(shape),
+        'peak_I_1': peak_I_1.reshape(shape),
+        'peak_sqrt_J2': (peak / SQRT3).reshape(shape),
+        'TXC': _shear_surface(p, peak_I_1).reshape(shape),
+        'final_deviator': q.reshape(shape),
+    }
+    if curves:
+        result['deviator'] = deviator_curve.reshape(shape + (num_points,))
+        result['volumetric_strain'] = volume_curve.reshape(shape + (num_points,))
+    return result
+
+
+def txc_sweep(f_c, confinement, dmax=19, max_strain=0.05, num_points=1000, damage=False, curves=False, **options):
+    """
+    TXC sweep of concrete grades with keyword values from ``batch_params``.
+
+    Parameters:
+    -----------
+    f_c : array_like
+        Compressive strengths (MPa)
+    confinement : array_like
+        Confining pressures (MPa)
+    dmax : array_like
+        Maximum aggregate sizes (mm)
+    **options
+        Further ``batch_params.keyword_values`` arguments (rev, esize, ...)
+
+    Returns:
+    --------
+    dict
+        Result of ``triaxial_compression``
+    """
+    from batch_params import keyword_values
+
+    f_c = np.atleast_1d(np.asarray(f_c, dtype=float))
+    values = keyword_values(f_c, dmax, **options)
+    return triaxial_compression(values, confinement, max_strain, num_points, f_c, damage, curves)